@@ -0,0 +1,88 @@
+"""
+Throughput of StreamingBarBuilder vs the pandas reference (aggregate_multi_stock_tick_data):
+ticks per second for the builder fed tick by tick vs the reference end-to-end.
+
+Parity between the two is checked by tests/test_bar_builder.py. Without --ticks-csv, a
+synthetic tick file is generated (with gaps, price-less ticks, missing and non-numeric
+day volumes).
+
+Usage:
+    python -m benchmarks.bench_bar_builder --ticks-csv tick_data_all_stocks_combined.csv
+    python -m benchmarks.bench_bar_builder --symbols 50 --minutes 375
+"""
+from src2.yfinance_live_stocks_data_api.aggregate_live_stock_data import aggregate_multi_stock_tick_data
+from src2.yfinance_live_stocks_data_api.bar_builder import StreamingBarBuilder
+from datetime import datetime
+import argparse
+import tempfile
+import time
+import os
+import pandas as pd
+import numpy as np
+
+
+def make_synthetic_ticks(n_symbols: int, minutes: int, ticks_per_minute: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start_ms = int(datetime(2025, 8, 11, 9, 15).timestamp() * 1000)
+    n = n_symbols * minutes * ticks_per_minute
+
+    times = np.sort(rng.integers(start_ms, start_ms + minutes * 60_000, n))
+    ids = rng.integers(0, n_symbols, n)
+    # Leave a few minutes without ticks to exercise gap bars
+    gap = (times >= start_ms + 10 * 60_000) & (times < start_ms + 13 * 60_000)
+    times, ids = times[~gap], ids[~gap]
+
+    price = 1000 + rng.standard_normal(len(times)).cumsum() * 0.05
+    day_volume = np.zeros(len(times))
+    for s in range(n_symbols):
+        mask = ids == s
+        day_volume[mask] = rng.integers(0, 500, mask.sum()).cumsum()
+
+    df = pd.DataFrame({
+        "id": [f"SYM{s}.NS" for s in ids],
+        "price": price,
+        "time": times,
+        "day_volume": day_volume.astype(object),
+    })
+    df.loc[rng.random(len(df)) < 0.01, "price"] = np.nan
+    df.loc[rng.random(len(df)) < 0.01, "day_volume"] = np.nan
+    df.loc[rng.random(len(df)) < 0.002, "day_volume"] = "bad"
+    df["readable_time"] = [datetime.fromtimestamp(t // 1000).strftime("%Y-%m-%d %H:%M:%S") for t in times]
+    return df
+
+
+def run(csv_paths: list[str], n_symbols: int, minutes: int, ticks_per_minute: int):
+    if not csv_paths:
+        tmp = os.path.join(tempfile.mkdtemp(), "synthetic_ticks.csv")
+        make_synthetic_ticks(n_symbols, minutes, ticks_per_minute).to_csv(tmp, index=False)
+        csv_paths = [tmp]
+
+    for path in csv_paths:
+        df = pd.read_csv(path)
+        records = df.to_dict("records")
+
+        start = time.perf_counter()
+        builder = StreamingBarBuilder()
+        for msg in records:
+            builder.on_message(msg)
+        builder.get_bars()
+        online_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        aggregate_multi_stock_tick_data(path)
+        reference_sec = time.perf_counter() - start
+
+        print(f"{os.path.basename(path)}: {df['id'].nunique()} symbols, {len(records)} ticks")
+        print(f"  online builder : {len(records) / online_sec:>12,.0f} ticks/s ({online_sec:.3f}s)")
+        print(f"  pandas + CSV   : {len(records) / reference_sec:>12,.0f} ticks/s ({reference_sec:.3f}s, batch)")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--ticks-csv", nargs="*", default=[], help="recorded tick files from capture_live_stocks_data")
+    arg_parser.add_argument("--symbols", type=int, default=50)
+    arg_parser.add_argument("--minutes", type=int, default=60)
+    arg_parser.add_argument("--ticks-per-minute", type=int, default=30)
+    args = arg_parser.parse_args()
+
+    run(args.ticks_csv, args.symbols, args.minutes, args.ticks_per_minute)
@@ -0,0 +1,63 @@
+"""
+Dedup benchmark: legacy per-article loop vs the vectorized DedupIndex.
+
+Measures the time to dedup one ingestion batch as the store grows from 1k to 100k
+entries. Embeddings are random unit vectors, so nothing is flagged as duplicate and
+both implementations scan the whole store (worst case).
+
+Usage:
+    python -m benchmarks.bench_dedup_index
+    python -m benchmarks.bench_dedup_index --sizes 1000 10000 --batch 200 --dim 1536
+"""
+from src2.news_ingestion.dedup_index import DedupIndex, SIM_THRESHOLD
+import argparse
+import time
+import numpy as np
+
+
+def legacy_is_duplicate(new_emb, store: dict) -> bool:
+    # Same loop the old `is_duplicate` ran for every new article
+    for old_h, old_data in store.items():
+        old_emb = np.array(old_data["embedding"])
+        sim = np.dot(new_emb, old_emb) / (np.linalg.norm(new_emb) * np.linalg.norm(old_emb))
+        if sim >= SIM_THRESHOLD:
+            return True
+    return False
+
+
+def run(sizes: list[int], batch: int, dim: int, legacy_max: int):
+    rng = np.random.default_rng(42)
+    new_embs = rng.standard_normal((batch, dim)).astype(np.float32)
+    hashes = [f"new-{i}" for i in range(batch)]
+
+    print(f"{'store size':>10} | {'legacy (s)':>10} | {'index (s)':>10} | {'speedup':>8}")
+    print("-" * 48)
+    for size in sizes:
+        stored = rng.standard_normal((size, dim)).astype(np.float32)
+
+        index = DedupIndex(dim=dim)
+        index.add([f"old-{i}" for i in range(size)], stored)
+        start = time.perf_counter()
+        index.filter_new(hashes, new_embs)
+        index_time = time.perf_counter() - start
+
+        if size <= legacy_max:
+            store = {f"old-{i}": {"embedding": row.tolist()} for i, row in enumerate(stored)}
+            start = time.perf_counter()
+            for emb in new_embs.tolist():
+                legacy_is_duplicate(emb, store)
+            legacy_time = time.perf_counter() - start
+            print(f"{size:>10} | {legacy_time:>10.3f} | {index_time:>10.4f} | {legacy_time / index_time:>7.0f}x")
+        else:
+            print(f"{size:>10} | {'skipped':>10} | {index_time:>10.4f} | {'-':>8}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000])
+    arg_parser.add_argument("--batch", type=int, default=100, help="new articles per ingestion batch")
+    arg_parser.add_argument("--dim", type=int, default=1536, help="embedding dimension (text-embedding-3-small = 1536)")
+    arg_parser.add_argument("--legacy-max", type=int, default=10_000, help="skip the legacy loop above this store size")
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.batch, args.dim, args.legacy_max)
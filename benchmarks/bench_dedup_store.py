@@ -0,0 +1,96 @@
+"""
+Dedup store on disk: legacy dedup_store.json vs the binary, memory-mapped .npy store.
+
+For each store size, measures one ingestion cycle's I/O for both formats:
+load (parse + TTL cleanup + index build) and save, plus the file size. Half of the
+entries are older than the TTL window, so eviction does real work. The binary store keeps
+float16 embeddings, so dedup decisions on a probe batch are compared between the two
+loaded indexes as a parity check.
+
+Usage:
+    python -m benchmarks.bench_dedup_store
+    python -m benchmarks.bench_dedup_store --sizes 1000 5000 20000 --dim 1536
+"""
+from src2.news_ingestion.dedup_index import DedupIndex, SIM_THRESHOLD
+from datetime import datetime, timedelta, timezone
+import argparse
+import tempfile
+import json
+import time
+import os
+import numpy as np
+
+TTL_HOURS = 48
+
+
+def make_index(size: int, dim: int, seed: int = 0) -> DedupIndex:
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc).timestamp()
+    index = DedupIndex(dim=dim)
+    index.add(
+        [f"{i:032x}" for i in range(size)],
+        rng.standard_normal((size, dim), dtype=np.float32),
+        (now - rng.uniform(0, 2 * TTL_HOURS * 3600, size)).tolist()
+    )
+    return index
+
+def legacy_load(path: str, cutoff: datetime) -> DedupIndex:
+    # load_dedup_store + cleanup_store + DedupIndex.from_store, as ingestion did
+    with open(path, "r") as f:
+        store = json.load(f)
+    store = {k: v for k, v in store.items() if datetime.fromisoformat(v["timestamp"]) >= cutoff}
+    return DedupIndex.from_store(store)
+
+def legacy_save(path: str, index: DedupIndex):
+    with open(path, "w") as f:
+        json.dump(index.to_store(), f)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def check_parity(json_index: DedupIndex, npy_index: DedupIndex, probes: np.ndarray) -> int:
+    assert json_index.hashes == npy_index.hashes, "different entries survived the TTL"
+    json_dup, _ = json_index.find_duplicates(probes)
+    npy_dup, _ = npy_index.find_duplicates(probes)
+    assert (json_dup == npy_dup).all(), f"{int((json_dup != npy_dup).sum())} dedup decisions differ"
+    return int(json_dup.sum())
+
+
+def run(sizes: list[int], dim: int):
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=TTL_HOURS)
+    tmp = tempfile.mkdtemp()
+    json_path, npy_path = os.path.join(tmp, "dedup_store.json"), os.path.join(tmp, "dedup_store.npy")
+
+    print(f"{'entries':>8} | {'json MB':>8} {'load s':>8} {'save s':>8} | {'npy MB':>8} {'load s':>8} {'save s':>8} | {'load x':>7}")
+    print("-" * 86)
+    for size in sizes:
+        index = make_index(size, dim)
+
+        _, json_save = timed(legacy_save, json_path, index)
+        json_index, json_load = timed(legacy_load, json_path, cutoff)
+        _, npy_save = timed(index.save, npy_path)
+        npy_index, npy_load = timed(DedupIndex.load, npy_path, SIM_THRESHOLD, cutoff.timestamp())
+
+        # Probes: near-copies of half the surviving entries, so both outcomes are exercised
+        rng = np.random.default_rng(1)
+        probes = json_index.embeddings[: max(1, len(json_index) // 2)] + rng.standard_normal((max(1, len(json_index) // 2), dim)) * 0.01
+        probes = np.vstack([probes, rng.standard_normal((len(probes), dim))])
+        duplicates = check_parity(json_index, npy_index, probes)
+
+        print(
+            f"{size:>8} | {os.path.getsize(json_path) / 1e6:>8.1f} {json_load:>8.3f} {json_save:>8.3f} | "
+            f"{os.path.getsize(npy_path) / 1e6:>8.1f} {npy_load:>8.3f} {npy_save:>8.3f} | "
+            f"{json_load / npy_load:>6.0f}x  (parity OK, {duplicates}/{len(probes)} probes duplicate)"
+        )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 5000, 20000])
+    arg_parser.add_argument("--dim", type=int, default=1536)
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.dim)
@@ -0,0 +1,91 @@
+"""
+Import-time budget for the pipeline modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`; the cumulative
+time of the module itself is compared with its budget, and the heaviest transitive imports
+are listed so regressions are easy to trace. Exits with status 1 if any module is over budget.
+
+Nothing may build API clients, load the vector store or open the network at import time,
+so this also runs without credentials or any local state.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --modules main --top 15 --runs 5
+"""
+import subprocess
+import argparse
+import sys
+import os
+
+# Cumulative import time budget per module (seconds)
+BUDGETS = {
+    "main": 3.0,
+    "src2.news_ingestion.fetch_all_sources_news": 1.5,
+    "src2.news_ingestion.filter_news": 1.5,
+    "src2.final_analysis.final_analysis_by_llm": 1.5,
+    "src2.retriever.fetch_related_past_news": 1.0,
+    "utils.format_news": 0.05,
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """{imported module: cumulative microseconds} for one cold import of `module` (interpreter startup excluded)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package" (nesting shown by indentation)
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name[1:], int(cumulative)))
+
+    # Imports are logged as they complete: everything after the last top-level import
+    # before `module` was pulled in by `module` itself
+    top_level = [i for i, (name, _) in enumerate(entries) if not name.startswith(" ")]
+    start = max((i for i in top_level if i < top_level[-1]), default=-1) + 1
+
+    profile = {}
+    for name, cumulative in entries[start:]:
+        profile[name.strip()] = max(profile.get(name.strip(), 0), cumulative)
+    return profile
+
+
+def run(modules: list[str], top: int, runs: int) -> bool:
+    ok = True
+    for module in modules:
+        # Best of `runs`, so disk-cache noise doesn't fail the budget
+        profiles = [import_profile(module) for _ in range(runs)]
+        # The top-level package's cumulative time covers the module and its package __init__s
+        root = module.split(".")[0]
+        best = min(profiles, key=lambda p: p.get(root, 0))
+        total = best.get(root, 0) / 1e6
+        budget = BUDGETS.get(module)
+        status = "" if budget is None else ("OK" if total <= budget else "OVER BUDGET")
+        ok &= status != "OVER BUDGET"
+
+        print(f"\n{module}: {total:.3f}s" + (f" (budget {budget:.2f}s) {status}" if budget is not None else ""))
+        heaviest = sorted(
+            ((name, us) for name, us in best.items() if name != root and "." not in name),
+            key=lambda item: item[1], reverse=True
+        )[:top]
+        for name, us in heaviest:
+            print(f"  {us / 1e6:>7.3f}s  {name}")
+    return ok
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--modules", nargs="*", default=list(BUDGETS))
+    arg_parser.add_argument("--top", type=int, default=10, help="heaviest top-level packages to list")
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    sys.exit(0 if run(args.modules, args.top, args.runs) else 1)
@@ -0,0 +1,114 @@
+"""
+Recall vs latency vs memory of the news-store index types (see index_builder.py).
+
+A synthetic corpus of unit-norm vectors drawn around random cluster centres (shaped like
+text embeddings) is indexed with every type; exact top-k from the flat index is the ground
+truth. Each approximate index is swept over its query-time knob (efSearch / nprobe) so the
+memory budget can be picked against the recall it buys.
+
+The default corpus (1M x 1536) needs ~6 GB for the raw vectors plus each index; use --n to
+try smaller sizes first.
+
+Usage:
+    python -m benchmarks.bench_index_modes
+    python -m benchmarks.bench_index_modes --n 100000 --types flat hnsw ivf_sq
+"""
+from src2.faiss_vector_store.index_builder import INDEX_TYPES, build_index
+import numpy as np
+import argparse
+import tempfile
+import time
+import os
+
+SWEEPS = {
+    "hnsw": ("efSearch", [16, 32, 64, 128, 256]),
+    "ivf_sq": ("nprobe", [1, 4, 16, 64, 128]),
+    "ivf_pq": ("nprobe", [1, 4, 16, 64, 128]),
+}
+
+
+def make_corpus(n: int, dim: int, n_clusters: int, seed: int = 0, chunk: int = 100_000) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        block = centres[rng.integers(0, n_clusters, stop - start)]
+        block += rng.standard_normal((stop - start, dim), dtype=np.float32) * 0.8
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        vectors[start:stop] = block
+    return vectors
+
+def make_queries(corpus: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    queries = corpus[rng.choice(len(corpus), n_queries, replace=False)].copy()
+    queries += rng.standard_normal(queries.shape, dtype=np.float32) * 0.02
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries
+
+def index_bytes(index) -> int:
+    import faiss
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.faiss")
+        faiss.write_index(index, path)
+        return os.path.getsize(path)
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(np.intersect1d(f, t)) / k for f, t in zip(found, truth)]))
+
+def timed_search(index, queries: np.ndarray, k: int):
+    start = time.perf_counter()
+    _, ids = index.search(queries, k)
+    return ids, (time.perf_counter() - start) / len(queries) * 1000
+
+def set_knob(index, knob: str, value: int):
+    import faiss
+    if knob == "efSearch":
+        index.hnsw.efSearch = value
+    else:
+        faiss.extract_index_ivf(index).nprobe = value
+
+
+def run(n: int, dim: int, n_clusters: int, n_queries: int, k: int, types: list[str]):
+    print(f"Generating {n:,} x {dim} corpus ({n * dim * 4 / 1e9:.1f} GB)...")
+    corpus = make_corpus(n, dim, n_clusters)
+    queries = make_queries(corpus, n_queries)
+
+    flat = build_index(corpus, "flat")
+    truth, flat_ms = timed_search(flat, queries, k)
+    flat_size = index_bytes(flat)
+    print(f"\n{'type':<8} {'build s':>8} {'MB':>9} {'B/vec':>7} {'knob':>14} {'recall@' + str(k):>10} {'ms/query':>9}")
+    print(f"{'flat':<8} {'-':>8} {flat_size / 1e6:>9,.0f} {flat_size / n:>7,.0f} {'-':>14} {1.0:>10.3f} {flat_ms:>9.2f}")
+    del flat
+
+    for index_type in types:
+        if index_type == "flat":
+            continue
+        start = time.perf_counter()
+        index = build_index(corpus, index_type)
+        build_sec = time.perf_counter() - start
+        size = index_bytes(index)
+
+        knob, values = SWEEPS[index_type]
+        for value in values:
+            set_knob(index, knob, value)
+            ids, ms = timed_search(index, queries, k)
+            print(
+                f"{index_type:<8} {build_sec:>8.1f} {size / 1e6:>9,.0f} {size / n:>7,.0f} "
+                f"{f'{knob}={value}':>14} {recall_at_k(ids, truth):>10.3f} {ms:>9.2f}"
+            )
+        del index
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--n", type=int, default=1_000_000)
+    arg_parser.add_argument("--dim", type=int, default=1536)
+    arg_parser.add_argument("--clusters", type=int, default=2000)
+    arg_parser.add_argument("--queries", type=int, default=1000)
+    arg_parser.add_argument("--k", type=int, default=5)
+    arg_parser.add_argument("--types", nargs="*", choices=INDEX_TYPES, default=list(INDEX_TYPES))
+    args = arg_parser.parse_args()
+
+    run(args.n, args.dim, args.clusters, args.queries, args.k, args.types)
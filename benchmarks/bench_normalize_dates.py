@@ -0,0 +1,127 @@
+"""
+normalize_dates (fast-path parsers + cache, batch) vs the previous normalize_date.
+
+The legacy implementation is copied below unchanged. A corpus mixing the RSS, Financial
+Express, Economic Times, Groww and Pulse shapes (with the repetition a real run sees) is
+normalized by both and per-date timings are compared. Correctness is checked by
+tests/test_normalize_dates.py.
+
+Usage:
+    python -m benchmarks.bench_normalize_dates
+    python -m benchmarks.bench_normalize_dates --dates 50000 --distinct 500
+"""
+from utils.normalize_dates import normalize_dates, _normalize_fast
+from dateutil import parser as date_parser
+from datetime import datetime, timedelta
+import contextlib
+import argparse
+import random
+import time
+import io
+import re
+import pytz
+
+
+def legacy_normalize_date(date_str):
+    try:
+        # Case 1: RSS format — e.g., "Sat, 12 Jul 2025 16:03:43 +0530"
+        if "," in date_str and "+" in date_str:
+            dt = date_parser.parse(date_str)
+
+        # Case 2: Financial Express — e.g., "July 11, 2025 21:59 IST"
+        elif "IST" in date_str:
+            date_str = date_str.replace("IST", "+05:30")
+            dt = date_parser.parse(date_str)
+
+        # Case 3: Relative — e.g., "1 Hour ago", "3 days ago"
+        elif re.match(r"[\d\.]+\s+(minute|hour|day|week)s?\s+ago", date_str.lower()):
+            match = re.match(r"([\d\.]+)\s+(minute|hour|day|week)s?\s+ago", date_str.lower())
+            value = float(match.group(1))  # support decimals like 20.5
+            unit = match.group(2)
+            now = datetime.now(pytz.UTC)
+            if unit == "minute":
+                dt = now - timedelta(minutes=value)
+            elif unit == "hour":
+                dt = now - timedelta(hours=value)
+            elif unit == "day":
+                dt = now - timedelta(days=value)
+            elif unit == "week":
+                dt = now - timedelta(weeks=value)
+
+        # Case 4: Groww format — e.g., "4 hours", "16 hours", "2 days"
+        elif re.match(r"\d+\s+(minute|hour|day|week)s?$", date_str.lower()):
+            match = re.match(r"(\d+)\s+(minute|hour|day|week)s?$", date_str.lower())
+            value = int(match.group(1))
+            unit = match.group(2)
+            now = datetime.now(pytz.UTC)
+            if unit == "minute":
+                dt = now - timedelta(minutes=value)
+            elif unit == "hour":
+                dt = now - timedelta(hours=value)
+            elif unit == "day":
+                dt = now - timedelta(days=value)
+            elif unit == "week":
+                dt = now - timedelta(weeks=value)
+
+        # Fallback: try parsing anything else
+        else:
+            dt = date_parser.parse(date_str)
+
+        # Normalize to UTC and drop microseconds
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=pytz.UTC)
+        else:
+            dt = dt.astimezone(pytz.UTC)
+
+        return dt.replace(microsecond=0).isoformat()
+
+    except Exception as e:
+        print(f"❌ Failed to normalize date: {date_str} — {e}")
+        return ""
+
+
+def make_corpus(n_dates: int, n_distinct: int, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    base = datetime(2025, 7, 1, 9, 0)
+    shapes = [
+        lambda t: t.strftime("%a, %d %b %Y %H:%M:%S +0530"),          # RSS
+        lambda t: t.strftime("%B %d, %Y %H:%M IST"),                  # Financial Express
+        lambda t: t.strftime("%b %d, %Y, %I:%M %p IST"),              # Economic Times
+        lambda t: f"{rng.randint(1, 23)} hours",                       # Groww
+        lambda t: f"{rng.choice(['1', '3', '20.5'])} {rng.choice(['minutes', 'hours', 'days'])} ago",  # Pulse
+        lambda t: t.strftime("%Y-%m-%dT%H:%M:%S+05:30"),              # anything else (dateutil)
+    ]
+    distinct = [
+        rng.choice(shapes)(base + timedelta(minutes=rng.randint(0, 60 * 24 * 30)))
+        for _ in range(n_distinct)
+    ]
+    return [rng.choice(distinct) for _ in range(n_dates)]
+
+
+def run(n_dates: int, n_distinct: int):
+    corpus = make_corpus(n_dates, n_distinct)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for date_str in corpus:
+            legacy_normalize_date(date_str)
+        legacy_sec = time.perf_counter() - start
+
+        _normalize_fast.cache_clear()
+        start = time.perf_counter()
+        normalize_dates(corpus)
+        fast_sec = time.perf_counter() - start
+
+    print(f"{n_dates:,} dates ({n_distinct} distinct)")
+    print(f"  legacy normalize_date : {legacy_sec / n_dates * 1e6:>8.2f} µs/date")
+    print(f"  normalize_dates       : {fast_sec / n_dates * 1e6:>8.2f} µs/date ({legacy_sec / fast_sec:.0f}x)")
+    print(f"  absolute-date cache   : {_normalize_fast.cache_info()}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--dates", type=int, default=20000)
+    arg_parser.add_argument("--distinct", type=int, default=300)
+    args = arg_parser.parse_args()
+
+    run(args.dates, args.distinct)
@@ -0,0 +1,118 @@
+"""
+Vectorized time-decay ranking (rank_by_time_decay) vs scoring one document at a time.
+
+1. Parity: for every query, the FAISS candidates are scored one document at a time with the
+   time-weighted formula, (1 - decay_rate) ** hours_since_published + relevance, read from
+   each document's `published_at` metadata (timezone-aware), and must give the same documents,
+   in the same order, with the same scores as the vectorized ranker. The same check runs on a
+   small store in tests/test_time_decay_ranker.py.
+2. Latency: per-document scoring vs one numpy expression over the batch.
+
+The store is a synthetic FAISS index with random publication times over the last 60 days.
+
+Usage:
+    python -m benchmarks.bench_time_decay_ranker
+    python -m benchmarks.bench_time_decay_ranker --docs 200000 --queries 100
+"""
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from src2.retriever.fetch_related_past_news import DECAY_RATE, TOP_K, SCORE_THRESHOLD, FETCH_K
+from src2.retriever.time_decay_ranker import rank_by_time_decay
+from datetime import datetime, timezone
+import numpy as np
+import argparse
+import time
+
+
+def make_store(n_docs: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    # Clusters of ~50 related articles, so several candidates pass the relevance threshold
+    centres = rng.standard_normal((max(1, n_docs // 50), dim), dtype=np.float32)
+    vectors = centres[rng.integers(0, len(centres), n_docs)]
+    vectors += rng.standard_normal((n_docs, dim), dtype=np.float32) * 0.8
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    now = time.time()
+    published = now - rng.uniform(0, 60 * 86400, n_docs)
+    metadatas = [
+        {"published_at": datetime.fromtimestamp(ts, timezone.utc).replace(microsecond=0).isoformat()}
+        for ts in published
+    ]
+    # Round-trip through the ISO strings, as the store keeps them
+    published = np.array([datetime.fromisoformat(m["published_at"]).timestamp() for m in metadatas])
+    store = FAISS.from_embeddings(
+        [(f"doc {i}", v) for i, v in enumerate(vectors)], FakeEmbeddings(size=dim), metadatas=metadatas
+    )
+    return store, published, now
+
+def make_queries(store, n_queries: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    base = store.index.reconstruct_n(0, store.index.ntotal)[rng.choice(store.index.ntotal, n_queries, replace=False)]
+    queries = base + rng.standard_normal(base.shape, dtype=np.float32) * 0.03
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def reference_score(published_at: str, relevance: float, current_time: datetime) -> float:
+    """(1 - decay_rate) ** hours_since_published + relevance, for one document."""
+    hours_passed = (current_time - datetime.fromisoformat(published_at)).total_seconds() / 3600
+    return (1.0 - DECAY_RATE) ** hours_passed + relevance
+
+def reference_rank(store, distances, positions, now: float) -> list[list[tuple]]:
+    """Time-weighted scoring, one candidate document at a time."""
+    current_time = datetime.fromtimestamp(now, timezone.utc)
+    relevance_fn = store._select_relevance_score_fn()
+    results = []
+    for row_distances, row_positions in zip(distances, positions):
+        scored = []
+        for distance, position in zip(row_distances, row_positions):
+            if position == -1:
+                continue
+            relevance = relevance_fn(distance)
+            if relevance < SCORE_THRESHOLD:
+                continue
+            doc = store.docstore.search(store.index_to_docstore_id[position])
+            scored.append((reference_score(doc.metadata["published_at"], relevance, current_time), position))
+        # Stable sort: ties keep FAISS order, as in the ranker
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        results.append(scored[:TOP_K])
+    return results
+
+def check_parity(reference, top_positions, top_scores) -> int:
+    for query, (expected, positions, scores) in enumerate(zip(reference, top_positions, top_scores)):
+        found = [(s, p) for s, p in zip(scores, positions) if p != -1]
+        assert [p for _, p in found] == [p for _, p in expected], f"query {query}: order differs"
+        np.testing.assert_allclose([s for s, _ in found], [s for s, _ in expected], rtol=1e-9, atol=1e-9)
+    return sum(len(expected) for expected in reference)
+
+
+def run(n_docs: int, n_queries: int, dim: int):
+    store, published, now = make_store(n_docs, dim)
+    queries = make_queries(store, n_queries)
+    distances, positions = store.index.search(queries, min(FETCH_K, n_docs))
+    # Compare in float64 on both sides
+    distances = distances.astype(np.float64)
+
+    start = time.perf_counter()
+    reference = reference_rank(store, distances, positions, now)
+    reference_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top_positions, top_scores = rank_by_time_decay(
+        distances, positions, published, now, decay_rate=DECAY_RATE, k=TOP_K, score_threshold=SCORE_THRESHOLD
+    )
+    vectorized_sec = time.perf_counter() - start
+
+    matched = check_parity(reference, top_positions, top_scores)
+    print(f"Parity OK: {n_queries} queries, {matched} ranked documents ({n_docs:,} docs, fetch_k={FETCH_K})")
+    print(f"  per-doc scoring   : {reference_sec / n_queries * 1000:>8.3f} ms/query")
+    print(f"  vectorized ranker : {vectorized_sec / n_queries * 1000:>8.3f} ms/query "
+          f"({reference_sec / vectorized_sec:.0f}x)")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--docs", type=int, default=20000)
+    arg_parser.add_argument("--queries", type=int, default=200)
+    arg_parser.add_argument("--dim", type=int, default=1536)
+    args = arg_parser.parse_args()
+
+    run(args.docs, args.queries, args.dim)
@@ -0,0 +1,142 @@
+"""
+Configurable FAISS index types for the news store.
+
+    flat    exact search, 4*d bytes per vector (LangChain's default)
+    hnsw    graph search, ~4*d + 8*M bytes per vector, no training
+    ivf_sq  inverted lists + 8-bit scalar quantization, ~d bytes per vector
+    ivf_pq  inverted lists + product quantization, PQ_M bytes per vector
+
+The type is read from the NEWS_INDEX_TYPE environment variable (default: flat).
+Rebuild an existing store in place, without re-embedding:
+
+    python -m src2.faiss_vector_store.index_builder --index-type hnsw
+"""
+from utils.logger_setup import setup_logger
+import numpy as np
+import argparse
+import math
+import os
+
+logger = setup_logger(__name__)
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_sq", "ivf_pq")
+
+# Params
+INDEX_TYPE = os.getenv("NEWS_INDEX_TYPE", "flat")
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+IVF_NPROBE = 16
+PQ_M = 96                    # sub-quantizers; must divide the dimension (1536 / 96 = 16)
+MIN_TRAIN_POINTS_PER_LIST = 39
+MAX_TRAIN_POINTS = 200_000
+
+
+def ivf_nlist(n_vectors: int) -> int:
+    # ~4*sqrt(n) lists, the usual starting point for IVF
+    return max(1, int(4 * math.sqrt(n_vectors)))
+
+def trainable(index_type: str, n_vectors: int) -> bool:
+    """Whether `n_vectors` are enough to build `index_type` (IVF needs training points per list)."""
+    return not index_type.startswith("ivf") or n_vectors >= ivf_nlist(n_vectors) * MIN_TRAIN_POINTS_PER_LIST
+
+def factory_string(index_type: str, n_vectors: int) -> str:
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{HNSW_M}"
+    if index_type == "ivf_sq":
+        return f"IVF{ivf_nlist(n_vectors)},SQ8"
+    if index_type == "ivf_pq":
+        return f"IVF{ivf_nlist(n_vectors)},PQ{PQ_M}"
+    raise ValueError(f"Unknown index type: {index_type} (expected one of {INDEX_TYPES})")
+
+def apply_search_params(index):
+    """Set query-time knobs (efSearch / nprobe) that are not persisted with the index."""
+    import faiss
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = IVF_NPROBE
+    return index
+
+def search_parameters(index, selector):
+    """Per-query parameters restricting a search to `selector`, keeping the index's efSearch / nprobe."""
+    import faiss
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    return faiss.SearchParameters(sel=selector)
+
+def build_index(vectors: np.ndarray, index_type: str = INDEX_TYPE):
+    """
+    Build (train if needed) and fill a FAISS L2 index of `index_type`. IVF types fall back to
+    flat when there are too few vectors to train the requested number of lists.
+    """
+    import faiss
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if not trainable(index_type, n):
+        logger.warning(f"⚠️ {n} vectors are too few to train {index_type}; using flat")
+        index_type = "flat"
+
+    index = faiss.index_factory(dim, factory_string(index_type, n), faiss.METRIC_L2)
+    if index_type == "hnsw":
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    if not index.is_trained:
+        sample = vectors
+        if n > MAX_TRAIN_POINTS:
+            sample = vectors[np.random.default_rng(0).choice(n, MAX_TRAIN_POINTS, replace=False)]
+        index.train(sample)
+    index.add(vectors)
+    return apply_search_params(index)
+
+def reconstruct_all(index) -> np.ndarray:
+    """All stored vectors in id order (lossy for quantized indexes)."""
+    import faiss
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is None:
+        return index.reconstruct_n(0, index.ntotal)
+    ivf.make_direct_map()
+    try:
+        return index.reconstruct_n(0, index.ntotal)
+    finally:
+        ivf.make_direct_map(False)
+
+def index_type_of(index) -> str:
+    import faiss
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return "ivf_pq" if isinstance(ivf, faiss.IndexIVFPQ) else "ivf_sq"
+    return "flat"
+
+def rebuild_vector_store(index_type: str = INDEX_TYPE, db_path: str = None):
+    """Swap the store's index for a new `index_type` index built from its stored vectors."""
+    from src2.faiss_vector_store.vector_store_manager import get_vector_store_manager, DB_PATH
+    manager = get_vector_store_manager(db_path or DB_PATH)
+    with manager.read() as store:
+        if store is None:
+            logger.info("ℹ️ Vector store is empty, nothing to rebuild")
+            return
+        current = index_type_of(store.index)
+        vectors = reconstruct_all(store.index)
+        store.index = build_index(vectors, index_type)
+        manager.mark_changed()
+    logger.info(f"🔧 Rebuilt {len(vectors)} vectors: {current} → {index_type_of(store.index)}")
+    manager.persist()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--index-type", choices=INDEX_TYPES, default=INDEX_TYPE)
+    arg_parser.add_argument("--db-path", default=None)
+    args = arg_parser.parse_args()
+
+    rebuild_vector_store(args.index_type, args.db_path)
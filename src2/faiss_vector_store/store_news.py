@@ -1,16 +1,26 @@
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings  
-from langchain_openai import OpenAIEmbeddings
-from src2.news_ingestion.fetch_all_sources_news import fetch_all_sources_news
+from src2.faiss_vector_store.vector_store_manager import get_vector_store_manager, DB_PATH
 from langchain.schema import Document
-import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 def convert_news_to_documents(news_items):
-    docs = []
+    """
+    One document per article. Items may be plain articles or tagged pairs
+    ({"ticker", "article"}) from identify_stocks_from_news; the tickers an article
+    was tagged with are stored in its `tickers` metadata.
+    """
+    articles, tickers = {}, {}
     for item in news_items:
+        article = item.get("article", item)
+        key = (article.get("url", ""), article.get("title", ""))
+        articles.setdefault(key, article)
+        ticker = item.get("ticker") if "article" in item else None
+        if ticker and ticker not in tickers.setdefault(key, []):
+            tickers[key].append(ticker)
+
+    docs = []
+    for key, item in articles.items():
         content = item.get("content", "")
         title = item.get("title", "")
         url = item.get("url", "")
@@ -26,30 +36,28 @@ def convert_news_to_documents(news_items):
                     "title": title,
                     "url": url,
                     "published_at": published_at,
-                    "source": source
+                    "source": source,
+                    "tickers": tickers.get(key, [])
                 }
             )
         )
     return docs
 
-# Save to FAISS vector store
-def save_to_vector_store(documents, db_path="faiss_news_store"):
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-    if os.path.exists(db_path):
-        db = FAISS.load_local(db_path, embeddings)
-        db.add_documents(documents)
-    else:
-        db = FAISS.from_documents(documents, embeddings)
-    db.save_local(db_path)
-    return db
+# Save to FAISS vector store: appended to the live index, persisted in the background
+def save_to_vector_store(documents, db_path=DB_PATH):
+    manager = get_vector_store_manager(db_path)
+    manager.add_documents(documents)
+    manager.persist_async()
+    return manager.get_store()
 
 if __name__ == "__main__":
-    item = {}
+    from src2.news_ingestion.fetch_all_sources_news import fetch_all_sources_news
+
     rss_urls = [
         "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms"
     ]
     result = fetch_all_sources_news(rss_urls)
     docs = convert_news_to_documents(result)
     save_to_vector_store(docs)
-
+    get_vector_store_manager().flush()
     
\ No newline at end of file
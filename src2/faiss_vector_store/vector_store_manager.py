@@ -0,0 +1,309 @@
+from langchain_community.vectorstores import FAISS
+from src2.faiss_vector_store.index_builder import (
+    INDEX_TYPE, build_index, apply_search_params, index_type_of, reconstruct_all, trainable
+)
+from utils.llm_clients import get_embeddings
+from utils.logger_setup import setup_logger
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
+import threading
+import pickle
+import shutil
+import time
+import os
+
+logger = setup_logger(__name__)
+
+# Params
+DB_PATH = "faiss_news_store"
+EMBEDDING_MODEL = "text-embedding-3-small"
+DAYS_TO_KEEP = 30
+SNAPSHOTS_DIR = "snapshots"      # one FAISS.save_local layout per persisted version
+CURRENT_POINTER = "CURRENT"      # name of the live snapshot directory
+
+
+def published_epoch(metadata: dict) -> float:
+    """`published_at` as epoch seconds (naive times are UTC), NaN if missing or unparseable."""
+    try:
+        published = datetime.fromisoformat(metadata.get("published_at", ""))
+    except (TypeError, ValueError):
+        return float("nan")
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+class VectorStoreManager:
+    """
+    Single in-process owner of the FAISS news store, shared by the writer and the retriever.
+
+    The store is loaded once (lazily), documents are appended to the live index so readers
+    see them immediately, and persistence runs in a background thread from a snapshot taken
+    under the lock. Each persist writes index.faiss + index.pkl into a new snapshot directory
+    and then swaps the CURRENT pointer file with a single os.replace, so a reader or a
+    restart always sees a matching index/docstore pair, old or new, never a mix.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, embeddings=None):
+        self.db_path = db_path
+        self._embeddings = embeddings
+        self._store = None
+        self._loaded = False
+        self._published = np.empty(0)  # published_at epochs, aligned with index positions
+        self._ticker_positions: dict[str, list[int]] = {}  # ticker -> index positions tagged with it
+        self._lock = threading.RLock()
+        self._version = 0            # bumped on every change
+        self._persisted_version = 0
+        self._persist_thread = None
+        self._persist_lock = threading.Lock()
+        self.timings = {"load_sec": None, "last_persist_sec": None}
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            self._embeddings = get_embeddings(EMBEDDING_MODEL, caller="vector_store")
+        return self._embeddings
+
+    ### ----------------- Loading -----------------
+
+    def _current_snapshot_dir(self) -> str | None:
+        """Directory of the live snapshot; stores written before snapshots keep it at the top level."""
+        pointer = os.path.join(self.db_path, CURRENT_POINTER)
+        if os.path.exists(pointer):
+            with open(pointer, "r") as f:
+                return os.path.join(self.db_path, SNAPSHOTS_DIR, f.read().strip())
+        if os.path.exists(os.path.join(self.db_path, "index.faiss")):
+            return self.db_path
+        return None
+
+    def _load(self):
+        if self._loaded:
+            return
+        start = time.perf_counter()
+        snapshot_dir = self._current_snapshot_dir()
+        if snapshot_dir is not None:
+            self._store = FAISS.load_local(snapshot_dir, self.embeddings, allow_dangerous_deserialization=True)
+            apply_search_params(self._store.index)
+            metadatas = [
+                self._store.docstore.search(self._store.index_to_docstore_id[i]).metadata
+                for i in range(self._store.index.ntotal)
+            ]
+            self._published = np.array([published_epoch(m) for m in metadatas], dtype=np.float64)
+            self._index_tickers(0, metadatas)
+            self.timings["load_sec"] = time.perf_counter() - start
+            logger.info(
+                f"📂 Loaded {index_type_of(self._store.index)} vector store "
+                f"({self._store.index.ntotal} vectors) in {self.timings['load_sec']:.2f}s"
+            )
+        else:
+            logger.info(f"ℹ️ No vector store at {self.db_path} yet; it will be created on first save")
+        self._loaded = True
+
+    def get_store(self):
+        """The live FAISS store, or None while no document has ever been saved."""
+        with self._lock:
+            self._load()
+            return self._store
+
+    @contextmanager
+    def read(self):
+        """Hold the store lock while searching (FAISS add and search must not overlap)."""
+        with self._lock:
+            self._load()
+            yield self._store
+
+    def published_epochs(self) -> np.ndarray:
+        """Publication time (epoch seconds, NaN if unknown) of each index position. Use under `read()`."""
+        return self._published
+
+    def positions_for_tickers(self, tickers: list[str]) -> np.ndarray:
+        """Sorted index positions of documents tagged with any of `tickers`. Use under `read()`."""
+        positions = [p for ticker in tickers for p in self._ticker_positions.get(ticker, ())]
+        return np.unique(np.asarray(positions, dtype=np.int64))
+
+    def _index_tickers(self, start: int, metadatas: list[dict]):
+        for offset, metadata in enumerate(metadatas):
+            for ticker in metadata.get("tickers") or ():
+                self._ticker_positions.setdefault(ticker, []).append(start + offset)
+
+    ### ----------------- Writing -----------------
+
+    @staticmethod
+    def _target_index_type(index, n_vectors: int) -> str:
+        """
+        Index type to (re)build with. A store that started too small for INDEX_TYPE stays flat
+        only until it holds enough vectors to train it.
+        """
+        current = index_type_of(index)
+        if current == "flat" and INDEX_TYPE != "flat" and trainable(INDEX_TYPE, n_vectors):
+            return INDEX_TYPE
+        return current
+
+    def add_documents(self, documents) -> list[str]:
+        """Embed (outside the lock) and append documents to the live index."""
+        if not documents:
+            return []
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        vectors = self.embeddings.embed_documents(texts)
+
+        with self._lock:
+            self._load()
+            start = 0 if self._store is None else self._store.index.ntotal
+            if self._store is None:
+                self._store = FAISS.from_embeddings(list(zip(texts, vectors)), self.embeddings, metadatas=metadatas)
+                if INDEX_TYPE != "flat":
+                    self._store.index = build_index(vectors, INDEX_TYPE)
+                ids = list(self._store.index_to_docstore_id.values())
+            else:
+                ids = self._store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+                index = self._store.index
+                index_type = self._target_index_type(index, index.ntotal)
+                if index_type != index_type_of(index):
+                    self._store.index = build_index(reconstruct_all(index), index_type)
+                    logger.info(f"🔧 Vector store reached {index.ntotal} vectors; rebuilt as {index_type}")
+            self._published = np.concatenate([self._published, [published_epoch(m) for m in metadatas]])
+            self._index_tickers(start, metadatas)
+            self._version += 1
+        logger.info(f"➕ Added {len(ids)} documents to the vector store")
+        return ids
+
+    def evict_expired(self, days_to_keep: int = DAYS_TO_KEEP) -> int:
+        """
+        Remove documents published more than `days_to_keep` days ago, or with no parseable
+        `published_at`, without any embedding calls. Returns the number removed.
+
+        Flat indexes drop the rows in place (ids are compacted, as LangChain's `delete` expects).
+        HNSW cannot remove and IVF keeps stale ids on removal, so those are rebuilt from their
+        stored vectors.
+        """
+        cutoff = datetime.now(timezone.utc).timestamp() - days_to_keep * 86400
+        with self._lock:
+            self._load()
+            store = self._store
+            if store is None:
+                return 0
+
+            doc_ids = [store.index_to_docstore_id[i] for i in range(store.index.ntotal)]
+            expired = ~(self._published >= cutoff)   # NaN counts as expired
+            expired_ids = [_id for _id, drop in zip(doc_ids, expired) if drop]
+            if not expired_ids:
+                return 0
+
+            index_type = self._target_index_type(store.index, len(doc_ids) - len(expired_ids))
+            if index_type == "flat":
+                store.delete(expired_ids)
+            else:
+                vectors = reconstruct_all(store.index)[~expired]
+                store.index = build_index(vectors, index_type)
+                store.docstore.delete(expired_ids)
+                kept_ids = [_id for _id, drop in zip(doc_ids, expired) if not drop]
+                store.index_to_docstore_id = dict(enumerate(kept_ids))
+            self._published = self._published[~expired]
+            new_position = np.cumsum(~expired) - 1
+            for ticker, positions in list(self._ticker_positions.items()):
+                positions = np.asarray(positions)
+                kept = new_position[positions[~expired[positions]]].tolist()
+                if kept:
+                    self._ticker_positions[ticker] = kept
+                else:
+                    del self._ticker_positions[ticker]
+            self._version += 1
+
+        logger.info(f"🧹 Evicted {len(expired_ids)} expired documents, {len(doc_ids) - len(expired_ids)} retained")
+        return len(expired_ids)
+
+    def mark_changed(self):
+        """Record an in-place change to the store (made under `read()`) so the next persist writes it."""
+        with self._lock:
+            self._version += 1
+
+    def _snapshot(self):
+        import faiss
+        with self._lock:
+            if self._store is None or self._version == self._persisted_version:
+                return None
+            return (
+                self._version,
+                faiss.serialize_index(self._store.index),
+                pickle.dumps((self._store.docstore, self._store.index_to_docstore_id))
+            )
+
+    @staticmethod
+    def _write_durable(path: str, payload: bytes):
+        with open(path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def persist(self):
+        """
+        Write a consistent snapshot to a new directory (FAISS.save_local layout), then make it
+        live by replacing the CURRENT pointer. Older snapshots are removed afterwards.
+        """
+        with self._persist_lock:
+            start = time.perf_counter()
+            snapshot = self._snapshot()
+            if snapshot is None:
+                return
+            version, index_bytes, docstore_bytes = snapshot
+
+            # Unique across restarts (the in-memory version starts over at 0)
+            name = f"snapshot-{time.time_ns()}"
+            snapshots_root = os.path.join(self.db_path, SNAPSHOTS_DIR)
+            snapshot_dir = os.path.join(snapshots_root, name)
+            os.makedirs(snapshot_dir)
+            self._write_durable(os.path.join(snapshot_dir, "index.faiss"), index_bytes)
+            self._write_durable(os.path.join(snapshot_dir, "index.pkl"), docstore_bytes)
+
+            pointer = os.path.join(self.db_path, CURRENT_POINTER)
+            self._write_durable(f"{pointer}.tmp", name.encode())
+            os.replace(f"{pointer}.tmp", pointer)
+            if hasattr(os, "O_DIRECTORY"):
+                dir_fd = os.open(self.db_path, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+
+            # Nothing points at these any more
+            for old in os.listdir(snapshots_root):
+                if old != name:
+                    shutil.rmtree(os.path.join(snapshots_root, old), ignore_errors=True)
+            for legacy in ("index.faiss", "index.pkl"):
+                if os.path.exists(os.path.join(self.db_path, legacy)):
+                    os.remove(os.path.join(self.db_path, legacy))
+
+            self._persisted_version = version
+            self.timings["last_persist_sec"] = time.perf_counter() - start
+            logger.info(f"💾 Persisted vector store snapshot in {self.timings['last_persist_sec']:.2f}s")
+
+    def persist_async(self):
+        """Persist in a background thread. Persists are serialized and skip if nothing changed."""
+        def target():
+            try:
+                self.persist()
+            except Exception as e:
+                logger.error(f"❌ Failed to persist vector store: {e}")
+
+        thread = threading.Thread(target=target, name="vector-store-persist", daemon=True)
+        self._persist_thread = thread
+        thread.start()
+
+    def flush(self, timeout: float = 60):
+        """Wait for any background persist, then persist anything still unsaved."""
+        thread = self._persist_thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self.persist()
+
+
+_managers: dict[str, VectorStoreManager] = {}
+_managers_lock = threading.Lock()
+
+def get_vector_store_manager(db_path: str = DB_PATH) -> VectorStoreManager:
+    with _managers_lock:
+        if db_path not in _managers:
+            _managers[db_path] = VectorStoreManager(db_path)
+        return _managers[db_path]
@@ -0,0 +1,232 @@
+from src2.final_analysis.final_analysis_by_llm import aget_analysis_on_stocks, aget_grouped_analysis_on_stocks
+from src2.retriever.fetch_related_past_news import retrieve_related_past_news_batch
+from src2.yfinance_historical_stocks_data_api.get_last_5_days_ohlc_data import (
+    get_last_5_days_ohlc_data,
+    get_price_snapshot_markdown,
+    prefetch_daily_bars
+)
+from utils.format_news import format_related_news, format_latest_news
+from utils.telegram_alert import send_telegram_message
+from utils.logger_setup import setup_logger
+from utils.metrics import metrics
+from utils.llm_clients import aclose_async_pool
+import pandas as pd
+import asyncio
+import time
+
+logger = setup_logger(__name__)
+
+# Params
+ANALYSIS_MAX_CONCURRENCY = 5   # LLM analyses in flight
+GROUPED_ANALYSIS_THRESHOLD = 5 # articles tagged with more tickers get one grouped call
+
+NO_IMPACT_TEXT = "News does not indicate material impact on the stock. No further analysis required."
+
+
+def article_key(article: dict) -> str:
+    """Identity of an article within a run (the same article is tagged with several tickers)."""
+    return f"{article.get('url', '')}|{article.get('title', '')}"
+
+
+def related_key(article: dict, ticker: str) -> str:
+    return f"{article_key(article)}|{ticker}"
+
+def _retrieve_all(queries: dict[str, tuple[dict, list[str]]]) -> dict[str, str]:
+    # One batched embedding for every unique article of the run; searches are scoped to the tickers
+    with metrics.stage("retrieval"):
+        related = retrieve_related_past_news_batch(
+            {key: article for key, (article, _) in queries.items()},
+            {key: tickers for key, (_, tickers) in queries.items()}
+        )
+    return {key: format_related_news(news) for key, news in related.items()}
+
+def _download_all_ohlc(tickers: list[str], grouped: dict[str, list[str]], live_result: dict) -> tuple[dict, dict]:
+    # One multi-ticker download fills the daily-bar cache; tables are then rendered from it
+    with metrics.stage("ohlc"):
+        prefetch_daily_bars(tickers + [t for group_tickers in grouped.values() for t in group_tickers])
+        ohlc = {ticker: get_last_5_days_ohlc_data(ticker) for ticker in tickers}
+    snapshots = {
+        key: get_price_snapshot_markdown(group_tickers, _live_closes(live_result, group_tickers))
+        for key, group_tickers in grouped.items()
+    }
+    return ohlc, snapshots
+
+def _live_closes(live_result: dict, tickers: list[str]):
+    if not live_result:
+        return None
+    closes = {}
+    for ticker in tickers:
+        bars = pd.DataFrame(live_result.get(ticker, []))
+        if not bars.empty and "close" in bars:
+            closes[ticker] = bars["close"].dropna().iloc[-1] if bars["close"].notna().any() else None
+    return closes
+
+def _live_data_markdown(live_result: dict, ticker: str) -> str:
+    live_data_df = pd.DataFrame(live_result.get(ticker, []))
+    return (
+        live_data_df.to_markdown(index=False)
+        if not live_data_df.empty
+        else "No live data available (market closed)"
+    )
+
+def build_alert_message(ticker: str, analysis: dict, formatted_latest_news: str) -> str:
+    return (
+        f"📊 *Stock Analysis: {ticker}*\n\n"
+        f"Signal: {analysis.get('signal_analysis', '')}\n"
+        f"Potential: {analysis.get('potential_analysis', '')}\n"
+        f"Confidence: {analysis.get('confidence_analysis', '')}\n"
+        f"Sectors: {analysis.get('sector_analysis', '')}\n\n"
+        f"📰 News: {formatted_latest_news}"
+    )
+
+
+async def _analyze(item: dict, related: dict, ohlc: dict, live_result: dict, semaphore: asyncio.Semaphore) -> dict:
+    article, ticker = item["article"], item["ticker"]
+    formatted_latest_news = format_latest_news(article)
+
+    async with semaphore:
+        analysis = await aget_analysis_on_stocks(
+            stock_ticker=ticker,
+            latest_news=formatted_latest_news,
+            related_news=related[related_key(article, ticker)],
+            live_data_markdown=_live_data_markdown(live_result, ticker),
+            past_ohlc_markdown=ohlc.get(ticker)
+        )
+
+    analysis["article"] = formatted_latest_news
+    return analysis
+
+
+def build_grouped_alert_message(grouped: dict, formatted_latest_news: str) -> str:
+    impacted = [s for s in grouped["signals"].values() if s["signal"].strip().lower() != "no impact"]
+    table = "\n".join(
+        f"• {s['ticker']}: {s['signal']} | {s['potential'] or '-'} | {s['confidence'] or '-'}"
+        for s in impacted
+    )
+    return (
+        f"📊 *Market-wide Analysis: {len(impacted)} of {len(grouped['signals'])} stocks impacted*\n\n"
+        f"Summary: {grouped['market_summary']}\n"
+        f"Sectors: {grouped['sector_analysis']}\n\n"
+        f"Ticker: Signal | Potential | Confidence\n{table}\n\n"
+        f"📰 News: {formatted_latest_news}"
+    )
+
+
+async def _analyze_grouped(article: dict, tickers: list[str], related: dict, snapshots: dict, semaphore: asyncio.Semaphore) -> dict:
+    key = article_key(article)
+    formatted_latest_news = format_latest_news(article)
+
+    async with semaphore:
+        grouped = await aget_grouped_analysis_on_stocks(
+            stock_tickers=tickers,
+            latest_news=formatted_latest_news,
+            related_news=related[key],
+            price_snapshot_markdown=snapshots[key]
+        )
+
+    grouped["article"] = formatted_latest_news
+    return grouped
+
+
+def _expand_grouped(grouped: dict) -> list[dict]:
+    # Same shape as single-ticker analyses, so callers can treat results uniformly
+    return [
+        {
+            "stock_ticker": ticker,
+            "signal_analysis": NO_IMPACT_TEXT if s["signal"].strip().lower() == "no impact" else f"{s['signal']}: {s['rationale']}",
+            "potential_analysis": s["potential"],
+            "confidence_analysis": s["confidence"],
+            "sector_analysis": grouped["sector_analysis"],
+            "article": grouped["article"],
+        }
+        for ticker, s in grouped["signals"].items()
+    ]
+
+
+async def run_analysis(filtered_articles: list[dict], live_result: dict) -> list[dict]:
+    """
+    Analyze every (ticker, article) pair with up to ANALYSIS_MAX_CONCURRENCY LLM calls in
+    flight. Articles tagged with more than GROUPED_ANALYSIS_THRESHOLD tickers (market-wide
+    news) get one grouped call and one combined alert instead of a call per ticker.
+    Related news and price data are prefetched in parallel first; each Telegram alert is
+    sent as soon as its own analysis finishes.
+    """
+    try:
+        return await _run_analysis(filtered_articles, live_result)
+    finally:
+        # This loop ends with the job; close its pooled LLM connections while it still runs
+        await aclose_async_pool()
+
+async def _run_analysis(filtered_articles: list[dict], live_result: dict) -> list[dict]:
+    start = time.perf_counter()
+    articles = {article_key(item["article"]): item["article"] for item in filtered_articles}
+
+    tickers_by_article = {}
+    for item in filtered_articles:
+        tickers_by_article.setdefault(article_key(item["article"]), []).append(item["ticker"])
+    grouped = {
+        key: list(dict.fromkeys(tickers))
+        for key, tickers in tickers_by_article.items()
+        if len(set(tickers)) > GROUPED_ANALYSIS_THRESHOLD
+    }
+    single = [item for item in filtered_articles if article_key(item["article"]) not in grouped]
+    tickers = list(dict.fromkeys(item["ticker"] for item in single))
+
+    # Related news is scoped to the ticker analyzed (or all tickers of a grouped article)
+    queries = {related_key(item["article"], item["ticker"]): (item["article"], [item["ticker"]]) for item in single}
+    queries.update({key: (articles[key], group_tickers) for key, group_tickers in grouped.items()})
+
+    related, (ohlc, snapshots) = await asyncio.gather(
+        asyncio.to_thread(_retrieve_all, queries),
+        asyncio.to_thread(_download_all_ohlc, tickers, grouped, live_result)
+    )
+    logger.info(
+        f"📦 Prefetched context for {len(articles)} articles ({len(grouped)} grouped) and "
+        f"{len(tickers)} tickers in {time.perf_counter() - start:.1f}s"
+    )
+
+    semaphore = asyncio.Semaphore(ANALYSIS_MAX_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_analyze(item, related, ohlc, live_result, semaphore))
+        for item in single
+    ] + [
+        asyncio.create_task(_analyze_grouped(articles[key], group_tickers, related, snapshots, semaphore))
+        for key, group_tickers in grouped.items()
+    ]
+
+    analyses, alerts = [], 0
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            analysis = await next_done
+        except Exception as e:
+            logger.error(f"❌ Analysis failed: {e}")
+            metrics.inc("analysis_errors")
+            continue
+
+        if "signals" in analysis:
+            expanded = _expand_grouped(analysis)
+            analyses.extend(expanded)
+
+            # ✅ One combined Telegram notification for all impacted tickers
+            if any(NO_IMPACT_TEXT not in a["signal_analysis"] for a in expanded):
+                with metrics.stage("telegram"):
+                    await asyncio.to_thread(send_telegram_message, build_grouped_alert_message(analysis, analysis["article"]))
+                alerts += 1
+            continue
+
+        analyses.append(analysis)
+
+        # ✅ Send Telegram notification if it's relevant
+        if NO_IMPACT_TEXT not in analysis.get("signal_analysis", ""):
+            message = build_alert_message(analysis["stock_ticker"], analysis, analysis["article"])
+            with metrics.stage("telegram"):
+                await asyncio.to_thread(send_telegram_message, message)
+            alerts += 1
+
+    metrics.inc("analyses", len(analyses))
+    metrics.inc("alerts_sent", alerts)
+    logger.info(
+        f"✅ Analyzed {len(analyses)}/{len(filtered_articles)} pairs, sent {alerts} alerts "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return analyses
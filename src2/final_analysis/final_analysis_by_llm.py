@@ -1,15 +1,15 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from langchain.output_parsers import StructuredOutputParser
 from langchain.output_parsers import ResponseSchema
-from langchain_openai import ChatOpenAI
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel
+from utils.llm_clients import get_chat_model
+from utils.llm_cache import CachedChain
+from functools import lru_cache
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
-openai_api_key = os.getenv("OPENAI_API_KEY")
-
 ticker_to_name_map = {
     "HINDUNILVR.NS": "Hindustan Unilever Limited",
     "SBILIFE.NS": "SBI Life Insurance Company Limited",
@@ -63,10 +63,6 @@ ticker_to_name_map = {
     "ETERNAL.NS": "Eternal Limited"  
 }
 
-# llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-
 response_schemas = [
     ResponseSchema(name="signal_analysis", description="A paragraph explaining the signal (positive/negative/neutral) and why."),
     ResponseSchema(name="potential_analysis", description="Detailed explanation of upside/downside potential."),
@@ -150,28 +146,30 @@ prompt = PromptTemplate(
     partial_variables={"format_instructions": output_parser.get_format_instructions()}
 )
 
-chain = prompt | llm | output_parser
+@lru_cache(maxsize=None)
+def get_chain():
+    return CachedChain(prompt, get_chat_model(caller="final_analysis"), output_parser)
 
 
-def get_analysis_on_stocks(stock_ticker: str, 
-                           latest_news: str, 
-                           related_news: str,
-                           live_data_markdown: str,
-                           past_ohlc_markdown: str) -> dict:
-    
+def _build_inputs(stock_ticker: str,
+                  latest_news: str,
+                  related_news: str,
+                  live_data_markdown: str,
+                  past_ohlc_markdown: str) -> dict:
     stock_name = ticker_to_name_map.get(stock_ticker)
-    
+
     if not stock_name:
         raise ValueError(f"Unknown stock ticker: {stock_ticker}")
-    
-    response = chain.invoke({
+
+    return {
         "stock_name": stock_name,
         "latest_news": latest_news,
         "related_news": related_news,
         "live_data_markdown": live_data_markdown,
         "past_ohlc_markdown": past_ohlc_markdown
-    })
+    }
 
+def _format_response(stock_ticker: str, stock_name: str, response: dict) -> dict:
     return {
         "stock_ticker": stock_ticker,
         "stock_name": stock_name,
@@ -181,3 +179,115 @@ def get_analysis_on_stocks(stock_ticker: str,
         "sector_analysis": response.get("sector_analysis", "")
     }
 
+def get_analysis_on_stocks(stock_ticker: str, 
+                           latest_news: str, 
+                           related_news: str,
+                           live_data_markdown: str,
+                           past_ohlc_markdown: str) -> dict:
+    
+    inputs = _build_inputs(stock_ticker, latest_news, related_news, live_data_markdown, past_ohlc_markdown)
+    response = get_chain().invoke(inputs)
+    return _format_response(stock_ticker, inputs["stock_name"], response)
+
+async def aget_analysis_on_stocks(stock_ticker: str,
+                                  latest_news: str,
+                                  related_news: str,
+                                  live_data_markdown: str,
+                                  past_ohlc_markdown: str) -> dict:
+    """Async variant of get_analysis_on_stocks (non-blocking `chain.ainvoke`)."""
+    inputs = _build_inputs(stock_ticker, latest_news, related_news, live_data_markdown, past_ohlc_markdown)
+    response = await get_chain().ainvoke(inputs)
+    return _format_response(stock_ticker, inputs["stock_name"], response)
+
+
+### ----------------- Grouped (multi-ticker) analysis -----------------
+
+class TickerSignal(BaseModel):
+    ticker: str
+    signal: str        # Positive / Negative / Neutral / No impact
+    potential: str     # expected % move with uncertainty, or ""
+    confidence: str    # High / Medium / Low, or ""
+    rationale: str
+
+class GroupedAnalysis(BaseModel):
+    market_summary: str
+    sector_analysis: str
+    signals: list[TickerSignal]
+
+grouped_output_parser = PydanticOutputParser(pydantic_object=GroupedAnalysis)
+
+grouped_template = """You are a financial analyst. A single market-wide news item may affect several Nifty 50 stocks at once. You have access to:
+- The **latest news summary**
+- Past related news (for context)
+- A price snapshot table with one row per stock (last 5 trading days and, if the market is open, live data)
+
+Your task is to judge, **for each stock listed below**, whether this news materially affects it, and produce one row per stock in a signal table.
+
+---
+
+**Stocks to evaluate** (ticker: name):
+{stock_list}
+
+**Latest News Summary**:
+\"\"\"
+{latest_news}
+\"\"\"
+
+**Related Past News**:
+\"\"\"
+{related_news}
+\"\"\"
+
+**Price Snapshot**:
+{price_snapshot_markdown}
+
+---
+
+**Instructions**:
+
+1. Write a short `market_summary` of what the news means for Indian equities overall, and a `sector_analysis` naming the sectors affected.
+
+2. For **every** stock listed, return one entry in `signals`:
+    - `signal`: Positive / Negative / Neutral, or "No impact" if the news is not material for that stock.
+    - `potential`: estimated upside/downside % (state the uncertainty), empty if "No impact".
+    - `confidence`: High / Medium / Low, empty if "No impact".
+    - `rationale`: one or two sentences using the news and the price snapshot.
+
+{format_instructions}
+"""
+
+grouped_prompt = PromptTemplate(
+    input_variables=["stock_list", "latest_news", "related_news", "price_snapshot_markdown"],
+    template=grouped_template,
+    partial_variables={"format_instructions": grouped_output_parser.get_format_instructions()}
+)
+
+@lru_cache(maxsize=None)
+def get_grouped_chain():
+    return CachedChain(grouped_prompt, get_chat_model(caller="final_analysis"), grouped_output_parser)
+
+
+async def aget_grouped_analysis_on_stocks(stock_tickers: list[str],
+                                          latest_news: str,
+                                          related_news: str,
+                                          price_snapshot_markdown: str) -> dict:
+    """
+    One LLM call covering every ticker of a market-wide article.
+    Returns {"market_summary", "sector_analysis", "signals": {ticker: TickerSignal dict}};
+    tickers the model left out or invented are dropped.
+    """
+    known = [t for t in stock_tickers if t in ticker_to_name_map]
+    stock_list = "\n".join(f"- {t}: {ticker_to_name_map[t]}" for t in known)
+
+    response = await get_grouped_chain().ainvoke({
+        "stock_list": stock_list,
+        "latest_news": latest_news,
+        "related_news": related_news,
+        "price_snapshot_markdown": price_snapshot_markdown
+    })
+
+    return {
+        "market_summary": response.market_summary,
+        "sector_analysis": response.sector_analysis,
+        "signals": {s.ticker: s.model_dump() for s in response.signals if s.ticker in known}
+    }
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger_setup import setup_logger
+import time
+
+logger = setup_logger(__name__)
+
+# Params
+EMBED_BATCH_SIZE = 64     # texts per embed_documents request
+EMBED_MAX_WORKERS = 4     # concurrent requests in flight
+EMBED_MAX_RETRIES = 3     # attempts per chunk
+EMBED_RETRY_BACKOFF = 1.0 # seconds, doubled on each retry
+
+
+def _embed_chunk(embeddings_model, chunk: list[str], max_retries: int, backoff: float):
+    for attempt in range(1, max_retries + 1):
+        try:
+            embeddings = embeddings_model.embed_documents(chunk)
+            # A short or long response can't be matched back to its texts
+            if len(embeddings) != len(chunk):
+                raise ValueError(f"got {len(embeddings)} embeddings for {len(chunk)} texts")
+            return embeddings
+        except Exception as e:
+            if attempt == max_retries:
+                logger.error(f"❌ Embedding chunk of {len(chunk)} failed after {attempt} attempts: {e}")
+                return None
+            wait = backoff * (2 ** (attempt - 1))
+            logger.warning(f"⚠️ Embedding chunk failed (attempt {attempt}/{max_retries}), retrying in {wait:.1f}s: {e}")
+            time.sleep(wait)
+
+
+def embed_texts(embeddings_model,
+                texts: list[str],
+                batch_size: int = EMBED_BATCH_SIZE,
+                max_workers: int = EMBED_MAX_WORKERS,
+                max_retries: int = EMBED_MAX_RETRIES,
+                backoff: float = EMBED_RETRY_BACKOFF) -> list:
+    """
+    Embed `texts` through `embed_documents` in chunks of `batch_size`, with at most
+    `max_workers` chunks in flight. Each chunk is retried on its own, so one failing
+    chunk never drops the rest of the batch.
+    Returns one embedding per input text, or None where the chunk finally failed.
+    """
+    if not texts:
+        return []
+
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = [None] * len(texts)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        futures = [
+            executor.submit(_embed_chunk, embeddings_model, chunk, max_retries, backoff)
+            for chunk in chunks
+        ]
+        for chunk_idx, future in enumerate(futures):
+            embeddings = future.result()
+            if embeddings is None:
+                continue
+            offset = chunk_idx * batch_size
+            for i, embedding in enumerate(embeddings):
+                results[offset + i] = embedding
+
+    failed = sum(1 for r in results if r is None)
+    logger.info(
+        f"🧮 Embedded {len(texts) - failed}/{len(texts)} texts in {len(chunks)} chunks "
+        f"({time.perf_counter() - start:.2f}s)"
+    )
+    return results
@@ -0,0 +1,180 @@
+from utils.logger_setup import setup_logger
+from contextlib import contextmanager
+import threading
+import tempfile
+import shutil
+import atexit
+import queue
+import time
+
+logger = setup_logger(__name__)
+
+# Params
+POOL_SIZE = 2               # one driver per Selenium source, so both can scrape concurrently
+MAX_USES_PER_DRIVER = 50    # recycle after this many scrapes (leaks build up in long-lived Chrome)
+MAX_DRIVER_AGE_SEC = 6 * 3600
+PAGE_LOAD_TIMEOUT_SEC = 45
+SCRIPT_TIMEOUT_SEC = 15
+SCROLL_DEADLINE_SEC = 30    # with the page load, keeps a scrape inside its SOURCE_TIMEOUTS budget
+ACQUIRE_TIMEOUT_SEC = 120
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/115 Safari/537.36"
+
+
+class _PooledDriver:
+    def __init__(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        # ✅ unique profile per driver, removed again when the driver is retired
+        self.profile_dir = tempfile.mkdtemp(prefix="chrome-profile-")
+
+        options = Options()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--log-level=3")
+        options.add_argument(f"user-agent={USER_AGENT}")
+        options.add_argument(f"--user-data-dir={self.profile_dir}")
+
+        try:
+            self.driver = webdriver.Chrome(options=options)
+        except Exception:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            raise
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT_SEC)
+        self.driver.set_script_timeout(SCRIPT_TIMEOUT_SEC)
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def is_expired(self) -> bool:
+        return (
+            self.uses >= MAX_USES_PER_DRIVER
+            or time.monotonic() - self.created_at >= MAX_DRIVER_AGE_SEC
+        )
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error quitting Chrome driver: {e}")
+        finally:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class ChromeDriverPool:
+    """
+    Long-lived pool of headless Chrome drivers shared across scheduled runs.
+
+    Drivers are started lazily, health-checked on every checkout, and recycled when they
+    fail the check, hit MAX_USES_PER_DRIVER or get older than MAX_DRIVER_AGE_SEC. Each
+    driver's temp profile is deleted when the driver is retired.
+    """
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all: set[_PooledDriver] = set()
+        self._closed = False
+
+    def _retire(self, pooled: _PooledDriver):
+        with self._lock:
+            self._all.discard(pooled)
+        pooled.quit()
+
+    def _checkout(self) -> _PooledDriver:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled.is_expired() or not pooled.is_healthy():
+                logger.info("♻️ Recycling Chrome driver")
+                self._retire(pooled)
+                continue
+            return pooled
+
+        pooled = _PooledDriver()
+        with self._lock:
+            self._all.add(pooled)
+        logger.info("🚀 Started new headless Chrome driver")
+        return pooled
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for one scrape. A driver that raised is retired, not reused."""
+        if self._closed:
+            raise RuntimeError("Chrome driver pool is shut down")
+        if not self._slots.acquire(timeout=ACQUIRE_TIMEOUT_SEC):
+            raise TimeoutError("Timed out waiting for a free Chrome driver")
+
+        pooled = None
+        try:
+            pooled = self._checkout()
+            pooled.uses += 1
+            yield pooled.driver
+        except Exception:
+            if pooled is not None:
+                self._retire(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                if self._closed:
+                    self._retire(pooled)
+                else:
+                    self._idle.put(pooled)
+            self._slots.release()
+
+    def shutdown(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for pooled in drivers:
+            pooled.quit()
+        if drivers:
+            logger.info(f"🧹 Closed {len(drivers)} Chrome driver(s)")
+
+
+def scroll_until_stable(driver, count_script: str, max_scrolls: int = 6, wait_sec: float = 4.0,
+                        deadline_sec: float = SCROLL_DEADLINE_SEC) -> int:
+    """
+    Scroll to the bottom until `count_script` (JS returning a number, e.g. a story count)
+    stops growing, instead of sleeping a fixed time per scroll. Gives up after
+    `deadline_sec` in total, so a page that keeps growing can't hold the driver.
+    Returns the final count.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    deadline = time.monotonic() + deadline_sec
+    count = driver.execute_script(count_script)
+    for _ in range(max_scrolls):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(f"⏰ Stopped scrolling after {deadline_sec}s at count {count}")
+            break
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, min(wait_sec, remaining), poll_frequency=0.25).until(
+                lambda d: d.execute_script(count_script) > count
+            )
+        except TimeoutException:
+            break
+        count = driver.execute_script(count_script)
+    return count
+
+
+chrome_pool = ChromeDriverPool()
+atexit.register(chrome_pool.shutdown)
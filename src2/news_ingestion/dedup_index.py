@@ -0,0 +1,197 @@
+from datetime import datetime, timezone
+import numpy as np
+import os
+
+# Params
+SIM_THRESHOLD = 0.85     # cosine similarity threshold
+INITIAL_CAPACITY = 1024  # rows pre-allocated for the embedding matrix
+STORE_EMBEDDING_DTYPE = np.float16  # on-disk precision of the normalized embeddings
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _record_dtype(dim: int, embedding_dtype) -> np.dtype:
+    # One fixed-size record per article: md5 hex digest, epoch seconds, embedding
+    return np.dtype([("hash", "S32"), ("timestamp", "<f8"), ("embedding", embedding_dtype, (dim,))])
+
+
+class DedupIndex:
+    """
+    In-memory near-duplicate index over article embeddings.
+
+    Embeddings are L2-normalized once on insert and kept in a single contiguous
+    float32 matrix, so cosine similarity against the whole store is one matrix
+    product per batch instead of a Python loop per stored article.
+    """
+
+    def __init__(self, dim: int = None, threshold: float = SIM_THRESHOLD):
+        self.threshold = threshold
+        self.dim = dim
+        self._matrix = None
+        self._size = 0
+        self.hashes: list[str] = []
+        self.timestamps: list[float] = []  # epoch seconds (UTC)
+        self._hash_set: set[str] = set()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Normalized embeddings currently in the index (view, no copy)."""
+        if self._matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    def contains_hash(self, h: str) -> bool:
+        return h in self._hash_set
+
+    def _ensure_capacity(self, extra: int):
+        needed = self._size + extra
+        if self._matrix is None:
+            capacity = max(INITIAL_CAPACITY, needed)
+            self._matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        elif needed > self._matrix.shape[0]:
+            capacity = max(needed, self._matrix.shape[0] * 2)
+            grown = np.empty((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+    def add(self, hashes: list[str], embeddings, timestamps: list[float] = None, normalized: bool = False):
+        """Append articles to the index. Embeddings are normalized unless `normalized=True`."""
+        if not hashes:
+            return
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+        if not normalized:
+            matrix = _normalize_rows(matrix)
+        if timestamps is None:
+            timestamps = [datetime.now(timezone.utc).timestamp()] * len(hashes)
+
+        self._ensure_capacity(len(hashes))
+        self._matrix[self._size:self._size + len(hashes)] = matrix
+        self._size += len(hashes)
+        self.hashes.extend(hashes)
+        self.timestamps.extend(float(t) for t in timestamps)
+        self._hash_set.update(hashes)
+
+    def evict_before(self, cutoff: float) -> int:
+        """Drop articles older than `cutoff` (epoch seconds) with one vectorized mask. Returns the count removed."""
+        keep = np.flatnonzero(np.asarray(self.timestamps, dtype=np.float64) >= cutoff)
+        removed = self._size - len(keep)
+        if removed:
+            self._matrix = np.ascontiguousarray(self.embeddings[keep])
+            self._size = len(keep)
+            self.hashes = [self.hashes[i] for i in keep]
+            self.timestamps = [self.timestamps[i] for i in keep]
+            self._hash_set = set(self.hashes)
+        return removed
+
+    def find_duplicates(self, embeddings) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Check a batch of embeddings against the stored index and against each other.
+
+        Returns (duplicate_mask, normalized_embeddings). An article is a duplicate if its
+        similarity to any stored article, or to an earlier non-duplicate article of the same
+        batch, reaches the threshold. The index itself is not modified.
+        """
+        batch = np.asarray(embeddings, dtype=np.float32)
+        if batch.size == 0:
+            return np.zeros(0, dtype=bool), batch.reshape(0, self.dim or 0)
+        if batch.ndim == 1:
+            batch = batch.reshape(1, -1)
+        batch = _normalize_rows(batch)
+
+        # 1. Against the store: one (new x stored) matrix product
+        if self._size:
+            sims = batch @ self.embeddings.T
+            duplicate = sims.max(axis=1) >= self.threshold
+        else:
+            duplicate = np.zeros(len(batch), dtype=bool)
+
+        # 2. Within the batch: earlier accepted articles win (keeps source priority order)
+        if len(batch) > 1:
+            batch_sims = batch @ batch.T
+            accepted = []
+            for i in range(len(batch)):
+                if duplicate[i]:
+                    continue
+                if accepted and batch_sims[i, accepted].max() >= self.threshold:
+                    duplicate[i] = True
+                else:
+                    accepted.append(i)
+
+        return duplicate, batch
+
+    def filter_new(self, hashes: list[str], embeddings, timestamps: list[float] = None) -> np.ndarray:
+        """Dedup a batch and add the accepted articles to the index. Returns the duplicate mask."""
+        duplicate, normalized = self.find_duplicates(embeddings)
+        keep = np.flatnonzero(~duplicate)
+        if len(keep):
+            self.add(
+                [hashes[i] for i in keep],
+                normalized[keep],
+                [timestamps[i] for i in keep] if timestamps is not None else None,
+                normalized=True
+            )
+        return duplicate
+
+    def save(self, path: str, embedding_dtype=STORE_EMBEDDING_DTYPE):
+        """Write the index as one structured .npy array, swapped in atomically with os.replace."""
+        records = np.empty(self._size, dtype=_record_dtype(self.dim or 1, embedding_dtype))
+        if self._size:
+            records["hash"] = np.array(self.hashes, dtype="S32")
+            records["timestamp"] = self.timestamps
+            records["embedding"] = self.embeddings
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = SIM_THRESHOLD, min_timestamp: float = None) -> "DedupIndex":
+        """
+        Load an index written by `save`. The file is memory-mapped, so with `min_timestamp`
+        only the records still inside the TTL window are copied into memory.
+        """
+        records = np.load(path, mmap_mode="r")
+        if min_timestamp is not None:
+            records = records[records["timestamp"] >= min_timestamp]
+        index = cls(threshold=threshold)
+        if len(records):
+            index.add(
+                records["hash"].astype(str).tolist(),
+                records["embedding"].astype(np.float32),
+                records["timestamp"].tolist(),
+                normalized=True
+            )
+        return index
+
+    @classmethod
+    def from_store(cls, store: dict, threshold: float = SIM_THRESHOLD) -> "DedupIndex":
+        """Build the index from the `{hash: {"timestamp", "embedding"}}` dedup store."""
+        index = cls(threshold=threshold)
+        if store:
+            hashes = list(store.keys())
+            embeddings = [store[h]["embedding"] for h in hashes]
+            timestamps = [datetime.fromisoformat(store[h]["timestamp"]).timestamp() for h in hashes]
+            index.add(hashes, embeddings, timestamps)
+        return index
+
+    def to_store(self) -> dict:
+        """Serialize back to the `{hash: {"timestamp", "embedding"}}` dedup store format."""
+        return {
+            h: {
+                "timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                "embedding": emb.tolist()
+            }
+            for h, ts, emb in zip(self.hashes, self.timestamps, self.embeddings)
+        }
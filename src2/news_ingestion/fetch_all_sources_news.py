@@ -1,4 +1,3 @@
-from apscheduler.schedulers.background import BackgroundScheduler
 from src2.news_ingestion.news_webscrape import (
     fetch_economic_times_articles_headless, 
     fetch_financial_express_articles_headless, 
@@ -6,15 +5,20 @@ from src2.news_ingestion.news_webscrape import (
     fetch_articles_from_groww
 )
 from src2.news_ingestion.news_rss import fetch_rss_entries
-from langchain_openai import OpenAIEmbeddings
-from utils.normalize_dates import normalize_date
+from src2.news_ingestion.dedup_index import DedupIndex, SIM_THRESHOLD
+from src2.news_ingestion.batch_embed import embed_texts
+from utils.normalize_dates import normalize_dates
+from utils.http_client import log_http_stats
+from utils.llm_clients import get_embeddings
+from utils.metrics import metrics
 from utils.logger_setup import setup_logger
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import json
 import hashlib
 from datetime import datetime, timedelta, timezone
+import time
 import os
-import numpy as np
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -22,12 +26,20 @@ load_dotenv()
 logger = setup_logger(__name__)
 
 # Params
-SIM_THRESHOLD = 0.85   # cosine similarity threshold
 TTL_HOURS = 48         # keep last 2 days
-DEDUP_PATH = "dedup_store.json"
-
-embeddings_model = OpenAIEmbeddings(model="text-embedding-3-small")
-
+DEDUP_PATH = "dedup_store.npy"
+LEGACY_DEDUP_PATH = "dedup_store.json"  # migrated to DEDUP_PATH on first load
+
+# Per-source fetch deadlines (seconds). The Selenium scrapes bound themselves to fit inside
+# theirs (chrome_pool's page-load, script and scroll limits), so their driver slot comes back.
+SOURCE_TIMEOUTS = {
+    "Financial Express": 90,
+    "Economic Times (Web)": 90,
+    "RSS": 30,
+    "Groww": 30,
+    "Pulse": 30,
+}
+DEFAULT_SOURCE_TIMEOUT = 60
 
 ### ----------------- Utility functions -----------------
 
@@ -35,64 +47,105 @@ def get_hash(text: str) -> str:
     """Fast exact-match hash (MD5)."""
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
-def load_dedup_store() -> dict:
+def load_dedup_index(ttl_hours=TTL_HOURS) -> DedupIndex:
+    """Dedup index of the last `ttl_hours`, migrating the legacy JSON store if that is all there is."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=ttl_hours)).timestamp()
     if os.path.exists(DEDUP_PATH):
-        with open(DEDUP_PATH, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_dedup_store(store: dict):
-    with open(DEDUP_PATH, "w") as f:
-        json.dump(store, f)
-
-def cleanup_store(store: dict, ttl_hours=TTL_HOURS):
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
-    return {
-        k: v for k, v in store.items()
-        if datetime.fromisoformat(v["timestamp"]) >= cutoff
-    }
-
-def is_duplicate(item, store):
+        return DedupIndex.load(DEDUP_PATH, threshold=SIM_THRESHOLD, min_timestamp=cutoff)
+    if os.path.exists(LEGACY_DEDUP_PATH):
+        with open(LEGACY_DEDUP_PATH, "r") as f:
+            index = DedupIndex.from_store(json.load(f), threshold=SIM_THRESHOLD)
+        index.evict_before(cutoff)
+        logger.info(f"📦 Migrated {len(index)} dedup entries from {LEGACY_DEDUP_PATH} to {DEDUP_PATH}")
+        return index
+    return DedupIndex(threshold=SIM_THRESHOLD)
+
+def save_dedup_index(index: DedupIndex):
+    index.save(DEDUP_PATH)
+
+def filter_duplicates(items: list[dict], index: DedupIndex) -> list[dict]:
     """
-    Check if article is duplicate using:
+    Drop duplicate articles from a batch using:
     1. Hash
-    2. Embedding similarity
+    2. Embedding similarity (against the index and within the batch)
+    Exact-hash hits are dropped before anything is embedded; the rest are embedded
+    in batched, concurrent `embed_documents` calls. Accepted articles are added to
+    the index; articles that could not be embedded are kept but not indexed.
     """
-    text = f"{item.get('title','')} {item.get('content','')}"
-    h = get_hash(item.get("title","") + item.get("url",""))
+    candidates, hashes = [], []
+    seen = set()
+    for item in items:
+        h = get_hash(item.get("title","") + item.get("url",""))
+
+        # 1. Exact hash match
+        if index.contains_hash(h) or h in seen:
+            continue
+        seen.add(h)
+        candidates.append(item)
+        hashes.append(h)
 
-    # 1. Exact hash match
-    if h in store:
-        return True, store
+    if not candidates:
+        return []
+
+    texts = [f"{item.get('title','')} {item.get('content','')}" for item in candidates]
+    embeddings = embed_texts(get_embeddings(caller="dedup"), texts)
+
+    embedded = [i for i, emb in enumerate(embeddings) if emb is not None]
+    if len(embedded) < len(candidates):
+        logger.error(f"❌ Embedding failed for {len(candidates) - len(embedded)} articles, keeping them without dedup")
 
     # 2. Embedding similarity check
-    try:
-        new_emb = embeddings_model.embed_query(text)
-    except Exception as e:
-        logger.error(f"❌ Embedding failed: {e}")
-        return False, store
-
-    for old_h, old_data in store.items():
-        old_emb = np.array(old_data["embedding"])
-        sim = np.dot(new_emb, old_emb) / (np.linalg.norm(new_emb) * np.linalg.norm(old_emb))
-        if sim >= SIM_THRESHOLD:
-            return True, store
-
-    # If not duplicate → add to store
-    store[h] = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "embedding": new_emb
-    }
-    return False, store
+    duplicate = set()
+    if embedded:
+        mask = index.filter_new([hashes[i] for i in embedded], [embeddings[i] for i in embedded])
+        duplicate = {i for i, dup in zip(embedded, mask) if dup}
+
+    return [item for i, item in enumerate(candidates) if i not in duplicate]
+
+
+### ----------------- Source fetching -----------------
+
+def _timed_fetch(fetch_fn):
+    start = time.perf_counter()
+    articles = fetch_fn()
+    return articles, time.perf_counter() - start
+
+def fetch_sources_concurrently(sources: list[tuple]) -> list[tuple[str, list[dict]]]:
+    """
+    Run every `(source_name, fetch_fn)` in its own thread, each bounded by its entry in
+    SOURCE_TIMEOUTS. Results are returned in the order of `sources` (priority order),
+    skipping sources that failed or missed their deadline. A hung source is abandoned,
+    not waited for.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="news-source")
+    started = time.monotonic()
+    futures = [(name, executor.submit(_timed_fetch, fetch_fn)) for name, fetch_fn in sources]
+
+    results = []
+    for source_name, future in futures:
+        timeout = SOURCE_TIMEOUTS.get(source_name, DEFAULT_SOURCE_TIMEOUT)
+        remaining = max(0.0, started + timeout - time.monotonic())
+        try:
+            articles, elapsed = future.result(timeout=remaining)
+            logger.info(f"📥 {source_name}: {len(articles)} articles in {elapsed:.1f}s")
+            metrics.inc("articles_fetched", len(articles), source=source_name)
+            results.append((source_name, articles))
+        except FutureTimeoutError:
+            logger.warning(f"⏰ {source_name}: timed out after {timeout}s, skipping")
+            metrics.inc("source_errors", source=source_name, kind="timeout")
+        except Exception as e:
+            logger.warning(f"⚠️ Error fetching {source_name} after {time.monotonic() - started:.1f}s: {e}")
+            metrics.inc("source_errors", source=source_name, kind="error")
+
+    # Don't block the run on a hung source; its thread finishes (or dies) on its own
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
 
 
 ### ----------------- Main Fetcher -----------------
 
 def fetch_all_sources_news(rss_urls) -> list[dict]:
-    store = load_dedup_store()
-    store = cleanup_store(store)
-
-    new_items = []
+    index = load_dedup_index()
 
     # Define priority order
     sources = [
@@ -103,24 +156,40 @@ def fetch_all_sources_news(rss_urls) -> list[dict]:
         ("Pulse", fetch_articles_from_pulse),
     ]
 
-    for source_name, fetch_fn in sources:
-        try:
-            articles = fetch_fn()
-            for item in articles:
-                raw_date = item.get("published_at", "")
-                normalized_date = normalize_date(raw_date)
-                item["published_at"] = normalized_date or datetime.now(timezone.utc).isoformat()
-
-                dup, store = is_duplicate(item, store)
-                if not dup:
-                    logger.info(f"🆕 {source_name}: {item['title']}")
-                    new_items.append(item)
-        except Exception as e:
-            logger.warning(f"⚠️ Error fetching {source_name}: {e}")
+    # Fetch all sources concurrently, then merge candidates in priority order
+    start = time.perf_counter()
+    with metrics.stage("fetch"):
+        candidates = [
+            (source_name, item)
+            for source_name, articles in fetch_sources_concurrently(sources)
+            for item in articles
+        ]
+    normalized_dates = normalize_dates([item.get("published_at", "") for _, item in candidates])
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    for (_, item), normalized_date in zip(candidates, normalized_dates):
+        item["published_at"] = normalized_date or fetched_at
+    logger.info(f"📰 Fetched {len(candidates)} candidates from all sources in {time.perf_counter() - start:.1f}s")
+    log_http_stats()
+
+    start = time.perf_counter()
+    items = [item for _, item in candidates]
+    with metrics.stage("dedup"):
+        unique = {id(item) for item in filter_duplicates(items, index)}
 
-    save_dedup_store(store)
-
-    logger.info(f"✅ Found {len(new_items)} new unique articles")
+    new_items = []
+    for source_name, item in candidates:
+        if id(item) in unique:
+            logger.info(f"🆕 {source_name}: {item['title']}")
+            new_items.append(item)
+
+    save_dedup_index(index)
+    metrics.inc("articles_new", len(new_items))
+    metrics.inc("articles_deduped", len(candidates) - len(new_items))
+
+    logger.info(
+        f"✅ Found {len(new_items)} new unique articles out of {len(candidates)} "
+        f"(dedup stage {time.perf_counter() - start:.2f}s)"
+    )
     return new_items
 
 
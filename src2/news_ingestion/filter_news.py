@@ -1,12 +1,15 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, RootModel
+from src2.news_ingestion.local_prefilter import LocalRelevanceMatcher, RELEVANT, AMBIGUOUS
+from utils.llm_clients import get_chat_model
+from utils.llm_cache import llm_cache, normalize_text
+from utils.metrics import metrics
 from utils.logger_setup import setup_logger
+from functools import lru_cache
 from dotenv import load_dotenv
+import hashlib
 import json
-import os
 
 load_dotenv()
 
@@ -65,11 +68,16 @@ ticker_map = {
     "eternal": "ETERNAL.NS"
 }
 
-# llm = ChatGoogleGenerativeAI(
-#             model="gemini-1.5-flash"
-#         )
+# Serialized once; identical for every prompt
+ticker_map_json = json.dumps(ticker_map)
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+# Local alias/keyword matcher, built once at import
+prefilter = LocalRelevanceMatcher(ticker_map)
+valid_tickers = set(ticker_map.values())
+
+# Batched identification
+LLM_BATCH_SIZE = 8          # articles per prompt
+LLM_MAX_CONCURRENCY = 4     # prompts in flight
 
 class StockImpactPrediction(BaseModel):
     ticker: str
@@ -103,29 +111,197 @@ stock_identification_prompt = PromptTemplate(
     Here is the article:
     {article_json}
     """.strip(),
-    input_variables=["ticker_map_json", "article_json"],
-    partial_variables={"format_instructions": parser.get_format_instructions()}
+    input_variables=["article_json"],
+    partial_variables={
+        "format_instructions": parser.get_format_instructions(),
+        "ticker_map_json": ticker_map_json
+    }
+)
+
+@lru_cache(maxsize=None)
+def get_stock_identifier_chain():
+    return stock_identification_prompt | get_chat_model(caller="filter_news") | parser
+
+class ArticleTickers(BaseModel):
+    article_id: str
+    tickers: list[str]
+
+class ArticleTickersList(RootModel[list[ArticleTickers]]):
+    pass
+
+batch_parser = PydanticOutputParser(pydantic_object=ArticleTickersList)
+
+batch_stock_identification_prompt = PromptTemplate(
+    template="""
+    You are a financial analyst AI assistant.
+
+    Your job is to analyze several news articles and, for **each article separately**, identify which **Nifty 50 companies** may be impacted by the news or are related to the news.
+
+    Instructions:
+    - Use the `ticker_map` below to map company names to their official ticker symbols.
+    - Match company names intelligently. For example, "Reliance Industries" or "RIL" → "reliance" → "RELIANCE.NS".
+    - Consider indirect references like founders, CEOs, subsidiaries, or related entities that clearly relate to a company in the ticker_map.
+    - Example: "Mukesh Ambani" implies "Reliance", "Narayana Murthy" implies "Infosys".
+    - If an article discusses broader market events (e.g., "Sensex falls 500 points", "Budget 2025", "RBI hike", "Indian markets rally") **but does not mention specific companies**, then:
+    ✅ Return **all ticker symbols** in the dictionary (i.e., all Nifty 50 stocks) for that article, as all may be impacted.
+    - If an article is **not about Indian companies or stock markets**, return an empty `tickers` list for it.
+    - Return exactly one entry per article, using its `article_id` unchanged.
+
+    {format_instructions}
+
+    Here is the stock-to-ticker mapping (keys are lowercase):
+    {ticker_map_json}
+
+    Here are the articles:
+    {articles_json}
+    """.strip(),
+    input_variables=["articles_json"],
+    partial_variables={
+        "format_instructions": batch_parser.get_format_instructions(),
+        "ticker_map_json": ticker_map_json
+    }
 )
 
-stock_identifier_chain = stock_identification_prompt | llm | parser
+@lru_cache(maxsize=None)
+def get_batch_stock_identifier_chain():
+    return batch_stock_identification_prompt | get_chat_model(caller="filter_news") | batch_parser
+
+# Identification results are cached per article; prompt changes invalidate them
+_PROMPT_FINGERPRINT = hashlib.sha256(
+    (stock_identification_prompt.template + batch_stock_identification_prompt.template + ticker_map_json).encode()
+).hexdigest()
+
+def _identification_key(article: dict) -> str:
+    """
+    Cache key of an article's tickers: model, temperature, prompts and the normalized title and
+    content only. Source, id and batch position are left out, so the same story arriving from
+    another feed or in another batch slot hits.
+    """
+    llm = get_chat_model(caller="filter_news")
+    text = f"{normalize_text(article.get('title'))}\n{normalize_text(article.get('content'))}"
+    return llm_cache.key(llm.model_name, llm.temperature, f"{_PROMPT_FINGERPRINT}\n{text}")
+
+def _article_for_prompt(article: dict) -> dict:
+    return {k: article.get(k, "") for k in ("title", "content", "source", "published_at")}
+
+def _identify_single(articles: dict[str, dict]) -> dict[str, list[str]]:
+    """One prompt per article, run concurrently. Failed articles are left out."""
+    ids = list(articles)
+    responses = get_stock_identifier_chain().batch(
+        [{"article_json": json.dumps(articles[i], indent=2)} for i in ids],
+        config={"max_concurrency": LLM_MAX_CONCURRENCY},
+        return_exceptions=True
+    )
+
+    results = {}
+    for article_id, response in zip(ids, responses):
+        if isinstance(response, Exception):
+            logger.error(f"❌ Failed to parse LLM response for article: {articles[article_id]['title']}\nError: {response}")
+            continue
+        results[article_id] = [r.ticker for r in response.root]
+    return results
+
+def identify_tickers_batched(articles: dict[str, dict]) -> dict[str, list[str]]:
+    """
+    Classify `{article_id: article}` with LLM_BATCH_SIZE articles per prompt (ticker map sent
+    once per prompt) and up to LLM_MAX_CONCURRENCY prompts in flight.
+    Returns `{article_id: [tickers]}`. Articles from a batch that failed to parse, or that
+    the batch response left out, are retried with single-article prompts.
+
+    Results are cached per article (see `_identification_key`); only articles without a
+    cached result are sent, and identical articles within the run are sent once.
+    """
+    keys = {article_id: _identification_key(article) for article_id, article in articles.items()}
+    results = {}
+    pending = {}   # key -> article_id sent for it
+    for article_id, key in keys.items():
+        cached = llm_cache.get(key, default=None)
+        if cached is not None:
+            results[article_id] = cached
+        else:
+            pending.setdefault(key, article_id)
+    if results:
+        logger.info(f"🗃️ {len(results)}/{len(articles)} articles classified from the LLM cache")
+
+    results.update(_classify_uncached({article_id: articles[article_id] for article_id in pending.values()}))
+    for key, article_id in pending.items():
+        if article_id in results:
+            llm_cache.put(key, results[article_id])
+    for article_id, key in keys.items():
+        if article_id not in results and pending.get(key) in results:
+            results[article_id] = results[pending[key]]
+
+    # Drop anything the model invented that isn't a Nifty 50 ticker
+    return {
+        article_id: [t for t in dict.fromkeys(tickers) if t in valid_tickers]
+        for article_id, tickers in results.items()
+    }
+
+def _classify_uncached(articles: dict[str, dict]) -> dict[str, list[str]]:
+    ids = list(articles)
+    chunks = [ids[i:i + LLM_BATCH_SIZE] for i in range(0, len(ids), LLM_BATCH_SIZE)]
+    if not chunks:
+        return {}
+
+    responses = get_batch_stock_identifier_chain().batch(
+        [
+            {"articles_json": json.dumps(
+                [{"article_id": i, **_article_for_prompt(articles[i])} for i in chunk], indent=2
+            )}
+            for chunk in chunks
+        ],
+        config={"max_concurrency": LLM_MAX_CONCURRENCY},
+        return_exceptions=True
+    )
+
+    results = {}
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, Exception):
+            logger.warning(f"⚠️ Batch of {len(chunk)} articles failed to parse, falling back to single calls: {response}")
+            continue
+        for entry in response.root:
+            if entry.article_id in articles:
+                results[entry.article_id] = entry.tickers
+
+    missing = {i: articles[i] for i in ids if i not in results}
+    if missing:
+        results.update(_identify_single(missing))
+    return results
 
 def identify_stocks_from_news(new_articles: list[dict]) -> list[dict]:
+    prefilter.reset_stats()
+
+    tagged = {}      # article_id -> tickers
+    ambiguous = {}   # article_id -> article
+    for idx, article in enumerate(new_articles):
+        article_id = f"a{idx}"
+        label, tickers = prefilter.classify(article)
+
+        # Definite matches and definite misses never reach the LLM
+        if label == RELEVANT:
+            tagged[article_id] = tickers
+        elif label == AMBIGUOUS:
+            ambiguous[article_id] = article
+
+    tagged.update(identify_tickers_batched(ambiguous))
+
     results = []
-    for article in new_articles:
-        try:
-            response = stock_identifier_chain.invoke({
-                "ticker_map_json": json.dumps(ticker_map, indent=2),
-                "article_json": json.dumps(article, indent=2)
-            })
-
-            if response.root:
-                results.extend([r.model_dump() for r in response.root])  #can use .append(response.__root__) as well, results -> list[list[dict]] if you want to group by article
-            else:
-                logger.info(f"ℹ️ No relevant stocks found for: {article['title']}")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to parse LLM response for article: {article['title']}\nError: {e}")
-    
+    for idx, article in enumerate(new_articles):
+        tickers = tagged.get(f"a{idx}")
+        if tickers:
+            results.extend([{"ticker": t, "article": article} for t in tickers])
+        elif f"a{idx}" in ambiguous:
+            logger.info(f"ℹ️ No relevant stocks found for: {article['title']}")
+
+    metrics.inc("articles_tagged", sum(1 for idx in range(len(new_articles)) if tagged.get(f"a{idx}")))
+    metrics.inc("pairs_tagged", len(results))
+    report = prefilter.report()
+    logger.info(
+        f"🔎 Pre-filter: {report['relevant']} relevant, {report['irrelevant']} irrelevant, "
+        f"{report['ambiguous']} ambiguous of {report['total']} → "
+        f"{-(-len(ambiguous) // LLM_BATCH_SIZE)} batched LLM prompts "
+        f"(skip rate {report['skip_rate']:.0%})"
+    )
     logger.info(f"✅ Found {len(results)} articles for final analysis.")
     return results
 
@@ -0,0 +1,135 @@
+from collections import Counter
+import re
+
+RELEVANT = "relevant"
+IRRELEVANT = "irrelevant"
+AMBIGUOUS = "ambiguous"
+
+# Extra names that clearly identify a Nifty 50 company (on top of the ticker_map keys)
+EXTRA_ALIASES = {
+    "RELIANCE.NS": ["reliance industries", "ril", "mukesh ambani", "jio platforms", "reliance jio", "reliance retail"],
+    "INFY.NS": ["narayana murthy", "salil parekh"],
+    "TCS.NS": ["tata consultancy services", "tata consultancy"],
+    "SBIN.NS": ["state bank of india"],
+    "LT.NS": ["larsen & toubro", "larsen and toubro", "larsen"],
+    "M&M.NS": ["m&m", "mahindra and mahindra"],
+    "HINDUNILVR.NS": ["hul", "hindustan unilever"],
+    "KOTAKBANK.NS": ["kotak mahindra bank", "kotak mahindra"],
+    "ULTRACEMCO.NS": ["ultratech"],
+    "DRREDDY.NS": ["dr reddy's", "dr. reddy's", "dr. reddy", "dr reddys"],
+    "HCLTECH.NS": ["hcl technologies", "hcltech"],
+    "BHARTIARTL.NS": ["airtel", "sunil mittal"],
+    "ETERNAL.NS": ["zomato", "blinkit", "eternal ltd", "eternal limited", "deepinder goyal"],
+    "MARUTI.NS": ["maruti suzuki"],
+    "APOLLOHOSP.NS": ["apollo hospital"],
+    "POWERGRID.NS": ["power grid corporation", "powergrid"],
+    "JIOFIN.NS": ["jio financial services", "jio fin"],
+    "SUNPHARMA.NS": ["sun pharmaceutical"],
+    "TITAN.NS": ["titan company"],
+    "TATAMOTORS.NS": ["jaguar land rover", "jlr"],
+    "BAJAJFINSV.NS": ["bajaj finserv"],
+    "HEROMOTOCO.NS": ["hero moto"],
+    "EICHERMOT.NS": ["royal enfield"],
+    "NESTLEIND.NS": ["nestle"],
+    "TATACONSUM.NS": ["tata consumer products"],
+    "INDUSINDBK.NS": ["indusind"],
+    "ADANIPORTS.NS": ["adani ports and sez", "apsez"],
+    "BEL.NS": ["bharat electronics"],
+    "COALINDIA.NS": ["coal india"],
+    "ONGC.NS": ["oil and natural gas corporation"],
+}
+
+# Names that also belong to other companies, are common words or are short forms; on their
+# own they only make an article ambiguous (e.g. "Reliance Power", "ITC Hotels", "eternal",
+# "Nestlé SA", "Airtel Africa", "JLR" results reported in pounds, "TCS" as tax collected
+# at source, "power grid" in general electricity news).
+WEAK_ALIASES = {
+    "reliance", "eternal", "titan", "trent", "itc", "sbi",
+    "nestle", "airtel", "larsen", "ril", "hul", "jlr",
+    "tcs", "power grid",
+}
+
+# Group and partial names shared by several Nifty 50 companies (and by companies outside
+# it). They point at no single ticker, so they only route the article to the LLM, which
+# resolves the indirect reference ("Adani group stocks", "a Tata company").
+GROUP_ALIASES = [
+    "adani", "hdfc", "icici", "kotak", "bajaj", "mahindra", "tata", "axis", "jio", "jsw",
+    "hindustan", "apollo", "bharat",
+]
+
+# Broad market terms and generic company cues. Without a company match these go to the
+# LLM, which decides whether the article concerns a listed company or the whole index.
+MARKET_KEYWORDS = [
+    "sensex", "nifty", "bse", "nse", "dalal street", "stock market", "stock markets",
+    "indian market", "indian markets", "indian equities", "equity market", "equity markets",
+    "rbi", "reserve bank", "repo rate", "monetary policy", "mpc", "union budget", "budget",
+    "fii", "fiis", "dii", "diis", "fpi", "fpis", "sebi", "rupee", "gdp", "inflation", "cpi",
+    "gst", "market cap", "mcap", "blue-chip", "bluechip", "largecap", "large-cap",
+    "india", "indian", "crore", "lakh", "₹", "rs",
+    "shares", "share price", "stock", "stocks", "ltd", "limited", "promoter", "promoters",
+    "ipo", "dividend", "buyback", "net profit", "quarterly results", "earnings", "merger",
+    "acquisition", "stake",
+]
+def _compile(terms) -> re.Pattern:
+    # Longest first so "sbi life" wins over "sbi"; lookarounds instead of \b so "l&t" and "m&m" work
+    alternation = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+    return re.compile(rf"(?<![\w&])(?:{alternation})(?![\w&])", re.IGNORECASE)
+
+
+class LocalRelevanceMatcher:
+    """
+    Regex automaton over company aliases and market keywords, compiled once.
+
+    classify() marks an article as:
+    - RELEVANT: an unambiguous company alias matched; returns the candidate tickers, no LLM needed
+    - AMBIGUOUS: only weak aliases, group names or market/company cues matched; needs the LLM
+    - IRRELEVANT: no Indian-market or company cue at all
+    """
+
+    def __init__(self, ticker_map: dict):
+        self.alias_to_ticker = {alias.lower(): ticker for alias, ticker in ticker_map.items()}
+        for ticker, aliases in EXTRA_ALIASES.items():
+            for alias in aliases:
+                self.alias_to_ticker.setdefault(alias.lower(), ticker)
+        for alias in GROUP_ALIASES:
+            self.alias_to_ticker.setdefault(alias, None)
+
+        self._alias_re = _compile(self.alias_to_ticker)
+        self._market_re = _compile(MARKET_KEYWORDS)
+        self.stats = Counter()
+
+    def classify(self, article: dict) -> tuple[str, list[str]]:
+        text = f"{article.get('title') or ''}\n{article.get('content') or ''}"
+
+        strong, weak = [], []
+        for match in self._alias_re.finditer(text):
+            alias = match.group(0).lower()
+            ticker = self.alias_to_ticker[alias]
+            bucket = weak if alias in WEAK_ALIASES or ticker is None else strong
+            if ticker not in bucket:
+                bucket.append(ticker)
+
+        if strong:
+            label = RELEVANT
+        elif weak or self._market_re.search(text):
+            label = AMBIGUOUS
+        else:
+            label = IRRELEVANT
+
+        self.stats[label] += 1
+        return label, strong
+
+    def report(self) -> dict:
+        """Match/skip counts since the last reset; `skip_rate` is the share not sent to the LLM."""
+        total = sum(self.stats.values())
+        skipped = self.stats[RELEVANT] + self.stats[IRRELEVANT]
+        return {
+            "total": total,
+            RELEVANT: self.stats[RELEVANT],
+            IRRELEVANT: self.stats[IRRELEVANT],
+            AMBIGUOUS: self.stats[AMBIGUOUS],
+            "skip_rate": skipped / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        self.stats.clear()
@@ -1,7 +1,12 @@
+from utils.http_client import conditional_get, commit_validators
 import feedparser
 
 def fetch_rss_entries(feed_url: str) -> list[dict]:
-    feed = feedparser.parse(feed_url)
+    response = conditional_get(feed_url, source="RSS")
+    if response is None:  # 304: feed unchanged, skip parsing
+        return []
+
+    feed = feedparser.parse(response.content)
 
     if feed.bozo:
         print(f"❌ Failed to parse feed {feed_url}:", feed.bozo_exception)
@@ -22,6 +27,7 @@ def fetch_rss_entries(feed_url: str) -> list[dict]:
             "published_at": published
         })
 
+    commit_validators(feed_url, response)
     return entries
 
 if __name__ == "__main__":
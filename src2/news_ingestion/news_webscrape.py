@@ -1,36 +1,18 @@
-import requests
-import tempfile
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from src2.news_ingestion.chrome_pool import chrome_pool, scroll_until_stable
+from utils.http_client import conditional_get, commit_validators
 from bs4 import BeautifulSoup
-import time
 import re
 
 def fetch_financial_express_articles_headless():
     url = "https://www.financialexpress.com/market/"
 
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--log-level=3")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/115 Safari/537.36")
-    
-     # ✅ unique profile per run
-    unique_profile = tempfile.mkdtemp()
-    options.add_argument(f"--user-data-dir={unique_profile}")
+    with chrome_pool.driver() as driver:
+        driver.get(url)
 
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
+        # Scroll to load content until the page stops growing
+        scroll_until_stable(driver, "return document.body.scrollHeight;", max_scrolls=4)
 
-    for _ in range(4):  # Scroll to load content
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-
-    html = driver.page_source
-    driver.quit()
+        html = driver.page_source
 
     soup = BeautifulSoup(html, "html.parser")
     full_text = soup.get_text(separator="\n")
@@ -65,27 +47,27 @@ def fetch_financial_express_articles_headless():
     return articles
 
 def fetch_economic_times_articles_headless():
+    from selenium.webdriver.common.by import By
+
     url = "https://economictimes.indiatimes.com/markets/stocks/news"
 
-    options = Options()
-    options.add_argument("--headless")
-    
-    # ✅ unique profile per run
-    unique_profile = tempfile.mkdtemp()
-    options.add_argument(f"--user-data-dir={unique_profile}")
-    
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
-
-    # Scroll to load more content
-    for _ in range(5):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-
-        articles = []
-    elements = driver.find_elements(By.CLASS_NAME, "eachStory")
-    # print(f"🧪 Found {len(elements)} article blocks")
+    with chrome_pool.driver() as driver:
+        driver.get(url)
+
+        # Scroll to load more content until the story count stops growing
+        scroll_until_stable(driver, "return document.getElementsByClassName('eachStory').length;", max_scrolls=5)
+
+        elements = driver.find_elements(By.CLASS_NAME, "eachStory")
+        # print(f"🧪 Found {len(elements)} article blocks")
+
+        articles = _parse_economic_times_stories(elements)
 
+    return articles
+
+def _parse_economic_times_stories(elements) -> list[dict]:
+    from selenium.webdriver.common.by import By
+
+    articles = []
     for e in elements:
         try:
             full_text = e.text.strip()
@@ -113,13 +95,13 @@ def fetch_economic_times_articles_headless():
             print("⚠️ Skipped due to:", ex)
             continue
 
-
-    driver.quit()
     return articles
 
 def fetch_articles_from_pulse():
     url = "https://pulse.zerodha.com/"
-    response = requests.get(url)
+    response = conditional_get(url, source="Pulse")
+    if response is None:  # 304: nothing new since last run
+        return []
     soup = BeautifulSoup(response.text, "html.parser")
 
     articles = []
@@ -144,15 +126,15 @@ def fetch_articles_from_pulse():
             "published_at": date,
         })
 
+    commit_validators(url, response)
     return articles
 
 def fetch_articles_from_groww():
     url = "https://groww.in/market-news/stocks"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = conditional_get(url, source="Groww")
+    if response is None:  # 304: nothing new since last run
+        return []
     soup = BeautifulSoup(response.text, "html.parser")
 
     # Select all news card links
@@ -188,6 +170,7 @@ def fetch_articles_from_groww():
             "published_at": published_at
         })
 
+    commit_validators(url, response)
     return news_data
 
 if __name__ == "__main__":
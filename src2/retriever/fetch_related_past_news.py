@@ -1,46 +1,117 @@
-from langchain.vectorstores import FAISS
-from langchain.retrievers import TimeWeightedVectorStoreRetriever
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_openai import OpenAIEmbeddings
+from src2.faiss_vector_store.vector_store_manager import get_vector_store_manager, EMBEDDING_MODEL
+from src2.faiss_vector_store.index_builder import search_parameters
+from src2.retriever.time_decay_ranker import rank_by_time_decay
+from utils.llm_clients import get_embeddings
 from utils.logger_setup import setup_logger
-import contextlib
-import io
 from dotenv import load_dotenv
+import numpy as np
+import time
 
 load_dotenv()
 
 logger = setup_logger(__name__)
 
-# Load embeddings & DB
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-vectorstore = FAISS.load_local("faiss_news_store", embeddings, allow_dangerous_deserialization=True)
+# Params
+DECAY_RATE = 0.01         # how much older docs decay in importance (per hour)
+TOP_K = 5                 # top k similar
+SCORE_THRESHOLD = 0.3     # remove low-relevance docs
+FETCH_K = 100             # FAISS candidates per query before time-weighting
+RETRIEVAL_SCOPE = "restrict"  # "restrict" | "boost" | "all" (see retrieve_related_past_news_batch)
+TICKER_BOOST = 0.2        # score bonus for articles tagged with the ticker under analysis
 
-# Set up time-aware retriever
-retriever = TimeWeightedVectorStoreRetriever(
-    vectorstore=vectorstore,
-    decay_rate=0.01,  # how much older docs decay in importance
-    k=5,              # top k similar
-    score_threshold=0.3,  # optional: remove low-score docs
-    metadata_key="published_at"  # important!
-)
+# Shared with the writer, so newly saved articles are searchable without a restart
+vector_store_manager = get_vector_store_manager()
 
-def retrieve_related_past_news(article: dict) -> list[dict]:
-    related_news = []
 
-    article_content = article['content']
+def _to_related_news(docs) -> list[dict]:
+    return [
+        {
+            'article_content': doc.page_content,
+            'article_date': doc.metadata.get('published_at')
+        }
+        for doc in docs
+    ]
 
-    # Suppress unwanted stdout prints
-    with contextlib.redirect_stdout(io.StringIO()):
-        docs = retriever.invoke(article_content)
+def _search_scoped(store, query: np.ndarray, positions: np.ndarray, fetch_k: int):
+    """Search only the given index positions (e.g. a ticker's articles), padded to `fetch_k`."""
+    import faiss
+    k = min(fetch_k, len(positions))
+    params = search_parameters(store.index, faiss.IDSelectorBatch(positions))
+    distances, found = store.index.search(query[None, :], k, params=params)
+    padded_distances = np.full(fetch_k, np.inf, dtype=np.float32)
+    padded_found = np.full(fetch_k, -1, dtype=np.int64)
+    padded_distances[:k], padded_found[:k] = distances[0], found[0]
+    return padded_distances, padded_found
 
-    for doc in docs:
-        doc_content = doc.page_content
-        doc_date = doc.metadata.get('published_at')  
+def retrieve_related_past_news_batch(
+    articles: dict[str, dict],
+    tickers: dict[str, list[str]] = None,
+    scope: str = RETRIEVAL_SCOPE
+) -> dict[str, list[dict]]:
+    """
+    Related past news for every article of a run, keyed like `articles`. Each distinct
+    content is embedded once (one embedding request for the run) and unscoped queries are
+    searched together as one matrix against the live index.
 
-        related_news.append({  
-            'article_content': doc_content,
-            'article_date': doc_date
-        })
+    `tickers` (keyed like `articles`) scopes each query to the stocks under analysis:
+    "restrict" searches only articles tagged with them (falling back to "boost" while they
+    have fewer than TOP_K articles), "boost" ranks their articles TICKER_BOOST higher.
+    """
+    related = {key: [] for key in articles}
+    store = vector_store_manager.get_store()
+    if not articles or store is None or store.index.ntotal == 0:
+        logger.info("ℹ️ Vector store is empty, no related past news yet.")
+        return related
 
-    return related_news
+    # One query per distinct (content, tickers); one embedding per distinct content
+    keys_by_query: dict[tuple, list[str]] = {}
+    for key, article in articles.items():
+        query_tickers = tuple(sorted((tickers or {}).get(key, ()))) if scope != "all" else ()
+        keys_by_query.setdefault((article['content'], query_tickers), []).append(key)
+    query_keys = list(keys_by_query)
+    contents = list(dict.fromkeys(content for content, _ in query_keys))
+    content_row = {content: row for row, content in enumerate(contents)}
 
+    embeddings = np.asarray(get_embeddings(EMBEDDING_MODEL, caller="retriever").embed_documents(contents), dtype=np.float32)
+
+    restricted = 0
+    with vector_store_manager.read() as store:
+        fetch_k = min(FETCH_K, store.index.ntotal)
+        distances = np.empty((len(query_keys), fetch_k), dtype=np.float32)
+        positions = np.empty((len(query_keys), fetch_k), dtype=np.int64)
+        boost = np.zeros((len(query_keys), fetch_k))
+
+        scoped = [vector_store_manager.positions_for_tickers(query_tickers) for _, query_tickers in query_keys]
+        unscoped = [
+            i for i, ticker_positions in enumerate(scoped)
+            if not (scope == "restrict" and len(ticker_positions) >= TOP_K)
+        ]
+        unscoped_set = set(unscoped)
+        if unscoped:
+            rows = [content_row[query_keys[i][0]] for i in unscoped]
+            distances[unscoped], positions[unscoped] = store.index.search(embeddings[rows], fetch_k)
+        for i, ((content, _), ticker_positions) in enumerate(zip(query_keys, scoped)):
+            if i in unscoped_set:
+                boost[i] = np.isin(positions[i], ticker_positions) * TICKER_BOOST
+            else:
+                distances[i], positions[i] = _search_scoped(store, embeddings[content_row[content]], ticker_positions, fetch_k)
+                restricted += 1
+
+        top_positions, _ = rank_by_time_decay(
+            distances, positions, vector_store_manager.published_epochs(), time.time(),
+            decay_rate=DECAY_RATE, k=TOP_K, score_threshold=SCORE_THRESHOLD, boost=boost
+        )
+        for query_key, row in zip(query_keys, top_positions):
+            docs = [store.docstore.search(store.index_to_docstore_id[position]) for position in row if position != -1]
+            news = _to_related_news(docs)
+            for key in keys_by_query[query_key]:
+                related[key] = news
+
+    logger.info(
+        f"🔎 Retrieved related news for {len(articles)} articles with {len(query_keys)} queries "
+        f"({restricted} ticker-restricted, {len(contents)} embeddings)"
+    )
+    return related
+
+def retrieve_related_past_news(article: dict, tickers: list[str] = None) -> list[dict]:
+    return retrieve_related_past_news_batch({"article": article}, {"article": tickers or []})["article"]
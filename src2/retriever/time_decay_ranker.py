@@ -0,0 +1,45 @@
+import numpy as np
+import math
+
+
+def rank_by_time_decay(
+    distances: np.ndarray,
+    positions: np.ndarray,
+    published: np.ndarray,
+    now: float,
+    decay_rate: float,
+    k: int,
+    score_threshold: float = None,
+    boost: np.ndarray = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Re-rank FAISS candidates of a batch of queries by similarity plus exponential time decay,
+    the scoring of LangChain's TimeWeightedVectorStoreRetriever:
+
+        score = (1 - decay_rate) ** hours_since_published + relevance
+
+    `distances` / `positions` are the (n_queries, fetch_k) squared-L2 results of `index.search`,
+    `published` holds the publication epoch of every index position (NaN: no recency bonus).
+    Candidates below `score_threshold` relevance are dropped; `boost` (same shape as
+    `distances`) is added to the score of each candidate.
+
+    Returns (positions, scores), both (n_queries, k), best first; empty slots are -1 / -inf.
+    """
+    # Same relevance as LangChain's FAISS store on L2 distances
+    relevance = 1.0 - distances / math.sqrt(2)
+    valid = positions >= 0
+    if score_threshold is not None:
+        valid &= relevance >= score_threshold
+
+    hours_passed = (now - published[np.where(positions >= 0, positions, 0)]) / 3600
+    recency = np.nan_to_num((1.0 - decay_rate) ** hours_passed, nan=0.0)
+    scores = recency + relevance
+    if boost is not None:
+        scores = scores + boost
+    scores = np.where(valid, scores, -np.inf)
+
+    # Stable, so ties keep FAISS order
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    top_scores = np.take_along_axis(scores, order, axis=1)
+    top_positions = np.where(np.isfinite(top_scores), np.take_along_axis(positions, order, axis=1), -1)
+    return top_positions, top_scores
@@ -0,0 +1,159 @@
+from utils.logger_setup import setup_logger
+from urllib.parse import quote
+import pandas as pd
+import threading
+import datetime
+import json
+import os
+
+logger = setup_logger(__name__)
+
+# Params
+CACHE_DIR = "ohlc_cache"
+LOOKBACK_DAYS = 10          # calendar days fetched for a ticker with no cache yet
+OHLC_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+
+class DailyBarsCache:
+    """
+    On-disk cache of daily OHLCV bars, one Parquet file per ticker (rows keyed by date).
+
+    `ensure()` brings a set of tickers up to date with a single multi-ticker download that
+    only covers the days missing from the cache. `downloader` is anything with yfinance's
+    `download()` signature (the real `yfinance` module, or tests/offline_yfinance.py in the tests).
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, downloader=None):
+        self.cache_dir = cache_dir
+        self._downloader = downloader
+        self._lock = threading.Lock()
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._meta_path = os.path.join(cache_dir, "_meta.json")
+        self._meta = None
+
+    @property
+    def downloader(self):
+        if self._downloader is None:
+            import yfinance
+            self._downloader = yfinance
+        return self._downloader
+
+    ### ----------------- Storage -----------------
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.cache_dir, f"{quote(ticker, safe='')}.parquet")
+
+    def _load_meta(self) -> dict:
+        if self._meta is None:
+            if os.path.exists(self._meta_path):
+                with open(self._meta_path, "r") as f:
+                    self._meta = json.load(f)
+            else:
+                self._meta = {}
+        return self._meta
+
+    def _save_meta(self):
+        tmp = f"{self._meta_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._meta, f, indent=2)
+        os.replace(tmp, self._meta_path)
+
+    def _load_bars(self, ticker: str) -> pd.DataFrame:
+        if ticker not in self._frames:
+            path = self._path(ticker)
+            if os.path.exists(path):
+                self._frames[ticker] = pd.read_parquet(path)
+            else:
+                self._frames[ticker] = pd.DataFrame(columns=["Date", *OHLC_COLUMNS])
+        return self._frames[ticker]
+
+    def _store_bars(self, ticker: str, new_bars: pd.DataFrame):
+        merged = pd.concat([self._load_bars(ticker), new_bars], ignore_index=True)
+        merged = merged.drop_duplicates(subset="Date", keep="last").sort_values("Date", ignore_index=True)
+        tmp = f"{self._path(ticker)}.tmp"
+        merged.to_parquet(tmp, index=False)
+        os.replace(tmp, self._path(ticker))
+        self._frames[ticker] = merged
+
+    ### ----------------- Fetching -----------------
+
+    @staticmethod
+    def _split_download(df: pd.DataFrame, tickers: list[str]) -> dict[str, pd.DataFrame]:
+        per_ticker = {}
+        for ticker in tickers:
+            if isinstance(df.columns, pd.MultiIndex):
+                if ticker not in df.columns.get_level_values(0):
+                    continue
+                bars = df[ticker]
+            else:
+                bars = df
+            bars = bars.dropna(how="all").reset_index()
+            if bars.empty:
+                continue
+            bars["Date"] = pd.to_datetime(bars["Date"]).dt.strftime("%Y-%m-%d")
+            per_ticker[ticker] = bars[["Date", *[c for c in OHLC_COLUMNS if c in bars.columns]]]
+        return per_ticker
+
+    def ensure(self, tickers: list[str], end_date: datetime.date):
+        """
+        Make sure every ticker has bars for all trading days before `end_date` (exclusive).
+        Stale tickers are fetched together in one download starting at the earliest missing day.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        through = (end_date - datetime.timedelta(days=1)).isoformat()
+
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta = self._load_meta()
+
+            stale, starts = [], []
+            for ticker in tickers:
+                fetched_through = meta.get(ticker)
+                if fetched_through and fetched_through >= through:
+                    continue
+                if fetched_through:
+                    start = datetime.date.fromisoformat(fetched_through) + datetime.timedelta(days=1)
+                else:
+                    start = end_date - datetime.timedelta(days=LOOKBACK_DAYS)
+                stale.append(ticker)
+                starts.append(start)
+
+            if not stale:
+                return
+
+            start = min(starts)
+            logger.info(f"📥 Downloading daily bars for {len(stale)} tickers from {start} to {end_date}")
+            df = self.downloader.download(
+                stale,
+                start=start.isoformat(),
+                end=end_date.isoformat(),
+                group_by="ticker",
+                progress=False
+            )
+
+            per_ticker = self._split_download(df, stale)
+            if not per_ticker:
+                # No rows for anyone: the range holds no trading days (weekend, holiday)
+                covered = stale
+            else:
+                # Tickers missing while others got rows are retried on the next call
+                covered = list(per_ticker)
+                missing = [ticker for ticker in stale if ticker not in per_ticker]
+                if missing:
+                    logger.warning(f"⚠️ No daily bars returned for {len(missing)} tickers: {', '.join(missing)}")
+            for ticker, bars in per_ticker.items():
+                self._store_bars(ticker, bars)
+            for ticker in covered:
+                meta[ticker] = max(meta.get(ticker, ""), through)
+            self._save_meta()
+
+    def get_bars(self, ticker: str, end_date: datetime.date, n: int = 5) -> pd.DataFrame:
+        """Last `n` cached bars strictly before `end_date`."""
+        with self._lock:
+            bars = self._load_bars(ticker)
+        bars = bars[bars["Date"] < end_date.isoformat()]
+        return bars.tail(n).reset_index(drop=True)
+
+
+bars_cache = DailyBarsCache()
+
@@ -1,31 +1,67 @@
+from src2.yfinance_historical_stocks_data_api.daily_bars_cache import bars_cache
 from utils.logger_setup import setup_logger
-import yfinance as yf
 import pandas as pd
 import datetime
 
 logger = setup_logger(__name__)
 
+def _end_date() -> datetime.date:
+    # Bars up to (not including) yesterday, as before
+    return datetime.date.today() - datetime.timedelta(days=1)
+
+def prefetch_daily_bars(tickers: list[str]):
+    """Bring the daily-bar cache up to date for all tickers of a run in one download."""
+    try:
+        bars_cache.ensure(tickers, _end_date())
+    except Exception as e:
+        logger.error(f"Error occurred while prefetching OHLC data: {e}")
+
 def get_last_5_days_ohlc_data(ticker: str):
     try:
-        end_date = datetime.datetime.today() - datetime.timedelta(days=1)
-        df = yf.download(ticker, end=end_date.strftime('%Y-%m-%d'), period="10d")
-        
-        df.reset_index(inplace=True)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-        
-        if isinstance(df.columns, pd.MultiIndex):
-           df.columns = df.columns.get_level_values(0)
-        
+        end_date = _end_date()
+        bars_cache.ensure([ticker], end_date)
+
+        df = bars_cache.get_bars(ticker, end_date, n=5)
         df = df.round(2)
         df["Volume"] = df["Volume"].astype(int)
 
-        last_5_days = df.tail(5)
-        markdown_table = last_5_days.to_markdown(index=False)
+        markdown_table = df.to_markdown(index=False)
 
         return markdown_table
     except Exception as e:
         logger.error(f"Error occurred while fetching OHLC data: {e}")
 
+def get_price_snapshot_markdown(tickers: list[str], live_closes: dict = None) -> str:
+    """
+    Compact one-row-per-ticker table (last close, 5-day change, average volume) for
+    multi-ticker prompts, rendered from the daily-bar cache.
+    """
+    try:
+        end_date = _end_date()
+        bars_cache.ensure(tickers, end_date)
+
+        rows = []
+        for ticker in tickers:
+            bars = bars_cache.get_bars(ticker, end_date, n=5)
+            if bars.empty:
+                continue
+            first_close, last_close = bars["Close"].iloc[0], bars["Close"].iloc[-1]
+            row = {
+                "Ticker": ticker,
+                "Last Close": round(float(last_close), 2),
+                "5D Change %": round(float((last_close / first_close - 1) * 100), 2),
+                "Avg Volume": int(bars["Volume"].mean()),
+            }
+            if live_closes is not None:
+                live_close = live_closes.get(ticker)
+                row["Live Price"] = round(float(live_close), 2) if live_close is not None else "N/A"
+            rows.append(row)
+
+        return pd.DataFrame(rows).to_markdown(index=False) if rows else "No price data available"
+    except Exception as e:
+        logger.error(f"Error occurred while building price snapshot: {e}")
+        return "No price data available"
+
 if __name__ == "__main__":
     result = get_last_5_days_ohlc_data("SBIN.NS")
-    print(result)
\ No newline at end of file
+    print(result)
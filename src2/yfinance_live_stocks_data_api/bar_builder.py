@@ -0,0 +1,195 @@
+from utils.logger_setup import setup_logger
+import pandas as pd
+import numpy as np
+import threading
+import bisect
+import math
+import time
+
+logger = setup_logger(__name__)
+
+# Params
+BAR_HISTORY_MINUTES = 24 * 60   # 1-minute bars kept per symbol
+REORDER_WINDOW_SEC = 60         # late ticks within this window of a symbol's newest tick are placed exactly
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _gain(day_volume: float, previous: float | None) -> float:
+    # Volume traded between two consecutive ticks; the first tick, resets and bad values add none
+    if previous is None:
+        return 0.0
+    delta = day_volume - previous
+    return 0.0 if math.isnan(delta) or delta < 0 else delta
+
+
+class _SymbolBars:
+    """
+    Ring of contiguous 1-minute bars for one symbol, stored in numpy arrays.
+    Minute `m` always lives at position `m % capacity`; minutes without ticks hold NaN
+    prices and zero volume, exactly like `resample("1min")`.
+
+    Ticks are ordered by (second, arrival), like the reference's stable sort. Open/close
+    keep the key of the tick that set them, and the ticks of the last REORDER_WINDOW_SEC
+    are kept so a late tick's volume can be split with its neighbours.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.open = np.full(capacity, np.nan)
+        self.high = np.full(capacity, np.nan)
+        self.low = np.full(capacity, np.nan)
+        self.close = np.full(capacity, np.nan)
+        self.volume = np.zeros(capacity)
+        self.open_key = np.zeros(capacity, dtype=np.int64)
+        self.close_key = np.zeros(capacity, dtype=np.int64)
+        self.first_minute = None
+        self.last_minute = None
+        self._arrivals = 0
+        # Recent ticks in (second, arrival) order, plus one anchor older than the window
+        self._secs: list[int] = []
+        self._day_volumes: list[float] = []
+        self._minutes: list[int] = []
+        self._pruned = False
+
+    def _clear(self, minutes: np.ndarray):
+        pos = minutes % self.capacity
+        self.open[pos] = np.nan
+        self.high[pos] = np.nan
+        self.low[pos] = np.nan
+        self.close[pos] = np.nan
+        self.volume[pos] = 0.0
+
+    def _advance(self, minute: int):
+        if self.last_minute is None or minute - self.last_minute >= self.capacity:
+            self._clear(np.arange(self.capacity))
+            self.first_minute = minute
+        else:
+            self._clear(np.arange(self.last_minute + 1, minute + 1))
+            self.first_minute = max(self.first_minute, minute - self.capacity + 1)
+        self.last_minute = minute
+
+    def _add_volume(self, epoch_sec: int, minute: int, day_volume: float):
+        secs = self._secs
+        i = bisect.bisect_right(secs, epoch_sec)
+        if i == 0 and self._pruned:
+            return  # later than the reorder window: its neighbours are gone, so it adds no volume
+
+        previous = self._day_volumes[i - 1] if i else None
+        if i < len(secs) and self._minutes[i] >= self.first_minute:
+            # The next tick's volume is now counted from this tick instead of the previous one
+            following = self._day_volumes[i]
+            self.volume[self._minutes[i] % self.capacity] += _gain(following, day_volume) - _gain(following, previous)
+        self.volume[minute % self.capacity] += _gain(day_volume, previous)
+
+        secs.insert(i, epoch_sec)
+        self._day_volumes.insert(i, day_volume)
+        self._minutes.insert(i, minute)
+
+        drop = bisect.bisect_left(secs, secs[-1] - REORDER_WINDOW_SEC) - 1
+        if drop > 0:
+            del secs[:drop], self._day_volumes[:drop], self._minutes[:drop]
+            self._pruned = True
+
+    def update(self, epoch_sec: int, minute: int, price: float, day_volume: float):
+        if self.last_minute is None or minute > self.last_minute:
+            self._advance(minute)
+        elif minute < self.first_minute:
+            if self.last_minute - minute >= self.capacity:
+                return  # older than the history we keep
+            self._clear(np.arange(minute, self.first_minute))
+            self.first_minute = minute
+
+        self._arrivals += 1
+        key = (epoch_sec << 32) | self._arrivals
+        self._add_volume(epoch_sec, minute, day_volume)
+
+        if math.isnan(price):
+            return
+        pos = minute % self.capacity
+        if math.isnan(self.open[pos]):
+            self.open[pos] = self.high[pos] = self.low[pos] = self.close[pos] = price
+            self.open_key[pos] = self.close_key[pos] = key
+            return
+        if price > self.high[pos]:
+            self.high[pos] = price
+        if price < self.low[pos]:
+            self.low[pos] = price
+        if key < self.open_key[pos]:
+            self.open[pos], self.open_key[pos] = price, key
+        if key > self.close_key[pos]:
+            self.close[pos], self.close_key[pos] = price, key
+
+    def frame(self, since_minute: int = None) -> pd.DataFrame:
+        start = self.first_minute if since_minute is None else max(self.first_minute, since_minute)
+        minutes = np.arange(start, self.last_minute + 1, dtype=np.int64)
+        pos = minutes % self.capacity
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(minutes * 60, unit="s"),
+            "open": self.open[pos],
+            "high": self.high[pos],
+            "low": self.low[pos],
+            "close": self.close[pos],
+            "volume": self.volume[pos],
+        })
+
+
+class StreamingBarBuilder:
+    """
+    Online 1-minute OHLCV aggregator fed one tick at a time.
+
+    Produces the same bars as `aggregate_multi_stock_tick_data` (which stays as the
+    reference implementation) without any DataFrame or file round-trip. Ticks arriving out
+    of order are placed by time, as the reference's sort would; a tick more than
+    REORDER_WINDOW_SEC behind the symbol's newest still updates its bar's prices but adds no
+    volume. Timestamps are local wall-clock minutes, matching the `readable_time` column of
+    the reference.
+    """
+
+    def __init__(self, capacity_minutes: int = BAR_HISTORY_MINUTES):
+        self.capacity_minutes = capacity_minutes
+        self._symbols: dict[str, _SymbolBars] = {}
+        self._lock = threading.Lock()
+        self._offset_hour = None
+        self._offset_sec = 0
+
+    def _local_minute(self, epoch_sec: int) -> int:
+        hour = epoch_sec // 3600
+        if hour != self._offset_hour:
+            self._offset_hour = hour
+            self._offset_sec = time.localtime(epoch_sec).tm_gmtoff
+        return (epoch_sec + self._offset_sec) // 60
+
+    def on_tick(self, symbol: str, epoch_ms, price, day_volume):
+        # Ticks without a day volume are dropped, as in the reference aggregation
+        if day_volume is None or (isinstance(day_volume, float) and math.isnan(day_volume)):
+            return
+        epoch_sec = int(epoch_ms) // 1000
+
+        with self._lock:
+            bars = self._symbols.get(symbol)
+            if bars is None:
+                bars = self._symbols[symbol] = _SymbolBars(self.capacity_minutes)
+            bars.update(epoch_sec, self._local_minute(epoch_sec), _to_float(price), _to_float(day_volume))
+
+    def on_message(self, msg: dict):
+        """Feed one decoded yfinance WebSocket message."""
+        symbol = msg.get("id")
+        if symbol:
+            self.on_tick(symbol, msg.get("time", "0"), msg.get("price"), msg.get("day_volume"))
+
+    def get_bars(self, symbols: list[str] = None, minutes: int = None) -> dict[str, pd.DataFrame]:
+        """
+        Bars per symbol, including the still-open current minute. With `minutes`, only the
+        bars of the last `minutes` minutes (by each symbol's latest tick) are returned.
+        """
+        with self._lock:
+            selected = self._symbols if symbols is None else {s: self._symbols[s] for s in symbols if s in self._symbols}
+            return {
+                symbol: bars.frame(None if minutes is None else bars.last_minute - minutes + 1)
+                for symbol, bars in selected.items()
+            }
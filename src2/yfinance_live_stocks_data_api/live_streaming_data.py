@@ -1,16 +1,16 @@
 from utils.sheet_utils import connect_google_sheets
 from gspread_dataframe import set_with_dataframe
+from src2.yfinance_live_stocks_data_api.tick_archive import tick_archive
 from utils.logger_setup import setup_logger
 import threading
 import asyncio
 from yfinance import AsyncWebSocket
 from datetime import datetime, timedelta
 import pandas as pd
-import time
 
 logger = setup_logger(__name__)
 
-async def capture_live_stocks_data(symbols: list, duration_sec: int, csv_filename: str) -> bool:
+async def capture_live_stocks_data(symbols: list, duration_sec: int, csv_filename: str = None) -> bool:
     collected_ticks = []
 
     async def handler(msg):
@@ -23,7 +23,7 @@ async def capture_live_stocks_data(symbols: list, duration_sec: int, csv_filenam
     next_minute = (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
     wait_seconds = (next_minute - now).total_seconds()
     logger.info(f"🕒 Waiting {wait_seconds:.1f}s to align with next minute...")
-    time.sleep(wait_seconds)
+    await asyncio.sleep(wait_seconds)
 
     ws = AsyncWebSocket()
     await ws.subscribe(symbols)
@@ -42,8 +42,15 @@ async def capture_live_stocks_data(symbols: list, duration_sec: int, csv_filenam
 
     logger.info(f"✅ Finished collecting {len(collected_ticks)} ticks.")
 
-    # Save to CSV
     if collected_ticks:
+        # Append to the partitioned tick archive (history is kept across runs)
+        rows = await asyncio.to_thread(tick_archive.append, collected_ticks)
+        logger.info(f"🗄️ Archived {rows} ticks to {tick_archive.root}")
+
+        if not csv_filename:
+            return True
+
+        # Optional CSV snapshot, for the pandas reference aggregation
         df = pd.json_normalize(collected_ticks)
 
         df = df.sort_values(by='time', ignore_index=True)
@@ -0,0 +1,156 @@
+from src2.yfinance_live_stocks_data_api.bar_builder import StreamingBarBuilder
+from src2.yfinance_live_stocks_data_api.tick_archive import tick_archive
+from utils.logger_setup import setup_logger
+import threading
+import asyncio
+
+logger = setup_logger(__name__)
+
+# Params
+RECONNECT_DELAY_SEC = 5
+ARCHIVE_FLUSH_SEC = 60       # how often buffered ticks are appended to the tick archive
+
+
+class LiveTickStream:
+    """
+    Long-running Yahoo Finance WebSocket subscription on its own thread and event loop.
+
+    Ticks are folded into 1-minute bars as they arrive, so callers read the current window
+    instantly instead of waiting for a capture. New symbols are subscribed on the open connection; a dropped connection is
+    re-established with the full symbol set. Every tick is also appended to the Parquet
+    tick archive in periodic batches.
+    """
+
+    def __init__(self, symbols: list[str] = None, archive=tick_archive):
+        self.archive = archive
+        self._pending: list[dict] = []
+        self._symbols: set[str] = set(symbols or [])
+        self.bars = StreamingBarBuilder()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._ws = None
+        self._stop_event = None
+        self._ready = threading.Event()
+
+    ### ----------------- Lifecycle -----------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="live-tick-stream", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        logger.info(f"📡 Live tick stream started for {len(self._symbols)} symbols")
+
+    def stop(self, timeout: float = 10):
+        if not (self._thread and self._thread.is_alive() and self._loop):
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join(timeout=timeout)
+        logger.info("⛔ Live tick stream stopped")
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._ready.set()
+        flush_task = asyncio.create_task(self._flush_periodically())
+
+        try:
+            await self._stream()
+        finally:
+            flush_task.cancel()
+            await asyncio.to_thread(self.flush_archive)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(ARCHIVE_FLUSH_SEC)
+            await asyncio.to_thread(self.flush_archive)
+
+    def flush_archive(self) -> int:
+        """Append buffered ticks to the tick archive. Returns rows written."""
+        if self.archive is None:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, []
+        try:
+            return self.archive.append(pending)
+        except Exception as e:
+            logger.error(f"❌ Failed to archive {len(pending)} ticks: {e}")
+            return 0
+
+    async def _stream(self):
+        from yfinance import AsyncWebSocket
+
+        while not self._stop_event.is_set():
+            with self._lock:
+                symbols = sorted(self._symbols)
+            if not symbols:
+                await self._wait_or_stop(RECONNECT_DELAY_SEC)
+                continue
+
+            ws = AsyncWebSocket()
+            try:
+                await ws.subscribe(symbols)
+                self._ws = ws
+                logger.info(f"✅ Connected & subscribed to {len(symbols)} symbols")
+
+                listener_task = asyncio.create_task(ws.listen(self._handle))
+                stop_task = asyncio.create_task(self._stop_event.wait())
+                done, _ = await asyncio.wait({listener_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+                for task in (listener_task, stop_task):
+                    if task not in done:
+                        task.cancel()
+                if listener_task in done and listener_task.exception():
+                    raise listener_task.exception()
+            except Exception as e:
+                logger.warning(f"⚠️ Live tick stream disconnected: {e}")
+            finally:
+                self._ws = None
+                try:
+                    await ws.close()
+                except Exception:
+                    pass
+
+            if not self._stop_event.is_set():
+                logger.info(f"🔁 Reconnecting in {RECONNECT_DELAY_SEC}s...")
+                await self._wait_or_stop(RECONNECT_DELAY_SEC)
+
+    async def _wait_or_stop(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    ### ----------------- Ticks -----------------
+
+    async def _handle(self, msg: dict):
+        if not msg.get("id"):
+            return
+        if self.archive is not None:
+            with self._lock:
+                self._pending.append(msg)
+        self.bars.on_message(msg)
+
+    def update_symbols(self, symbols: list[str]):
+        """Subscribe to any symbols not yet streamed (existing subscriptions are kept)."""
+        with self._lock:
+            new_symbols = sorted(set(symbols) - self._symbols)
+            self._symbols.update(new_symbols)
+        if not new_symbols:
+            return
+
+        ws, loop = self._ws, self._loop
+        if ws is not None and loop is not None:
+            future = asyncio.run_coroutine_threadsafe(ws.subscribe(new_symbols), loop)
+            try:
+                future.result(timeout=10)
+                logger.info(f"➕ Subscribed to {new_symbols}")
+            except Exception as e:
+                # Picked up on the next reconnect with the full symbol set
+                logger.warning(f"⚠️ Could not subscribe to {new_symbols} on the open connection: {e}")
+
+    def get_bars(self, symbols: list[str], minutes: int = 5) -> dict:
+        """1-minute OHLCV bars of the last `minutes` minutes per symbol, from the online builder."""
+        return self.bars.get_bars(symbols, minutes=minutes)
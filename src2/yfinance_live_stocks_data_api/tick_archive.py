@@ -0,0 +1,207 @@
+from utils.logger_setup import setup_logger
+from urllib.parse import quote, unquote
+from datetime import datetime, date, timedelta
+import pyarrow.parquet as pq
+import pyarrow as pa
+import threading
+import json
+import uuid
+import time
+import os
+
+logger = setup_logger(__name__)
+
+# Params
+ARCHIVE_DIR = "tick_archive"
+COMPACT_MIN_FILES = 2       # partitions with fewer files are left alone
+COMPACTING_SUFFIX = ".compacting"   # merged file not yet swapped in for its parts
+
+TICK_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("price", pa.float64()),
+    ("time", pa.int64()),          # epoch milliseconds
+    ("exchange", pa.string()),
+    ("quote_type", pa.int32()),
+    ("market_hours", pa.int32()),
+    ("change_percent", pa.float64()),
+    ("day_volume", pa.float64()),
+    ("change", pa.float64()),
+    ("last_size", pa.float64()),
+    ("price_hint", pa.string()),
+])
+
+
+def _coerce(value, field_type):
+    if value is None or value == "":
+        return None
+    try:
+        if pa.types.is_integer(field_type):
+            return int(value)
+        if pa.types.is_floating(field_type):
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class TickArchive:
+    """
+    Append-only Parquet archive of raw ticks, partitioned as
+    `<root>/date=YYYY-MM-DD/symbol=<SYMBOL>/part-*.parquet`.
+
+    Each append writes new part files (nothing is overwritten); `read()` prunes partitions
+    by date and symbol, then does a memory-mapped, column-pruned read of the time range;
+    `compact()` merges the small per-run parts of a day into one file per symbol.
+
+    A merged file is first written as `*.parquet.compacting`, listing the parts it replaces
+    in its metadata; the parts are then deleted and the file renamed in. If that is
+    interrupted, the next read or compaction of the partition finishes it, so rows are never
+    read twice or lost.
+    """
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _partition_dir(self, day: str, symbol: str) -> str:
+        return os.path.join(self.root, f"date={day}", f"symbol={quote(symbol, safe='')}")
+
+    @staticmethod
+    def _write_atomic(table: pa.Table, directory: str, name: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        tmp = f"{path}.tmp"
+        pq.write_table(table, tmp, compression="zstd")
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path
+
+    @staticmethod
+    def _finish_compaction(directory: str, pending_name: str):
+        pending = os.path.join(directory, pending_name)
+        replaced = json.loads(pq.read_schema(pending).metadata[b"compacted_parts"])
+        for name in replaced:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+        os.replace(pending, pending[:-len(COMPACTING_SUFFIX)])
+
+    def _recover(self, directory: str):
+        """Finish compactions of `directory` interrupted between writing and swapping in."""
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(COMPACTING_SUFFIX):
+                self._finish_compaction(directory, name)
+                logger.info(f"🗜️ Finished interrupted compaction in {directory}")
+
+    ### ----------------- Writing -----------------
+
+    def append(self, ticks: list[dict]) -> int:
+        """Write ticks (decoded WebSocket messages) as new part files. Returns rows written."""
+        if not ticks:
+            return 0
+
+        rows_by_partition: dict[tuple[str, str], list[dict]] = {}
+        for msg in ticks:
+            row = {field.name: _coerce(msg.get(field.name), field.type) for field in TICK_SCHEMA}
+            if not row["id"] or row["time"] is None:
+                continue
+            day = datetime.fromtimestamp(row["time"] / 1000).date().isoformat()
+            rows_by_partition.setdefault((day, row["id"]), []).append(row)
+
+        part_name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        written = 0
+        with self._lock:
+            for (day, symbol), rows in rows_by_partition.items():
+                rows.sort(key=lambda r: r["time"])
+                table = pa.Table.from_pylist(rows, schema=TICK_SCHEMA)
+                self._write_atomic(table, self._partition_dir(day, symbol), part_name)
+                written += len(rows)
+        return written
+
+    def compact(self, day: date = None) -> int:
+        """Merge the part files of each symbol partition of `day` (default: today). Returns partitions compacted."""
+        day = (day or date.today()).isoformat()
+        day_dir = os.path.join(self.root, f"date={day}")
+        if not os.path.isdir(day_dir):
+            return 0
+
+        compacted = 0
+        with self._lock:
+            for symbol_dir in sorted(os.listdir(day_dir)):
+                directory = os.path.join(day_dir, symbol_dir)
+                self._recover(directory)
+                parts = sorted(f for f in os.listdir(directory) if f.endswith(".parquet"))
+                if len(parts) < COMPACT_MIN_FILES:
+                    continue
+
+                paths = [os.path.join(directory, f) for f in parts]
+                table = pq.ParquetDataset(paths, schema=TICK_SCHEMA).read()
+                table = table.sort_by("time").replace_schema_metadata({"compacted_parts": json.dumps(parts)})
+
+                # Not visible to read() until its parts are gone and it is renamed in
+                pending_name = f"part-{parts[-1][5:-8]}-compacted.parquet{COMPACTING_SUFFIX}"
+                self._write_atomic(table, directory, pending_name)
+                self._finish_compaction(directory, pending_name)
+                compacted += 1
+
+        if compacted:
+            logger.info(f"🗜️ Compacted {compacted} tick partitions for {day}")
+        return compacted
+
+    ### ----------------- Reading -----------------
+
+    def _files(self, symbols: list[str], start: datetime, end: datetime) -> list[str]:
+        files = []
+        day, last_day = start.date(), end.date()
+        while day <= last_day:
+            for symbol in symbols:
+                directory = self._partition_dir(day.isoformat(), symbol)
+                if os.path.isdir(directory):
+                    if any(f.endswith(COMPACTING_SUFFIX) for f in os.listdir(directory)):
+                        with self._lock:
+                            self._recover(directory)
+                    files.extend(
+                        os.path.join(directory, f)
+                        for f in sorted(os.listdir(directory)) if f.endswith(".parquet")
+                    )
+            day += timedelta(days=1)
+        return files
+
+    def read(self, symbols: list[str], start: datetime, end: datetime, columns: list[str] = None) -> pa.Table:
+        """
+        Ticks of `symbols` with `start <= time < end` (naive datetimes are local time).
+        Only the partitions in range are opened, files are memory-mapped, and only
+        `columns` (plus `time`, needed for the filter) are read.
+        """
+        files = self._files(symbols, start, end)
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, "time"]))
+        if not files:
+            schema = TICK_SCHEMA if read_columns is None else pa.schema([TICK_SCHEMA.field(c) for c in read_columns])
+            table = schema.empty_table()
+        else:
+            start_ms, end_ms = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+            dataset = pq.ParquetDataset(
+                files,
+                schema=TICK_SCHEMA,
+                memory_map=True,
+                filters=[("time", ">=", start_ms), ("time", "<", end_ms)]
+            )
+            table = dataset.read(columns=read_columns).sort_by("time")
+        return table if columns is None or "time" in columns else table.drop(["time"])
+
+    def symbols_for(self, day: date) -> list[str]:
+        day_dir = os.path.join(self.root, f"date={day.isoformat()}")
+        if not os.path.isdir(day_dir):
+            return []
+        return [unquote(d.split("=", 1)[1]) for d in sorted(os.listdir(day_dir)) if d.startswith("symbol=")]
+
+
+tick_archive = TickArchive()
+
+
+if __name__ == "__main__":
+    end = datetime.now()
+    table = tick_archive.read(["RELIANCE.NS", "TCS.NS"], end - timedelta(hours=6), end, columns=["id", "price", "day_volume"])
+    print(table.num_rows)
+    print(table.to_pandas().tail())
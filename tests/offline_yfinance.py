@@ -0,0 +1,54 @@
+"""
+Offline stand-in for `yfinance.download`, for exercising DailyBarsCache without network.
+
+Bars are deterministic per (ticker, date) and only exist on weekdays, so repeated or
+overlapping downloads return identical rows. Every call is recorded in `calls`.
+"""
+import pandas as pd
+import numpy as np
+import zlib
+
+calls: list[dict] = []
+
+
+def _bar(ticker: str, day: pd.Timestamp) -> dict:
+    seed = zlib.crc32(f"{ticker}|{day.date()}".encode())
+    rng = np.random.default_rng(seed)
+    base = 100 + zlib.crc32(ticker.encode()) % 2000
+    open_ = base * (1 + rng.normal(0, 0.01))
+    close = open_ * (1 + rng.normal(0, 0.01))
+    return {
+        "Close": close,
+        "High": max(open_, close) * (1 + abs(rng.normal(0, 0.003))),
+        "Low": min(open_, close) * (1 - abs(rng.normal(0, 0.003))),
+        "Open": open_,
+        "Volume": int(rng.integers(100_000, 5_000_000)),
+    }
+
+
+def download(tickers, start=None, end=None, period=None, group_by="column", progress=True, **kwargs) -> pd.DataFrame:
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    calls.append({"tickers": list(tickers), "start": start, "end": end, "period": period})
+
+    end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+    if start:
+        start = pd.Timestamp(start)
+    else:
+        days = int(str(period or "10d").rstrip("d"))
+        start = end - pd.Timedelta(days=days)
+
+    # `end` is exclusive, like yfinance
+    days = pd.bdate_range(start, end - pd.Timedelta(days=1), name="Date")
+
+    frames = {
+        ticker: pd.DataFrame([_bar(ticker, day) for day in days], index=days)
+        for ticker in tickers
+    }
+    if not days.size:
+        frames = {ticker: pd.DataFrame(columns=["Close", "High", "Low", "Open", "Volume"], index=days) for ticker in tickers}
+
+    if group_by == "ticker":
+        return pd.concat(frames, axis=1)
+    df = pd.concat(frames, axis=1).swaplevel(axis=1)
+    return df.sort_index(axis=1, level=0, sort_remaining=False)
@@ -0,0 +1,110 @@
+from src2.final_analysis import analysis_engine, final_analysis_by_llm
+from src2.final_analysis.analysis_engine import GROUPED_ANALYSIS_THRESHOLD, NO_IMPACT_TEXT
+from src2.final_analysis.final_analysis_by_llm import GroupedAnalysis, TickerSignal
+import asyncio
+import pytest
+
+MARKET_WIDE = ["SBIN.NS", "ICICIBANK.NS", "AXISBANK.NS", "KOTAKBANK.NS", "INDUSINDBK.NS", "LT.NS", "NTPC.NS"]
+AT_THRESHOLD = ["ITC.NS", "CIPLA.NS", "GRASIM.NS", "TECHM.NS", "TATASTEEL.NS"]
+
+
+def article(title: str) -> dict:
+    return {"title": title, "content": f"{title} body", "url": f"https://example.com/{len(title)}", "source": "RSS"}
+
+
+class StubChain:
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    async def ainvoke(self, inputs, config=None):
+        self.calls.append(inputs)
+        return self.respond(inputs)
+
+
+def grouped_answer(inputs) -> GroupedAnalysis:
+    # Leaves out NTPC.NS, invents a ticker, and sees no impact on LT.NS
+    signals = [
+        TickerSignal(ticker=t, signal="Positive", potential="1-2%", confidence="Medium", rationale=f"{t} gains")
+        for t in MARKET_WIDE[:5]
+    ]
+    signals.append(TickerSignal(ticker="LT.NS", signal="No impact", potential="", confidence="", rationale="-"))
+    signals.append(TickerSignal(ticker="FAKE.NS", signal="Positive", potential="5%", confidence="High", rationale="-"))
+    return GroupedAnalysis(market_summary="Rate cut", sector_analysis="Banks", signals=signals)
+
+def single_answer(inputs) -> dict:
+    return {
+        "signal_analysis": f"Positive for {inputs['stock_name']}",
+        "potential_analysis": "1%",
+        "confidence_analysis": "Low",
+        "sector_analysis": "FMCG",
+    }
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    grouped_chain, single_chain, alerts = StubChain(grouped_answer), StubChain(single_answer), []
+    monkeypatch.setattr(final_analysis_by_llm, "get_grouped_chain", lambda: grouped_chain)
+    monkeypatch.setattr(final_analysis_by_llm, "get_chain", lambda: single_chain)
+    monkeypatch.setattr(analysis_engine, "_retrieve_all", lambda queries: {key: "related" for key in queries})
+    monkeypatch.setattr(
+        analysis_engine, "_download_all_ohlc",
+        lambda tickers, grouped, live: ({t: "ohlc" for t in tickers}, {key: "snapshot" for key in grouped})
+    )
+    monkeypatch.setattr(analysis_engine, "send_telegram_message", alerts.append)
+
+    async def no_pool():
+        pass
+    monkeypatch.setattr(analysis_engine, "aclose_async_pool", no_pool)
+    return grouped_chain, single_chain, alerts
+
+
+def run(items: list[dict]) -> list[dict]:
+    return asyncio.run(analysis_engine.run_analysis(items, live_result={}))
+
+
+def test_articles_above_the_threshold_get_one_grouped_call(pipeline):
+    grouped_chain, single_chain, alerts = pipeline
+    market_news, sector_news = article("RBI cuts repo rate"), article("Monsoon boosts rural demand")
+    assert len(MARKET_WIDE) > GROUPED_ANALYSIS_THRESHOLD == len(AT_THRESHOLD)
+    items = [{"article": market_news, "ticker": t} for t in MARKET_WIDE]
+    items += [{"article": sector_news, "ticker": t} for t in AT_THRESHOLD]
+
+    results = run(items)
+
+    call, = grouped_chain.calls
+    assert [line.split(":")[0] for line in call["stock_list"].splitlines()] == [f"- {t}" for t in MARKET_WIDE]
+    assert call["price_snapshot_markdown"] == "snapshot"
+    assert len(single_chain.calls) == len(AT_THRESHOLD)
+    assert {r["stock_ticker"] for r in results} == set(MARKET_WIDE[:6]) | set(AT_THRESHOLD)
+    # One combined alert for the grouped article, one per ticker otherwise
+    grouped_alert, = [a for a in alerts if a.startswith("📊 *Market-wide Analysis")]
+    assert "5 of 6 stocks impacted" in grouped_alert
+    assert len(alerts) == 1 + len(AT_THRESHOLD)
+
+def test_grouped_answer_expands_to_per_ticker_results(pipeline):
+    market_news = article("RBI cuts repo rate")
+    results = run([{"article": market_news, "ticker": t} for t in MARKET_WIDE])
+    by_ticker = {r["stock_ticker"]: r for r in results}
+
+    # Left out by the model: no result; invented by the model: dropped
+    assert "NTPC.NS" not in by_ticker and "FAKE.NS" not in by_ticker
+    assert by_ticker["LT.NS"]["signal_analysis"] == NO_IMPACT_TEXT
+    assert by_ticker["SBIN.NS"] == {
+        "stock_ticker": "SBIN.NS",
+        "signal_analysis": "Positive: SBIN.NS gains",
+        "potential_analysis": "1-2%",
+        "confidence_analysis": "Medium",
+        "sector_analysis": "Banks",
+        "article": analysis_engine.format_latest_news(market_news),
+    }
+
+def test_grouped_article_without_impact_sends_no_alert(pipeline):
+    grouped_chain, _, alerts = pipeline
+    grouped_chain.respond = lambda inputs: GroupedAnalysis(
+        market_summary="-", sector_analysis="-",
+        signals=[TickerSignal(ticker=t, signal="No impact", potential="", confidence="", rationale="-") for t in MARKET_WIDE]
+    )
+    results = run([{"article": article("Holiday notice"), "ticker": t} for t in MARKET_WIDE])
+    assert len(results) == len(MARKET_WIDE)
+    assert alerts == []
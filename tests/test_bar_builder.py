@@ -0,0 +1,92 @@
+from src2.yfinance_live_stocks_data_api.aggregate_live_stock_data import aggregate_multi_stock_tick_data
+from src2.yfinance_live_stocks_data_api.bar_builder import StreamingBarBuilder
+from datetime import datetime
+import tempfile
+import os
+import pandas as pd
+import numpy as np
+import pytest
+
+START_MS = int(datetime(2025, 8, 11, 9, 15).timestamp() * 1000)
+
+
+def tick(symbol: str, offset_sec: float, price, day_volume) -> dict:
+    epoch_ms = START_MS + int(offset_sec * 1000)
+    return {
+        "id": symbol,
+        "price": price,
+        "time": str(epoch_ms),
+        "day_volume": day_volume,
+        "readable_time": datetime.fromtimestamp(epoch_ms // 1000).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def replay(ticks: list[dict]) -> dict[str, pd.DataFrame]:
+    builder = StreamingBarBuilder()
+    for msg in ticks:
+        builder.on_message(msg)
+    return builder.get_bars()
+
+def assert_parity(ticks: list[dict]):
+    # The reference reads ticks the way capture_live_stocks_data records them
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        pd.DataFrame(ticks).to_csv(path, index=False)
+        reference = aggregate_multi_stock_tick_data(path)
+    online = replay(ticks)
+    assert set(online) == set(reference)
+    for symbol, expected in reference.items():
+        pd.testing.assert_frame_equal(online[symbol], expected, check_dtype=False, check_freq=False, obj=symbol)
+
+
+@pytest.fixture
+def ticks() -> list[dict]:
+    """Two symbols over 8 minutes: a 3-minute gap, a day-volume reset, missing and bad values."""
+    rng = np.random.default_rng(3)
+    out = []
+    volume = {"AAA.NS": 1000, "BBB.NS": 5000}
+    for second in range(0, 8 * 60, 7):
+        if 2 * 60 <= second < 5 * 60:
+            continue   # no ticks at all: empty minutes
+        for symbol in volume:
+            volume[symbol] += int(rng.integers(0, 300))
+            out.append(tick(symbol, second + rng.random(), round(100 + rng.normal(), 2), volume[symbol]))
+    out[5]["price"] = None
+    out[9]["day_volume"] = None
+    out[14]["day_volume"] = "bad"
+    # Day-volume reset (new session counter) for one symbol
+    for t in out[-10:]:
+        if t["id"] == "AAA.NS":
+            t["day_volume"] -= 10_000 if isinstance(t["day_volume"], int) else 0
+    return out
+
+
+def test_in_order_ticks_match_the_reference(ticks):
+    assert_parity(ticks)
+
+def test_empty_minutes_are_nan_bars_with_zero_volume(ticks):
+    bars = replay(ticks)["AAA.NS"]
+    gap = bars.iloc[2:5]
+    assert gap[["open", "high", "low", "close"]].isna().all().all()
+    assert (gap["volume"] == 0).all()
+
+def test_day_volume_reset_adds_no_negative_volume(ticks):
+    assert (replay(ticks)["AAA.NS"]["volume"] >= 0).all()
+
+def test_out_of_order_ticks_match_the_reference(ticks):
+    shuffled = list(ticks)
+    # Swap neighbours a few seconds apart, some across a minute boundary
+    for i in (3, 20, 33, 41, 58):
+        shuffled[i], shuffled[i + 2] = shuffled[i + 2], shuffled[i]
+    assert_parity(shuffled)
+
+def test_late_tick_before_the_first_bar_extends_the_history():
+    ticks = [tick("AAA.NS", 75, 101.0, 200), tick("AAA.NS", 80, 102.0, 260), tick("AAA.NS", 30, 100.0, 100)]
+    assert_parity(ticks)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_locally_shuffled_stream_matches_the_reference(ticks, seed):
+    # Delivery jitter: every tick may arrive up to ~20 seconds late
+    rng = np.random.default_rng(seed)
+    jitter = [int(t["time"]) + rng.uniform(0, 20_000) for t in ticks]
+    shuffled = [ticks[i] for i in np.argsort(jitter, kind="stable")]
+    assert_parity(shuffled)
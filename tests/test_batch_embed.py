@@ -0,0 +1,34 @@
+from src2.news_ingestion.batch_embed import embed_texts
+
+
+class ShortChunkEmbeddings:
+    """Drops the last vector of the chunk containing `short_text`, `failures` times."""
+
+    def __init__(self, short_text: str, failures: int):
+        self.short_text = short_text
+        self.failures = failures
+
+    def embed_documents(self, texts):
+        vectors = [[float(t.split()[-1])] for t in texts]
+        if self.short_text in texts and self.failures:
+            self.failures -= 1
+            return vectors[:-1]
+        return vectors
+
+
+def test_embeddings_stay_aligned_with_their_texts():
+    texts = [f"text {i}" for i in range(10)]
+    results = embed_texts(ShortChunkEmbeddings("text 4", failures=0), texts, batch_size=3, backoff=0)
+    assert results == [[float(i)] for i in range(10)]
+
+def test_short_chunk_is_retried():
+    texts = [f"text {i}" for i in range(10)]
+    results = embed_texts(ShortChunkEmbeddings("text 4", failures=1), texts, batch_size=3, backoff=0)
+    assert results == [[float(i)] for i in range(10)]
+
+def test_short_chunk_that_keeps_failing_is_dropped_without_shifting_others():
+    texts = [f"text {i}" for i in range(10)]
+    results = embed_texts(ShortChunkEmbeddings("text 4", failures=99), texts, batch_size=3, max_retries=2, backoff=0)
+    assert results[3:6] == [None, None, None]
+    assert results[:3] + results[6:] == [[float(i)] for i in (0, 1, 2, 6, 7, 8, 9)]
+    assert len(results) == len(texts)
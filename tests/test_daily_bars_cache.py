@@ -0,0 +1,91 @@
+from src2.yfinance_historical_stocks_data_api.daily_bars_cache import DailyBarsCache, LOOKBACK_DAYS
+from tests import offline_yfinance
+import pandas as pd
+import datetime
+import pytest
+
+END = datetime.date(2025, 7, 25)   # a Friday
+
+
+class FlakyDownloader:
+    """offline_yfinance, except `drop` tickers are missing from the returned frame."""
+
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.calls = []
+
+    def download(self, tickers, **kwargs):
+        self.calls.append({"tickers": list(tickers), **kwargs})
+        df = offline_yfinance.download(tickers, **kwargs)
+        keep = [t for t in tickers if t not in self.drop]
+        return df[keep] if keep else df.iloc[:0, :0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DailyBarsCache(cache_dir=str(tmp_path), downloader=FlakyDownloader())
+
+
+def test_first_download_covers_the_lookback_window(cache):
+    cache.ensure(["SBIN.NS"], END)
+    call, = cache.downloader.calls
+    assert call["start"] == (END - datetime.timedelta(days=LOOKBACK_DAYS)).isoformat()
+    assert call["end"] == END.isoformat()
+    assert cache.get_bars("SBIN.NS", END)["Date"].iloc[-1] == "2025-07-24"
+
+def test_incremental_download_starts_after_the_cached_days(cache):
+    cache.ensure(["SBIN.NS", "TCS.NS"], END - datetime.timedelta(days=3))
+    cache.ensure(["SBIN.NS", "TCS.NS", "INFY.NS"], END)
+    cache.ensure(["SBIN.NS", "TCS.NS", "INFY.NS"], END)
+
+    first, second = cache.downloader.calls   # the third ensure is fully cached
+    assert first["tickers"] == ["SBIN.NS", "TCS.NS"]
+    # INFY.NS has no cache, so the shared download starts at its lookback window
+    assert second["tickers"] == ["SBIN.NS", "TCS.NS", "INFY.NS"]
+    assert second["start"] == (END - datetime.timedelta(days=LOOKBACK_DAYS)).isoformat()
+
+    cache.ensure(["SBIN.NS", "TCS.NS"], END + datetime.timedelta(days=4))
+    third = cache.downloader.calls[-1]
+    assert third["tickers"] == ["SBIN.NS", "TCS.NS"]
+    assert third["start"] == END.isoformat()
+
+def test_multi_ticker_download_is_split_per_ticker(cache):
+    cache.ensure(["SBIN.NS", "TCS.NS"], END)
+    expected = offline_yfinance.download(["TCS.NS"], start="2025-07-21", end=END.isoformat(), group_by="ticker")["TCS.NS"]
+
+    bars = cache.get_bars("TCS.NS", END)
+    assert bars["Date"].tolist() == ["2025-07-18", "2025-07-21", "2025-07-22", "2025-07-23", "2025-07-24"]
+    pd.testing.assert_series_equal(
+        bars["Close"].iloc[1:].reset_index(drop=True), expected["Close"].reset_index(drop=True),
+        check_names=False, check_dtype=False
+    )
+    assert not cache.get_bars("SBIN.NS", END)["Close"].equals(bars["Close"])
+
+def test_split_accepts_a_flat_single_ticker_frame():
+    df = offline_yfinance.download(["SBIN.NS"], start="2025-07-21", end=END.isoformat(), group_by="ticker")["SBIN.NS"]
+    per_ticker = DailyBarsCache._split_download(df, ["SBIN.NS"])
+    assert per_ticker["SBIN.NS"]["Date"].tolist() == ["2025-07-21", "2025-07-22", "2025-07-23", "2025-07-24"]
+
+def test_tickers_without_rows_are_retried(tmp_path):
+    downloader = FlakyDownloader(drop={"TCS.NS"})
+    cache = DailyBarsCache(cache_dir=str(tmp_path), downloader=downloader)
+    cache.ensure(["SBIN.NS", "TCS.NS"], END)
+    assert cache.get_bars("TCS.NS", END).empty
+
+    downloader.drop.clear()
+    cache.ensure(["SBIN.NS", "TCS.NS"], END)
+    assert downloader.calls[-1]["tickers"] == ["TCS.NS"]
+    assert len(cache.get_bars("TCS.NS", END)) == 5
+
+def test_weekend_and_holiday_ranges_are_not_downloaded_again(cache):
+    monday = END + datetime.timedelta(days=3)
+    cache.ensure(["SBIN.NS"], monday)        # through Sunday; the last bar is Friday
+    cache.ensure(["SBIN.NS"], monday)
+    assert len(cache.downloader.calls) == 1
+
+    # Tuesday after a Monday holiday: the download comes back empty and covers the range
+    cache.downloader.drop.add("SBIN.NS")
+    cache.ensure(["SBIN.NS"], monday + datetime.timedelta(days=1))
+    cache.ensure(["SBIN.NS"], monday + datetime.timedelta(days=1))
+    assert len(cache.downloader.calls) == 2
+    assert cache._load_meta()["SBIN.NS"] == monday.isoformat()
@@ -0,0 +1,105 @@
+from src2.news_ingestion.dedup_index import DedupIndex, SIM_THRESHOLD, STORE_EMBEDDING_DTYPE
+from src2.news_ingestion import fetch_all_sources_news
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import json
+import pytest
+
+
+def at_angle(degrees: float, towards_z: float = 0.0) -> list[float]:
+    """Unit vector at `degrees` from x in the x-y plane, then tilted `towards_z` degrees towards z."""
+    radians, tilt = np.radians(degrees), np.radians(towards_z)
+    return [float(np.cos(radians) * np.cos(tilt)), float(np.sin(radians) * np.cos(tilt)), float(np.sin(tilt))]
+
+def similarity(a, b) -> float:
+    # The same float32 computation the index does
+    a, b = (np.asarray(v, dtype=np.float32) for v in (a, b))
+    a, b = a / np.linalg.norm(a), b / np.linalg.norm(b)
+    return float((a.reshape(1, -1) @ b.reshape(1, -1).T)[0, 0])
+
+
+def test_similarity_at_the_threshold_is_a_duplicate():
+    stored, candidate = at_angle(0), at_angle(30)
+    sim = similarity(stored, candidate)
+
+    at = DedupIndex(threshold=sim)
+    at.add(["a"], [stored])
+    assert at.find_duplicates([candidate])[0].tolist() == [True]
+
+    above = DedupIndex(threshold=float(np.nextafter(np.float32(sim), np.float32(1))))
+    above.add(["a"], [stored])
+    assert above.find_duplicates([candidate])[0].tolist() == [False]
+
+def test_default_threshold_separates_near_and_far_articles():
+    index = DedupIndex()
+    index.add(["a"], [at_angle(0)])
+    near = np.degrees(np.arccos(SIM_THRESHOLD)) - 1
+    far = np.degrees(np.arccos(SIM_THRESHOLD)) + 1
+    assert index.find_duplicates([at_angle(near), at_angle(far)])[0].tolist() == [True, False]
+    assert len(index) == 1   # find_duplicates does not add
+
+def test_within_a_batch_the_earlier_accepted_article_wins():
+    index = DedupIndex()
+    index.add(["stored"], [at_angle(90)])
+    # b repeats a, c repeats the stored article, d repeats c (rejected, so it doesn't count)
+    batch = [at_angle(0), at_angle(5), at_angle(90, towards_z=25), at_angle(90, towards_z=50)]
+    mask = index.filter_new(["a", "b", "c", "d"], batch)
+    assert mask.tolist() == [False, True, True, False]
+    assert index.hashes == ["stored", "a", "d"]
+    assert index.contains_hash("d") and not index.contains_hash("b")
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    index = DedupIndex()
+    index.add(["h1", "h2", "h3"], rng.normal(size=(3, 8)), timestamps=[100.0, 200.0, 300.0])
+    path = str(tmp_path / "dedup.npy")
+    index.save(path)
+
+    records = np.load(path)
+    assert records.dtype.names == ("hash", "timestamp", "embedding")
+    assert records.dtype["embedding"].base == STORE_EMBEDDING_DTYPE
+    assert records.dtype["embedding"].shape == (8,)
+
+    loaded = DedupIndex.load(path)
+    assert loaded.hashes == ["h1", "h2", "h3"]
+    assert loaded.timestamps == [100.0, 200.0, 300.0]
+    np.testing.assert_allclose(loaded.embeddings, index.embeddings, atol=1e-3)
+    assert loaded.embeddings.dtype == np.float32
+
+    recent = DedupIndex.load(path, min_timestamp=200.0)
+    assert recent.hashes == ["h2", "h3"]
+    # float16 storage keeps the stored articles duplicates of themselves
+    assert recent.find_duplicates(index.embeddings[1:])[0].all()
+
+def test_empty_index_round_trip(tmp_path):
+    path = str(tmp_path / "dedup.npy")
+    DedupIndex().save(path)
+    assert len(DedupIndex.load(path)) == 0
+
+
+@pytest.fixture
+def store_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_all_sources_news, "DEDUP_PATH", str(tmp_path / "dedup_store.npy"))
+    monkeypatch.setattr(fetch_all_sources_news, "LEGACY_DEDUP_PATH", str(tmp_path / "dedup_store.json"))
+    return tmp_path
+
+def test_legacy_json_store_is_migrated(store_paths):
+    now = datetime.now(timezone.utc)
+    legacy = {
+        "fresh": {"timestamp": (now - timedelta(hours=1)).isoformat(), "embedding": at_angle(0)},
+        "stale": {"timestamp": (now - timedelta(hours=72)).isoformat(), "embedding": at_angle(90)},
+    }
+    with open(store_paths / "dedup_store.json", "w") as f:
+        json.dump(legacy, f)
+
+    index = fetch_all_sources_news.load_dedup_index(ttl_hours=48)
+    assert index.hashes == ["fresh"]
+    assert index.threshold == SIM_THRESHOLD
+
+    fetch_all_sources_news.save_dedup_index(index)
+    reloaded = fetch_all_sources_news.load_dedup_index(ttl_hours=48)
+    assert reloaded.hashes == ["fresh"]
+    np.testing.assert_allclose(reloaded.embeddings, index.embeddings, atol=1e-3)
+
+def test_no_store_gives_an_empty_index(store_paths):
+    assert len(fetch_all_sources_news.load_dedup_index()) == 0
@@ -0,0 +1,50 @@
+from src2.news_ingestion import news_rss
+from utils import http_client
+import requests
+import pytest
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>ET</title>
+<item><title>TCS wins deal</title><link>https://example.com/tcs</link><description>d</description></item>
+</channel></rss>"""
+
+
+class FakeSession:
+    def __init__(self, bodies):
+        self.bodies = list(bodies)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent_headers.append(headers or {})
+        response = requests.Response()
+        response.status_code = 304 if "If-None-Match" in (headers or {}) else 200
+        response._content = b"" if response.status_code == 304 else self.bodies.pop(0)
+        response.headers["ETag"] = '"v1"'
+        return response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(http_client, "_validators", {})
+    def install(*bodies):
+        fake = FakeSession(bodies)
+        monkeypatch.setattr(http_client, "get_session", lambda: fake)
+        return fake
+    return install
+
+
+def test_validators_are_kept_after_a_successful_parse(session):
+    fake = session(FEED)
+    assert len(news_rss.fetch_rss_entries("https://example.com/feed")) == 1
+    assert news_rss.fetch_rss_entries("https://example.com/feed") == []
+    assert fake.sent_headers[1]["If-None-Match"] == '"v1"'
+
+def test_failed_parse_is_fetched_again(session):
+    fake = session(b"<rss><channel><item>", FEED)
+    assert news_rss.fetch_rss_entries("https://example.com/feed") == []
+    assert len(news_rss.fetch_rss_entries("https://example.com/feed")) == 1
+    assert "If-None-Match" not in fake.sent_headers[1]
+
+def test_conditional_get_alone_commits_nothing(session):
+    session(FEED)
+    http_client.conditional_get("https://example.com/page", source="Test")
+    assert http_client._validators == {}
@@ -0,0 +1,82 @@
+from src2.news_ingestion import filter_news
+from utils.llm_cache import LLMResponseCache, CachedChain
+from langchain_core.language_models.fake import FakeListLLM
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+import asyncio
+import json
+import pytest
+
+
+class FakeBatchChain:
+    """Tags every article sent with TCS.NS and records which titles reached the 'LLM'."""
+
+    def __init__(self):
+        self.sent = []
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        responses = []
+        for prompt_inputs in inputs:
+            articles = json.loads(prompt_inputs["articles_json"])
+            self.sent.extend(a["title"] for a in articles)
+            responses.append(filter_news.ArticleTickersList.model_validate(
+                [{"article_id": a["article_id"], "tickers": ["TCS.NS"]} for a in articles]
+            ))
+        return responses
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    cache = LLMResponseCache(path=str(tmp_path / "llm_cache.sqlite"), bypass=False)
+    monkeypatch.setattr(filter_news, "llm_cache", cache)
+    return cache
+
+@pytest.fixture
+def chain(monkeypatch):
+    chain = FakeBatchChain()
+    monkeypatch.setattr(filter_news, "get_batch_stock_identifier_chain", lambda: chain)
+    return chain
+
+
+def article(title: str, source: str) -> dict:
+    return {"title": title, "content": f"{title}. Shares moved.", "source": source, "published_at": "2025-07-28"}
+
+
+def test_same_article_from_another_source_and_position_hits(cache, chain):
+    first = filter_news.identify_tickers_batched({"a0": article("TCS wins deal", "Economic Times")})
+    assert first == {"a0": ["TCS.NS"]}
+
+    second = filter_news.identify_tickers_batched({
+        "a0": article("Sensex slips", "RSS"),
+        "a3": article("TCS  wins deal", "Groww"),   # other source, id and whitespace
+    })
+    assert second == {"a0": ["TCS.NS"], "a3": ["TCS.NS"]}
+    assert chain.sent == ["TCS wins deal", "Sensex slips"]
+    assert cache.stats["hits"] == 1
+
+def test_duplicates_within_a_run_are_sent_once(cache, chain):
+    results = filter_news.identify_tickers_batched({
+        "a0": article("TCS wins deal", "Economic Times"),
+        "a1": article("TCS wins deal", "Pulse"),
+    })
+    assert results == {"a0": ["TCS.NS"], "a1": ["TCS.NS"]}
+    assert chain.sent == ["TCS wins deal"]
+
+def test_bypass_sends_everything(cache, chain):
+    cache.bypass = True
+    filter_news.identify_tickers_batched({"a0": article("TCS wins deal", "Economic Times")})
+    filter_news.identify_tickers_batched({"a0": article("TCS wins deal", "Economic Times")})
+    assert chain.sent == ["TCS wins deal", "TCS wins deal"]
+
+
+def test_cached_chain_ainvoke_stores_parsed_output(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm_cache.sqlite"), bypass=False)
+    llm = FakeListLLM(responses=['{"signal": "buy"}'])
+    chain = CachedChain(PromptTemplate.from_template("Analyze {ticker}"), llm, JsonOutputParser(), cache=cache)
+
+    async def run():
+        return await chain.ainvoke({"ticker": "TCS"}), await chain.ainvoke({"ticker": "TCS"})
+
+    assert asyncio.run(run()) == ({"signal": "buy"}, {"signal": "buy"})
+    assert cache.stats == {"hits": 1, "misses": 1, "writes": 1, "evicted": 0, "bypassed": 0}
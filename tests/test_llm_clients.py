@@ -0,0 +1,81 @@
+from utils.llm_clients import ConcurrencyLimiter, _MeteredAsyncTransport
+import asyncio
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_async_waiters_do_not_spin_and_get_a_permit():
+    limiter = ConcurrencyLimiter(1)
+    order = []
+
+    async def worker(name):
+        async with limiter:
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(worker(i) for i in range(4)))
+
+    asyncio.run(main())
+    assert sorted(order) == [0, 1, 2, 3]
+    assert limiter._semaphore.acquire(blocking=False)
+
+def test_cancelled_waiter_returns_its_permit():
+    limiter = ConcurrencyLimiter(1)
+
+    async def main():
+        limiter._semaphore.acquire()   # held by a "sync" caller
+        waiter = asyncio.create_task(limiter.__aenter__())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        limiter._semaphore.release()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    # The cancelled waiter's thread took the permit and handed it back
+    assert limiter._semaphore.acquire(timeout=1)
+    limiter._semaphore.release()
+
+def test_waiter_cancelled_by_a_closing_loop_returns_its_permit():
+    limiter = ConcurrencyLimiter(1)
+    limiter._semaphore.acquire()   # held by a "sync" caller
+
+    async def main():
+        asyncio.create_task(limiter.__aenter__())
+        await asyncio.sleep(0.05)
+        # Returning leaves the waiter pending: asyncio.run cancels it and closes the loop
+
+    asyncio.run(main())
+    limiter._semaphore.release()
+    # The loop is gone; only the waiter's thread is left to hand the permit back
+    limiter._waiters.shutdown(wait=True)
+    assert limiter._semaphore.acquire(blocking=False)
+    limiter._semaphore.release()
+
+def test_transport_is_closed_per_event_loop():
+    created = []
+
+    def factory():
+        created.append(FakeTransport())
+        return created[-1]
+
+    transport = _MeteredAsyncTransport(factory)
+
+    async def job(close_at_end: bool):
+        await transport._current()
+        if close_at_end:
+            await transport.aclose()
+
+    asyncio.run(job(close_at_end=True))
+    assert created[0].closed
+
+    asyncio.run(job(close_at_end=False))
+    asyncio.run(job(close_at_end=False))
+    # A loop that ended without closing has its pool closed when the next loop takes over
+    assert [t.closed for t in created] == [True, True, False]
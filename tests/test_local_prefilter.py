@@ -0,0 +1,44 @@
+from src2.news_ingestion.local_prefilter import LocalRelevanceMatcher, RELEVANT, IRRELEVANT, AMBIGUOUS
+from src2.news_ingestion.filter_news import ticker_map
+import pytest
+
+matcher = LocalRelevanceMatcher(ticker_map)
+
+
+@pytest.mark.parametrize("title, tickers", [
+    ("HDFC Bank Q1 profit rises 12%", ["HDFCBANK.NS"]),
+    ("Adani Ports wins Vizhinjam contract", ["ADANIPORTS.NS"]),
+    ("Larsen & Toubro bags order", ["LT.NS"]),
+    ("Reliance Industries to demerge retail arm", ["RELIANCE.NS"]),
+    ("Tata Consultancy Services wins UK deal", ["TCS.NS"]),
+    ("Power Grid Corporation raises capex", ["POWERGRID.NS"]),
+])
+def test_unambiguous_aliases_skip_the_llm(title, tickers):
+    assert matcher.classify({"title": title}) == (RELEVANT, tickers)
+
+
+@pytest.mark.parametrize("title", [
+    "Gautam Adani group stocks surge after report",
+    "Tata group plans chip plant",
+    "Bajaj group companies rally",
+    "Kotak, ICICI and Axis lead lender gains",
+    "Nestle SA cuts full-year outlook",
+    "Airtel Africa posts quarterly profit",
+    "JLR sales fall in the UK",
+    "RIL AGM date announced",
+    "HUL price hikes",
+    "Larsen eyes overseas orders",
+    "Reliance Power shares hit upper circuit",
+    "Budget 2025: relief on TCS on foreign remittances",
+    "Northern power grid strained as demand peaks",
+])
+def test_group_names_and_short_forms_go_to_the_llm(title):
+    assert matcher.classify({"title": title}) == (AMBIGUOUS, [])
+
+
+@pytest.mark.parametrize("title", [
+    "Apple unveils new iPhone lineup",
+    "Heavy rain expected in London this weekend",
+])
+def test_irrelevant_only_without_any_cue(title):
+    assert matcher.classify({"title": title}) == (IRRELEVANT, [])
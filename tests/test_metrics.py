@@ -0,0 +1,86 @@
+from utils.metrics import Metrics, NullMetrics
+from unittest import mock
+import json
+import pytest
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    return Metrics(json_path=str(tmp_path / "metrics.json"), history_runs=3)
+
+def runs(recorder: Metrics) -> list[dict]:
+    with open(recorder.json_path, "r") as f:
+        return json.load(f)["runs"]
+
+
+def test_run_records_counter_deltas_and_stage_timings(recorder):
+    recorder.inc("articles_fetched", 4, source="RSS")   # before the run: not part of its deltas
+    with mock.patch("utils.metrics.time.perf_counter", side_effect=[0.0, 1.0, 3.0, 3.5, 4.0, 10.0]):
+        with recorder.run():
+            with recorder.stage("fetch"):
+                recorder.inc("articles_fetched", 2, source="RSS")
+                recorder.inc("source_errors", source="Groww", kind="timeout")
+            with recorder.stage("fetch"):
+                recorder.inc("articles_new", 1)
+
+    record, = runs(recorder)
+    assert record["run"] == "job_runner"
+    assert record["duration_sec"] == 10.0
+    assert record["stages_sec"] == {"fetch": 2.5}
+    assert record["counters"] == {
+        'articles_fetched{source="RSS"}': 2,
+        "articles_new": 1,
+        'source_errors{kind="timeout",source="Groww"}': 1,
+    }
+
+    totals = recorder.snapshot()
+    assert totals["counters"]['articles_fetched{source="RSS"}'] == 6
+    assert totals["stage_runs"] == {"fetch": 2, "job_runner": 1}
+    assert totals["runs"] == 1
+
+def test_summary_line_totals_labelled_counters(recorder, caplog):
+    with recorder.run():
+        recorder.inc("articles_fetched", 3, source="RSS")
+        recorder.inc("articles_fetched", 5, source="Pulse")
+        recorder.inc("llm_cache_hits", 1)
+        recorder.inc("llm_cache_misses", 3)
+        recorder.inc("source_errors", 2, source="Groww", kind="error")
+    summary = caplog.records[-1].getMessage()
+    assert "fetched 8," in summary
+    assert "cache 1/4 hits" in summary
+    assert "source errors: Groww×2" in summary
+
+def test_json_file_keeps_only_the_last_runs(recorder):
+    for i in range(5):
+        with recorder.run(name=f"run{i}"):
+            recorder.inc("articles_new", i)
+    assert [r["run"] for r in runs(recorder)] == ["run2", "run3", "run4"]
+
+def test_a_failing_run_is_still_recorded(recorder):
+    with pytest.raises(RuntimeError):
+        with recorder.run():
+            recorder.inc("articles_new")
+            raise RuntimeError("boom")
+    assert runs(recorder)[0]["counters"] == {"articles_new": 1}
+
+def test_prometheus_rendering(recorder):
+    recorder.inc("llm_requests", 2, caller="dedup")
+    with recorder.stage("dedup"):
+        pass
+    text = recorder.render_prometheus()
+    assert "# TYPE news_pipeline_llm_requests_total counter" in text
+    assert 'news_pipeline_llm_requests_total{caller="dedup"} 2' in text
+    assert 'news_pipeline_stage_runs_total{stage="dedup"} 1' in text
+
+def test_null_metrics_is_a_no_op(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # where the default stats file would go
+    null = NullMetrics()
+    null.inc("articles_new", 3, source="RSS")
+    with null.run():
+        with null.stage("fetch"):
+            pass
+    assert null.snapshot() == {}
+    assert null.render_prometheus() == ""
+    assert null.serve(9100) is None
+    assert null.stage("a") is null.stage("b") is null.run()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,46 @@
+from utils.normalize_dates import normalize_date, normalize_dates, _normalize_fast
+from datetime import datetime, timezone
+import pytest
+
+NOW = datetime(2025, 7, 12, 10, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("Sat, 12 Jul 2025 16:03:43 +0530", "2025-07-12T10:33:43+00:00"),        # RSS
+    ("Sat, 12 Jul 2025 10:33:43 GMT", "2025-07-12T10:33:43+00:00"),
+    ("July 11, 2025 21:59 IST", "2025-07-11T16:29:00+00:00"),                # Financial Express
+    ("Jul 12, 2025, 04:03 PM IST", "2025-07-12T10:33:00+00:00"),             # Economic Times
+    ("Jul 12, 2025, 12:15 AM IST", "2025-07-11T18:45:00+00:00"),
+    ("2025-07-12T16:03:43+05:30", "2025-07-12T10:33:43+00:00"),              # dateutil fallback
+    ("2025-07-12 10:33:43", "2025-07-12T10:33:43+00:00"),                    # naive is UTC
+])
+def test_absolute_dates(date_str, expected):
+    assert normalize_date(date_str, NOW) == expected
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("1 Hour ago", "2025-07-12T09:30:00+00:00"),           # Pulse
+    ("25.5 hours ago", "2025-07-11T09:00:00+00:00"),
+    ("3 days ago", "2025-07-09T10:30:00+00:00"),
+    ("4 hours", "2025-07-12T06:30:00+00:00"),              # Groww
+    ("2 weeks", "2025-06-28T10:30:00+00:00"),
+])
+def test_relative_dates_use_now(date_str, expected):
+    assert normalize_date(date_str, NOW) == expected
+
+@pytest.mark.parametrize("date_str", ["", "   ", "not a date"])
+def test_unparseable_dates_are_empty(date_str):
+    assert normalize_date(date_str, NOW) == ""
+
+def test_dates_missing_the_day_follow_now():
+    next_day = NOW.replace(day=13)
+    assert normalize_date("09:15", NOW) == "2025-07-12T09:15:00+00:00"
+    assert normalize_date("09:15", next_day) == "2025-07-13T09:15:00+00:00"
+    assert normalize_date("Mar 3", NOW) == "2025-03-03T00:00:00+00:00"
+    assert normalize_date("Mar 3", NOW.replace(year=2026)) == "2026-03-03T00:00:00+00:00"
+
+def test_only_fast_path_results_are_cached():
+    _normalize_fast.cache_clear()
+    normalize_dates(["July 11, 2025 21:59 IST", "July 11, 2025 21:59 IST", "09:15"])
+    info = _normalize_fast.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+    assert _normalize_fast("09:15") is None
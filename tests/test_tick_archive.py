@@ -0,0 +1,57 @@
+from src2.yfinance_live_stocks_data_api.tick_archive import TickArchive, COMPACTING_SUFFIX
+from datetime import datetime, timedelta
+from unittest import mock
+import pytest
+import os
+
+DAY = datetime(2025, 8, 11, 9, 15)
+
+
+def ticks(symbol: str, start_min: int, n: int) -> list[dict]:
+    return [
+        {"id": symbol, "price": 100.0 + i, "time": int((DAY + timedelta(minutes=start_min + i)).timestamp() * 1000)}
+        for i in range(n)
+    ]
+
+def read_all(archive: TickArchive):
+    return archive.read(["TCS.NS"], DAY, DAY + timedelta(hours=6), columns=["price"]).column("price").to_pylist()
+
+def partition_files(archive: TickArchive) -> list[str]:
+    return sorted(os.listdir(archive._partition_dir(DAY.date().isoformat(), "TCS.NS")))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    archive.append(ticks("TCS.NS", 0, 3))
+    archive.append(ticks("TCS.NS", 3, 3))
+    return archive
+
+
+def test_compact_merges_parts_into_one_file(archive):
+    assert archive.compact(DAY.date()) == 1
+    files = partition_files(archive)
+    assert len(files) == 1 and files[0].endswith("-compacted.parquet")
+    assert read_all(archive) == [100.0, 101.0, 102.0, 100.0, 101.0, 102.0]
+
+@pytest.mark.parametrize("failing_remove", [1, 2])
+def test_interrupted_compaction_never_duplicates_or_loses_rows(archive, failing_remove):
+    expected = read_all(archive)
+    real_remove, calls = os.remove, []
+
+    def crash(path):
+        calls.append(path)
+        if len(calls) == failing_remove:
+            raise OSError("crash")
+        real_remove(path)
+
+    with mock.patch("src2.yfinance_live_stocks_data_api.tick_archive.os.remove", side_effect=crash):
+        with pytest.raises(OSError):
+            archive.compact(DAY.date())
+    assert any(f.endswith(COMPACTING_SUFFIX) for f in partition_files(archive))
+
+    # Appends after the crash are not part of the interrupted compaction
+    archive.append(ticks("TCS.NS", 10, 1))
+    assert read_all(archive) == expected + [100.0]
+    assert not any(f.endswith(COMPACTING_SUFFIX) for f in partition_files(archive))
+    assert len(partition_files(archive)) == 2
@@ -0,0 +1,79 @@
+from src2.retriever.time_decay_ranker import rank_by_time_decay
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+import math
+
+DECAY_RATE = 0.01
+NOW = datetime(2025, 7, 28, 12, 0, tzinfo=timezone.utc)
+
+
+def reference_rank(distances, positions, published_at, k, score_threshold=None, boost=None):
+    """(1 - decay) ** hours(published_at) + relevance, one document at a time, with aware datetimes."""
+    results = []
+    for q, (row_distances, row_positions) in enumerate(zip(distances, positions)):
+        scored = []
+        for j, (distance, position) in enumerate(zip(row_distances, row_positions)):
+            if position == -1:
+                continue
+            relevance = 1.0 - distance / math.sqrt(2)
+            if score_threshold is not None and relevance < score_threshold:
+                continue
+            published = published_at[position]
+            recency = 0.0 if published is None else (1.0 - DECAY_RATE) ** ((NOW - published).total_seconds() / 3600)
+            score = recency + relevance + (0.0 if boost is None else boost[q, j])
+            scored.append((score, position))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        results.append(scored[:k])
+    return results
+
+def epochs(published_at):
+    return np.array([np.nan if p is None else p.timestamp() for p in published_at])
+
+def assert_same(expected, top_positions, top_scores):
+    for want, positions, scores in zip(expected, top_positions, top_scores):
+        found = [(s, p) for s, p in zip(scores, positions) if p != -1]
+        assert [p for _, p in found] == [p for _, p in want]
+        np.testing.assert_allclose([s for s, _ in found], [s for s, _ in want], rtol=1e-12, atol=1e-12)
+
+
+@pytest.fixture
+def candidates():
+    rng = np.random.default_rng(0)
+    n_docs, n_queries, fetch_k = 200, 8, 30
+    published_at = [NOW - timedelta(hours=float(h)) for h in rng.uniform(0, 60 * 24, n_docs)]
+    published_at[3] = None   # unparseable date: no recency bonus
+    distances = np.sort(rng.uniform(0.0, 1.2, (n_queries, fetch_k)), axis=1)
+    positions = np.stack([rng.choice(n_docs, fetch_k, replace=False) for _ in range(n_queries)])
+    positions[0, -5:] = -1   # fewer hits than fetch_k
+    positions[1, :5] = 3
+    positions[1, 5:] = rng.choice(np.arange(4, n_docs), fetch_k - 5, replace=False)
+    return distances, positions, published_at
+
+
+def test_matches_per_document_scoring(candidates):
+    distances, positions, published_at = candidates
+    top_positions, top_scores = rank_by_time_decay(
+        distances, positions, epochs(published_at), NOW.timestamp(), decay_rate=DECAY_RATE, k=5
+    )
+    assert_same(reference_rank(distances, positions, published_at, k=5), top_positions, top_scores)
+
+def test_threshold_and_boost(candidates):
+    distances, positions, published_at = candidates
+    boost = np.where(positions % 2 == 0, 0.2, 0.0)
+    top_positions, top_scores = rank_by_time_decay(
+        distances, positions, epochs(published_at), NOW.timestamp(),
+        decay_rate=DECAY_RATE, k=5, score_threshold=0.3, boost=boost
+    )
+    expected = reference_rank(distances, positions, published_at, k=5, score_threshold=0.3, boost=boost)
+    assert_same(expected, top_positions, top_scores)
+
+def test_empty_slots_are_padded():
+    distances = np.array([[0.1, 1.4]])
+    positions = np.array([[0, -1]])
+    top_positions, top_scores = rank_by_time_decay(
+        distances, positions, np.array([NOW.timestamp()]), NOW.timestamp(), decay_rate=DECAY_RATE, k=2
+    )
+    assert top_positions.tolist() == [[0, -1]]
+    assert top_scores[0, 0] == pytest.approx(1.0 + 1.0 - 0.1 / math.sqrt(2))
+    assert np.isneginf(top_scores[0, 1:]).all()
@@ -0,0 +1,96 @@
+from src2.faiss_vector_store.vector_store_manager import VectorStoreManager, CURRENT_POINTER, SNAPSHOTS_DIR
+from src2.faiss_vector_store.index_builder import index_type_of
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.documents import Document
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import pytest
+import os
+
+embeddings = DeterministicFakeEmbedding(size=16)
+
+
+def docs(n: int, start: int = 0, age_days: int = 0) -> list[Document]:
+    published = (datetime.now(timezone.utc) - timedelta(days=age_days)).isoformat()
+    return [
+        Document(page_content=f"article {i}", metadata={"published_at": published, "tickers": ["TCS.NS"]})
+        for i in range(start, start + n)
+    ]
+
+def contents(manager: VectorStoreManager) -> list[str]:
+    with manager.read() as store:
+        return sorted(
+            store.docstore.search(store.index_to_docstore_id[i]).page_content for i in range(store.index.ntotal)
+        )
+
+
+def test_persist_swaps_in_one_snapshot(tmp_path):
+    manager = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    manager.add_documents(docs(3))
+    manager.persist()
+    manager.add_documents(docs(2, start=3))
+    manager.persist()
+
+    assert len(os.listdir(tmp_path / SNAPSHOTS_DIR)) == 1
+    reloaded = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    assert contents(reloaded) == [f"article {i}" for i in range(5)]
+
+def test_crash_before_pointer_swap_keeps_previous_pair(tmp_path):
+    manager = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    manager.add_documents(docs(4, age_days=60) + docs(2, start=4))
+    manager.persist()
+
+    # Eviction compacts positions; the next persist dies after writing its snapshot
+    assert manager.evict_expired(days_to_keep=30) == 4
+    with mock.patch("src2.faiss_vector_store.vector_store_manager.os.replace", side_effect=OSError("crash")):
+        with pytest.raises(OSError):
+            manager.persist()
+
+    reloaded = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    assert contents(reloaded) == [f"article {i}" for i in range(6)]
+
+    manager.persist()
+    reloaded = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    assert contents(reloaded) == ["article 4", "article 5"]
+    assert len(os.listdir(tmp_path / SNAPSHOTS_DIR)) == 1
+
+def test_top_level_store_is_loaded_and_migrated(tmp_path):
+    legacy = VectorStoreManager(str(tmp_path / "build"), embeddings=embeddings)
+    legacy.add_documents(docs(3))
+    with legacy.read() as store:
+        store.save_local(str(tmp_path / "db"))
+
+    manager = VectorStoreManager(str(tmp_path / "db"), embeddings=embeddings)
+    assert contents(manager) == [f"article {i}" for i in range(3)]
+    manager.add_documents(docs(1, start=3))
+    manager.persist()
+
+    assert not os.path.exists(tmp_path / "db" / "index.faiss")
+    assert (tmp_path / "db" / CURRENT_POINTER).exists()
+    assert contents(VectorStoreManager(str(tmp_path / "db"), embeddings=embeddings)) == [f"article {i}" for i in range(4)]
+
+def test_store_started_flat_becomes_the_configured_index_type(tmp_path, monkeypatch):
+    monkeypatch.setattr("src2.faiss_vector_store.vector_store_manager.INDEX_TYPE", "ivf_sq")
+    monkeypatch.setattr("src2.faiss_vector_store.index_builder.MIN_TRAIN_POINTS_PER_LIST", 1)
+    manager = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+
+    manager.add_documents(docs(10))     # 4*sqrt(10) = 12 lists need 12 training points
+    with manager.read() as store:
+        assert index_type_of(store.index) == "flat"
+
+    manager.add_documents(docs(30, start=10))
+    with manager.read() as store:
+        assert index_type_of(store.index) == "ivf_sq"
+        assert store.index.ntotal == 40
+    assert contents(manager) == sorted(f"article {i}" for i in range(40))
+
+def test_eviction_rebuilds_a_flat_store_with_the_configured_type(tmp_path, monkeypatch):
+    manager = VectorStoreManager(str(tmp_path), embeddings=embeddings)
+    manager.add_documents(docs(40) + docs(2, start=40, age_days=60))
+
+    monkeypatch.setattr("src2.faiss_vector_store.vector_store_manager.INDEX_TYPE", "ivf_sq")
+    monkeypatch.setattr("src2.faiss_vector_store.index_builder.MIN_TRAIN_POINTS_PER_LIST", 1)
+    assert manager.evict_expired(days_to_keep=30) == 2
+    with manager.read() as store:
+        assert index_type_of(store.index) == "ivf_sq"
+        assert store.index.ntotal == 40
@@ -18,12 +18,13 @@ def format_latest_news(news: dict) -> str:
         f"**Link**: {news.get('url', 'N/A')}"
     )
 
-test_news = {
-    "title": "HDFC Bank Reports Record Q1 Profits Amid Strong Loan Growth",
-    "content": "HDFC Bank has posted a record net profit of ₹12,500 crore in Q1 FY26, driven by strong loan disbursement and improved net interest margin. The bank also announced plans to expand its rural lending portfolio.",
-    "published_at": "2025-07-27",
-    "source": "Moneycontrol",
-    "url": "https://www.moneycontrol.com/news/business/hdfc-bank-q1-results-2025-750crore-profit.html"
-}
-result = format_latest_news(test_news)
-print(result)
\ No newline at end of file
+if __name__ == "__main__":
+    test_news = {
+        "title": "HDFC Bank Reports Record Q1 Profits Amid Strong Loan Growth",
+        "content": "HDFC Bank has posted a record net profit of ₹12,500 crore in Q1 FY26, driven by strong loan disbursement and improved net interest margin. The bank also announced plans to expand its rural lending portfolio.",
+        "published_at": "2025-07-27",
+        "source": "Moneycontrol",
+        "url": "https://www.moneycontrol.com/news/business/hdfc-bank-q1-results-2025-750crore-profit.html"
+    }
+    result = format_latest_news(test_news)
+    print(result)
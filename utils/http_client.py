@@ -0,0 +1,130 @@
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.logger_setup import setup_logger
+from collections import defaultdict
+import threading
+import requests
+import time
+
+logger = setup_logger(__name__)
+
+# Params
+CONNECT_TIMEOUT_SEC = 5
+READ_TIMEOUT_SEC = 20
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# url -> {"etag": ..., "last_modified": ...}
+_validators: dict[str, dict] = {}
+_validators_lock = threading.Lock()
+
+_stats = defaultdict(lambda: {"requests": 0, "not_modified": 0, "errors": 0, "bytes": 0, "latency_sec": 0.0})
+_stats_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session used by every HTTP-based news source."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def _record(source: str, latency: float, nbytes: int = 0, not_modified: bool = False, error: bool = False):
+    with _stats_lock:
+        s = _stats[source]
+        s["requests"] += 1
+        s["latency_sec"] += latency
+        s["bytes"] += nbytes
+        s["not_modified"] += int(not_modified)
+        s["errors"] += int(error)
+
+
+def conditional_get(url: str, source: str, headers: dict = None, timeout=None):
+    """
+    GET `url` with If-None-Match / If-Modified-Since from the previous response.
+    Returns the response, or None when the server answered 304 Not Modified
+    (the caller can skip parsing entirely). Raises for other HTTP errors.
+
+    The response's validators are not remembered until the caller has parsed the body and
+    calls `commit_validators(url, response)`; otherwise a failed parse would be answered
+    with 304 next time and that content never processed.
+    """
+    request_headers = dict(headers or {})
+    with _validators_lock:
+        cached = _validators.get(url, {})
+    if cached.get("etag"):
+        request_headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    start = time.perf_counter()
+    try:
+        response = get_session().get(
+            url,
+            headers=request_headers,
+            timeout=timeout or (CONNECT_TIMEOUT_SEC, READ_TIMEOUT_SEC)
+        )
+    except Exception:
+        _record(source, time.perf_counter() - start, error=True)
+        raise
+    latency = time.perf_counter() - start
+
+    if response.status_code == 304:
+        _record(source, latency, not_modified=True)
+        logger.info(f"♻️ {source}: not modified since last fetch ({latency:.2f}s)")
+        return None
+
+    try:
+        response.raise_for_status()
+    except Exception:
+        _record(source, latency, error=True)
+        raise
+
+    # Wire size if the server sent it, otherwise the decoded body size
+    nbytes = int(response.headers.get("Content-Length") or len(response.content))
+    _record(source, latency, nbytes=nbytes)
+    return response
+
+
+def commit_validators(url: str, response):
+    """Remember ETag / Last-Modified of a successfully processed response to `url`."""
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    with _validators_lock:
+        if validators["etag"] or validators["last_modified"]:
+            _validators[url] = validators
+        else:
+            _validators.pop(url, None)
+
+
+def get_http_stats() -> dict:
+    """Per-source request, 304, error, byte and latency counters since startup."""
+    with _stats_lock:
+        return {source: dict(s) for source, s in _stats.items()}
+
+
+def log_http_stats():
+    for source, s in get_http_stats().items():
+        avg_latency = s["latency_sec"] / s["requests"] if s["requests"] else 0.0
+        logger.info(
+            f"🌐 {source}: {s['requests']} requests, {s['not_modified']} not modified, "
+            f"{s['errors']} errors, {s['bytes'] / 1024:.1f} KiB, avg {avg_latency:.2f}s"
+        )
@@ -0,0 +1,192 @@
+"""
+Persistent, content-addressed cache of parsed LLM responses.
+
+Entries are keyed by sha256(model, temperature, prompt text) and hold the *parsed* output
+as JSON, so a hit skips both the API call and output parsing. CachedChain keys on the fully
+rendered prompt; callers that batch several items per prompt key each item on its own
+normalized content instead (see `normalize_text`). Entries
+expire after LLM_CACHE_TTL_HOURS; past LLM_CACHE_MAX_MB the least recently used entries
+are evicted. Set LLM_CACHE_BYPASS=1 to neither read nor write the cache.
+"""
+from utils.logger_setup import setup_logger
+from utils.metrics import metrics
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import threading
+import asyncio
+import hashlib
+import sqlite3
+import json
+import time
+import os
+
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+# Params
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite")
+CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", 24 * 7))
+CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", 200))
+CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+EVICT_EVERY_WRITES = 100
+
+_MISS = object()
+
+
+def normalize_text(text) -> str:
+    """Case- and whitespace-insensitive form of a text, for content-based cache keys."""
+    return " ".join(str(text or "").split()).lower()
+
+
+class LLMResponseCache:
+    """SQLite-backed key/value store for parsed LLM outputs (one connection, guarded by a lock)."""
+
+    def __init__(self, path: str = CACHE_PATH, ttl_hours: float = CACHE_TTL_HOURS,
+                 max_mb: float = CACHE_MAX_MB, bypass: bool = CACHE_BYPASS):
+        self.path = path
+        self.ttl_sec = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.bypass = bypass
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0, "bypassed": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._conn = conn
+            self._evict()
+        return self._conn
+
+    @staticmethod
+    def key(model: str, temperature, prompt_text: str) -> str:
+        payload = json.dumps([model, temperature, prompt_text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, default=_MISS):
+        """The cached JSON value, or `default`."""
+        if self.bypass:
+            self.stats["bypassed"] += 1
+            return default
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?", (key, now - self.ttl_sec)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                metrics.inc("llm_cache_misses")
+                return default
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.stats["hits"] += 1
+        metrics.inc("llm_cache_hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, value):
+        if self.bypass:
+            return
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            conn.commit()
+            self.stats["writes"] += 1
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= EVICT_EVERY_WRITES:
+                self._evict()
+
+    def _evict(self):
+        # Caller holds the lock (or is connecting)
+        conn = self._conn
+        expired = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_sec,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        over_size = 0
+        if total > self.max_bytes:
+            # Least recently used first, until back under the size budget
+            to_free, keys = total - self.max_bytes, []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                keys.append((key,))
+                to_free -= size
+                if to_free <= 0:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            over_size = len(keys)
+        conn.commit()
+        self._writes_since_evict = 0
+        self.stats["evicted"] += expired + over_size
+
+    def log_stats(self):
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        hit_rate = s["hits"] / lookups if lookups else 0.0
+        logger.info(
+            f"🗃️ LLM cache: {s['hits']} hits, {s['misses']} misses ({hit_rate:.0%}), "
+            f"{s['writes']} writes, {s['evicted']} evicted, {s['bypassed']} bypassed"
+        )
+
+
+llm_cache = LLMResponseCache()
+
+
+class CachedChain:
+    """
+    `prompt | llm | parser` with the response cache in front of the LLM call. Supports the
+    `invoke` / `ainvoke` calls the pipeline makes; only misses reach the API, and only
+    successful parses are stored.
+    """
+
+    def __init__(self, prompt, llm, parser, cache: LLMResponseCache = llm_cache):
+        self.prompt = prompt
+        self.parser = parser
+        self.cache = cache
+        self.chain = prompt | llm | parser
+        self._model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+        self._temperature = getattr(llm, "temperature", None)
+
+    def _key(self, inputs: dict) -> str:
+        return self.cache.key(self._model, self._temperature, self.prompt.format(**inputs))
+
+    def _dump(self, output):
+        return output.model_dump(mode="json") if isinstance(output, BaseModel) else output
+
+    def _load(self, value):
+        # PydanticOutputParser outputs are rebuilt as their model; everything else is plain JSON
+        pydantic_object = getattr(self.parser, "pydantic_object", None)
+        if pydantic_object is not None:
+            return pydantic_object.model_validate(value)
+        return value
+
+    def invoke(self, inputs: dict, config=None):
+        key = self._key(inputs)
+        cached = self.cache.get(key)
+        if cached is not _MISS:
+            return self._load(cached)
+        output = self.chain.invoke(inputs, config=config)
+        self.cache.put(key, self._dump(output))
+        return output
+
+    async def ainvoke(self, inputs: dict, config=None):
+        # SQLite I/O runs off the event loop
+        key = self._key(inputs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not _MISS:
+            return self._load(cached)
+        output = await self.chain.ainvoke(inputs, config=config)
+        await asyncio.to_thread(self.cache.put, key, self._dump(output))
+        return output
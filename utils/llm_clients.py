@@ -0,0 +1,277 @@
+"""
+Provider registry for the OpenAI clients used across the pipeline.
+
+Every chat model and embeddings client handed out here shares one pair of keep-alive
+HTTP connection pools (sync and async), and every request goes through one process-wide
+concurrency limiter. Clients are cached per (model, settings, caller). Each caller's
+client tags its requests, so requests, errors, tokens and latency are counted per caller
+at the transport level. This covers chat and embeddings, sync and async.
+"""
+from utils.logger_setup import setup_logger
+from utils.metrics import metrics
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from functools import lru_cache
+from dotenv import load_dotenv
+import threading
+import asyncio
+import time
+import re
+
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+# Params
+CHAT_MODEL = "gpt-4o-mini"
+CHAT_TEMPERATURE = 0.3
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+MAX_CONCURRENT_REQUESTS = 8     # provider requests in flight across the whole process
+MAX_CONNECTIONS = 16
+MAX_KEEPALIVE_CONNECTIONS = 8
+KEEPALIVE_EXPIRY_SEC = 120
+CONNECT_TIMEOUT_SEC = 5
+REQUEST_TIMEOUT_SEC = 120
+MAX_RETRIES = 3                 # SDK-level retries (429 / 5xx, with backoff)
+LIMITER_WAIT_THREADS = 32       # threads parked on the limiter for async callers
+
+CALLER_HEADER = "x-pipeline-caller"   # stripped before the request leaves the process
+
+# Usage is reported at the end of the JSON body for both chat and embeddings responses
+_USAGE_PATTERNS = {
+    "prompt_tokens": re.compile(rb'"prompt_tokens"\s*:\s*(\d+)'),
+    "completion_tokens": re.compile(rb'"completion_tokens"\s*:\s*(\d+)'),
+}
+_USAGE_TAIL_BYTES = 2048
+
+_usage = defaultdict(lambda: {
+    "requests": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_sec": 0.0
+})
+_usage_lock = threading.Lock()
+
+
+class ConcurrencyLimiter:
+    """A process-wide cap on in-flight requests, usable from threads and event loops alike."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._waiters = ThreadPoolExecutor(max_workers=LIMITER_WAIT_THREADS, thread_name_prefix="llm-limiter")
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        if self._semaphore.acquire(blocking=False):
+            return self
+        # Block in a worker thread, not on the loop. If the caller is cancelled meanwhile, the
+        # thread hands the permit it eventually takes straight back; the loop may be closed by then.
+        state = {"cancelled": False, "granted": False}
+        state_lock = threading.Lock()
+
+        def acquire():
+            self._semaphore.acquire()
+            with state_lock:
+                if state["cancelled"]:
+                    self._semaphore.release()
+                else:
+                    state["granted"] = True
+
+        acquired = asyncio.get_running_loop().run_in_executor(self._waiters, acquire)
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            with state_lock:
+                if state["granted"]:
+                    self._semaphore.release()
+                else:
+                    state["cancelled"] = True
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+
+
+limiter = ConcurrencyLimiter(MAX_CONCURRENT_REQUESTS)
+
+
+def _record(caller: str, latency: float, content: bytes = b"", error: bool = False):
+    tail = content[-_USAGE_TAIL_BYTES:]
+    tokens = {}
+    for key, pattern in _USAGE_PATTERNS.items():
+        match = pattern.search(tail)
+        tokens[key] = int(match.group(1)) if match else 0
+    with _usage_lock:
+        u = _usage[caller]
+        u["requests"] += 1
+        u["errors"] += int(error)
+        u["latency_sec"] += latency
+        u["prompt_tokens"] += tokens["prompt_tokens"]
+        u["completion_tokens"] += tokens["completion_tokens"]
+    metrics.inc("llm_requests", caller=caller)
+    metrics.inc("llm_prompt_tokens", tokens["prompt_tokens"], caller=caller)
+    metrics.inc("llm_completion_tokens", tokens["completion_tokens"], caller=caller)
+    if error:
+        metrics.inc("llm_errors", caller=caller)
+
+
+class _MeteredTransport:
+    """httpx transport wrapper: global limiter, caller tag removal and usage accounting."""
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request):
+        caller = request.headers.pop(CALLER_HEADER, "unknown")
+        with limiter:
+            start = time.perf_counter()
+            try:
+                response = self._transport.handle_request(request)
+                response.read()   # cached on the response; the SDK reads it from there
+            except Exception:
+                _record(caller, time.perf_counter() - start, error=True)
+                raise
+        _record(caller, time.perf_counter() - start, response.content, error=response.status_code >= 400)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _MeteredAsyncTransport:
+    """
+    Async counterpart of _MeteredTransport. Pooled connections belong to the event loop
+    that opened them, and each job runs its own loop (asyncio.run), so the underlying pool
+    is recreated whenever the running loop changes. Call `aclose_async_pool()` before a loop
+    ends so its connections are closed on the loop that owns them.
+    """
+
+    def __init__(self, transport_factory):
+        self._factory = transport_factory
+        self._transport = None
+        self._loop = None
+
+    async def _current(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._transport is not None:
+                # The previous loop ended without aclose_async_pool(); close what we still can
+                try:
+                    await self._transport.aclose()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not close the previous event loop's connection pool: {e}")
+            self._transport, self._loop = self._factory(), loop
+        return self._transport
+
+    async def handle_async_request(self, request):
+        caller = request.headers.pop(CALLER_HEADER, "unknown")
+        transport = await self._current()
+        async with limiter:
+            start = time.perf_counter()
+            try:
+                response = await transport.handle_async_request(request)
+                await response.aread()
+            except Exception:
+                _record(caller, time.perf_counter() - start, error=True)
+                raise
+        _record(caller, time.perf_counter() - start, response.content, error=response.status_code >= 400)
+        return response
+
+    async def aclose(self):
+        if self._transport is not None and self._loop is asyncio.get_running_loop():
+            transport, self._transport, self._loop = self._transport, None, None
+            await transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+@lru_cache(maxsize=None)
+def _async_transport() -> _MeteredAsyncTransport:
+    import httpx
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SEC
+    )
+    return _MeteredAsyncTransport(lambda: httpx.AsyncHTTPTransport(limits=limits))
+
+
+@lru_cache(maxsize=None)
+def _http_clients():
+    """The shared (sync, async) httpx clients, built on first use."""
+    import httpx
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SEC
+    )
+    timeout = httpx.Timeout(REQUEST_TIMEOUT_SEC, connect=CONNECT_TIMEOUT_SEC)
+    http_client = httpx.Client(
+        transport=_MeteredTransport(httpx.HTTPTransport(limits=limits)), timeout=timeout
+    )
+    http_async_client = httpx.AsyncClient(transport=_async_transport(), timeout=timeout)
+    return http_client, http_async_client
+
+
+async def aclose_async_pool():
+    """Close the current event loop's pooled connections (call before the loop ends)."""
+    if _async_transport.cache_info().currsize:
+        await _async_transport().aclose()
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(model: str = CHAT_MODEL, temperature: float = CHAT_TEMPERATURE, caller: str = "default"):
+    """Chat model on the shared pool, built on first use (langchain_openai is only imported then)."""
+    from langchain_openai import ChatOpenAI
+    http_client, http_async_client = _http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        max_retries=MAX_RETRIES,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        default_headers={CALLER_HEADER: caller}
+    )
+
+@lru_cache(maxsize=None)
+def get_embeddings(model: str = EMBEDDING_MODEL, caller: str = "default"):
+    """Embeddings client on the shared pool, built on first use."""
+    from langchain_openai import OpenAIEmbeddings
+    http_client, http_async_client = _http_clients()
+    return OpenAIEmbeddings(
+        model=model,
+        max_retries=MAX_RETRIES,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        default_headers={CALLER_HEADER: caller}
+    )
+
+
+def get_llm_usage() -> dict:
+    """Per-caller request, error, token and latency counters since startup."""
+    with _usage_lock:
+        return {caller: dict(u) for caller, u in _usage.items()}
+
+def log_llm_usage():
+    for caller, u in get_llm_usage().items():
+        avg_latency = u["latency_sec"] / u["requests"] if u["requests"] else 0.0
+        logger.info(
+            f"🤖 {caller}: {u['requests']} requests, {u['errors']} errors, "
+            f"{u['prompt_tokens']} prompt + {u['completion_tokens']} completion tokens, avg {avg_latency:.2f}s"
+        )
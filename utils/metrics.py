@@ -0,0 +1,225 @@
+"""
+Process-wide pipeline metrics: stage timers and labelled counters.
+
+Each `job_runner` cycle is wrapped in `metrics.run()`. When the run ends, one summary line
+is logged and the run (stage durations, counter deltas) is appended to a rolling JSON
+stats file. The cumulative totals are also served in Prometheus text format when
+METRICS_PORT is set.
+
+Set METRICS_ENABLED=0 to swap in a no-op recorder: every call is then an empty method and
+`stage()` returns a shared null context, so instrumented code pays next to nothing.
+"""
+from utils.logger_setup import setup_logger
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import threading
+import json
+import time
+import os
+
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+# Params
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH", "metrics.json")
+METRICS_HISTORY_RUNS = 100            # runs kept in the rolling JSON file
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))   # 0 = no HTTP endpoint
+METRIC_PREFIX = "news_pipeline"
+
+
+def _labelled(name: str, labels: tuple) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Metrics:
+    """Thread-safe counters and stage timers, with per-run deltas."""
+
+    def __init__(self, json_path: str = METRICS_JSON_PATH, history_runs: int = METRICS_HISTORY_RUNS):
+        self.json_path = json_path
+        self.history_runs = history_runs
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)       # (name, labels) -> cumulative value
+        self._stage_seconds = defaultdict(float)  # stage -> cumulative seconds
+        self._stage_count = defaultdict(int)
+        self._run_stages = {}                     # stage -> seconds in the current run
+        self._run_baseline = {}
+        self._runs = 0
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; repeated or concurrent entries within a run add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stage_seconds[name] += elapsed
+                self._stage_count[name] += 1
+                self._run_stages[name] = self._run_stages.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def run(self, name: str = "job_runner"):
+        """One pipeline cycle: logs a summary line and appends the run to the JSON stats file."""
+        with self._lock:
+            self._run_stages = {}
+            self._run_baseline = dict(self._counters)
+        started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._finish_run(name, started_at, time.perf_counter() - start)
+
+    def _finish_run(self, name: str, started_at: str, duration: float):
+        with self._lock:
+            self._runs += 1
+            self._stage_seconds[name] += duration
+            self._stage_count[name] += 1
+            stages = dict(self._run_stages)
+            deltas = {
+                key: value - self._run_baseline.get(key, 0.0)
+                for key, value in self._counters.items()
+                if value != self._run_baseline.get(key, 0.0)
+            }
+
+        record = {
+            "run": name,
+            "started_at": started_at,
+            "duration_sec": round(duration, 3),
+            "stages_sec": {stage: round(sec, 3) for stage, sec in stages.items()},
+            "counters": {_labelled(*key): value for key, value in sorted(deltas.items())},
+        }
+        logger.info(self._summary_line(record, deltas))
+        try:
+            self._append_run(record)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write metrics to {self.json_path}: {e}")
+
+    @staticmethod
+    def _summary_line(record: dict, deltas: dict) -> str:
+        totals = defaultdict(float)
+        errors = []
+        for (name, labels), value in deltas.items():
+            totals[name] += value
+            if name == "source_errors":
+                errors.append(f"{dict(labels).get('source')}×{value:.0f}")
+
+        stages = ", ".join(f"{stage} {sec:.1f}s" for stage, sec in record["stages_sec"].items())
+        lookups = totals["llm_cache_hits"] + totals["llm_cache_misses"]
+        return (
+            f"📊 {record['run']} {record['duration_sec']:.1f}s | {stages or 'no stages'} | "
+            f"fetched {totals['articles_fetched']:.0f}, new {totals['articles_new']:.0f}, "
+            f"tagged {totals['articles_tagged']:.0f}, alerts {totals['alerts_sent']:.0f} | "
+            f"LLM {totals['llm_requests']:.0f} calls, "
+            f"{totals['llm_prompt_tokens'] + totals['llm_completion_tokens']:.0f} tokens, "
+            f"cache {totals['llm_cache_hits']:.0f}/{lookups:.0f} hits"
+            + (f" | source errors: {', '.join(errors)}" if errors else "")
+        )
+
+    def _append_run(self, record: dict):
+        history = []
+        if os.path.exists(self.json_path):
+            with open(self.json_path, "r") as f:
+                history = json.load(f).get("runs", [])
+        history = (history + [record])[-self.history_runs:]
+
+        tmp_path = self.json_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"updated_at": record["started_at"], "totals": self.snapshot(), "runs": history}, f, indent=2)
+        os.replace(tmp_path, self.json_path)
+
+    def snapshot(self) -> dict:
+        """Cumulative counters and stage timings since startup."""
+        with self._lock:
+            return {
+                "counters": {_labelled(*key): value for key, value in sorted(self._counters.items())},
+                "stages_sec": dict(self._stage_seconds),
+                "stage_runs": dict(self._stage_count),
+                "runs": self._runs,
+            }
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            stages = sorted(self._stage_seconds.items())
+            stage_count = dict(self._stage_count)
+
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{_labelled(metric, labels)} {value:g}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds_total counter")
+        lines += [f'{METRIC_PREFIX}_stage_seconds_total{{stage="{s}"}} {sec:.6f}' for s, sec in stages]
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_runs_total counter")
+        lines += [f'{METRIC_PREFIX}_stage_runs_total{{stage="{s}"}} {stage_count[s]}' for s, _ in stages]
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = METRICS_PORT):
+        """Serve `render_prometheus()` on http://0.0.0.0:<port>/metrics from a daemon thread."""
+        if not port:
+            return None
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"📊 Metrics endpoint on :{port}/metrics")
+        return server
+
+
+class NullMetrics:
+    """Drop-in for Metrics when METRICS_ENABLED=0."""
+
+    _null = nullcontext()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def stage(self, name: str):
+        return self._null
+
+    def run(self, name: str = "job_runner"):
+        return self._null
+
+    def snapshot(self) -> dict:
+        return {}
+
+    def render_prometheus(self) -> str:
+        return ""
+
+    def serve(self, port: int = METRICS_PORT):
+        return None
+
+
+metrics = Metrics() if METRICS_ENABLED else NullMetrics()
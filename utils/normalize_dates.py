@@ -1,70 +1,118 @@
-from dateutil import parser as date_parser
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import re
-import pytz
 
-def normalize_date(date_str):
+# Params
+ABSOLUTE_CACHE_SIZE = 4096
+
+IST = timezone(timedelta(hours=5, minutes=30))
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+# RSS — e.g., "Sat, 12 Jul 2025 16:03:43 +0530"
+RSS_PATTERN = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s+([+-]\d{4}|GMT|UTC|Z)"
+)
+# Financial Express / Economic Times — e.g., "July 11, 2025 21:59 IST", "Jul 12, 2025, 04:03 PM IST"
+IST_PATTERN = re.compile(
+    r"([A-Za-z]{3,9})\s+(\d{1,2}),\s*(\d{4}),?\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([AaPp][Mm])?\s*IST"
+)
+# Relative — e.g., "1 Hour ago", "25.5 hours ago" (Pulse)
+RELATIVE_AGO_PATTERN = re.compile(r"([\d\.]+)\s+(minute|hour|day|week)s?\s+ago", re.IGNORECASE)
+# Groww — e.g., "4 hours", "16 hours", "2 days"
+RELATIVE_PATTERN = re.compile(r"(\d+)\s+(minute|hour|day|week)s?$", re.IGNORECASE)
+
+
+def _month(name: str):
+    return MONTHS.get(name[:3].lower())
+
+def _offset(token: str) -> timezone:
+    if token in ("GMT", "UTC", "Z"):
+        return timezone.utc
+    sign = -1 if token[0] == "-" else 1
+    return timezone(sign * timedelta(hours=int(token[1:3]), minutes=int(token[3:5])))
+
+def _parse_rss(date_str: str):
+    match = RSS_PATTERN.fullmatch(date_str)
+    if not match or not _month(match.group(2)):
+        return None
+    day, month, year, hour, minute, second, offset = match.groups()
+    return datetime(
+        int(year), _month(month), int(day), int(hour), int(minute), int(second or 0), tzinfo=_offset(offset)
+    )
+
+def _parse_ist(date_str: str):
+    match = IST_PATTERN.fullmatch(date_str)
+    if not match or not _month(match.group(1)):
+        return None
+    month, day, year, hour, minute, second, meridiem = match.groups()
+    hour = int(hour)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    return datetime(int(year), _month(month), int(day), hour, int(minute), int(second or 0), tzinfo=IST)
+
+def _to_utc_iso(dt: datetime) -> str:
+    # Normalize to UTC and drop microseconds
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    else:
+        dt = dt.astimezone(timezone.utc)
+    return dt.replace(microsecond=0).isoformat()
+
+@lru_cache(maxsize=ABSOLUTE_CACHE_SIZE)
+def _normalize_fast(date_str: str):
+    # Only the fully specified RSS / IST shapes, whose result never depends on the current date
+    dt = _parse_rss(date_str) or _parse_ist(date_str)
+    return None if dt is None else _to_utc_iso(dt)
+
+def _normalize_absolute(date_str: str, now: datetime) -> str:
+    normalized = _normalize_fast(date_str)
+    if normalized is None:
+        # Last resort for shapes without a fast parser. Not cached: dateutil fills in whatever
+        # the string leaves out (date, year) from `now`.
+        from dateutil import parser as date_parser
+        default = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        normalized = _to_utc_iso(date_parser.parse(date_str.replace("IST", "+05:30"), default=default))
+    return normalized
+
+def _relative(date_str: str, now: datetime):
+    match = RELATIVE_AGO_PATTERN.match(date_str) or RELATIVE_PATTERN.match(date_str)
+    if not match:
+        return None
+    value = float(match.group(1))  # support decimals like 20.5
+    unit = match.group(2).lower()
+    return now - timedelta(**{f"{unit}s": value})
+
+
+def normalize_date(date_str, now: datetime = None):
     """
-    Converts various date formats from RSS, FinancialExpress, or EconomicTimes into a consistent
-    ISO 8601 UTC format without microseconds.
+    Converts various date formats from RSS, FinancialExpress, EconomicTimes, Groww or Pulse into
+    a consistent ISO 8601 UTC format without microseconds. Relative dates ("3 hours ago") are
+    resolved against `now` (default: the current time), as are the missing parts of dates
+    without a year or a day; fully specified dates are cached.
     Returns: ISO 8601 UTC string (e.g., '2025-07-12T10:30:00+00:00') or empty string if failed.
     """
     try:
-        # Case 1: RSS format — e.g., "Sat, 12 Jul 2025 16:03:43 +0530"
-        if "," in date_str and "+" in date_str:
-            dt = date_parser.parse(date_str)
-
-        # Case 2: Financial Express — e.g., "July 11, 2025 21:59 IST"
-        elif "IST" in date_str:
-            date_str = date_str.replace("IST", "+05:30")
-            dt = date_parser.parse(date_str)
-
-        # Case 3: Relative — e.g., "1 Hour ago", "3 days ago"
-        elif re.match(r"[\d\.]+\s+(minute|hour|day|week)s?\s+ago", date_str.lower()):
-            match = re.match(r"([\d\.]+)\s+(minute|hour|day|week)s?\s+ago", date_str.lower())
-            value = float(match.group(1))  # support decimals like 20.5
-            unit = match.group(2)
-            now = datetime.now(pytz.UTC)
-            if unit == "minute":
-                dt = now - timedelta(minutes=value)
-            elif unit == "hour":
-                dt = now - timedelta(hours=value)
-            elif unit == "day":
-                dt = now - timedelta(days=value)
-            elif unit == "week":
-                dt = now - timedelta(weeks=value)
-        
-        # Case 4: Groww format — e.g., "4 hours", "16 hours", "2 days"
-        elif re.match(r"\d+\s+(minute|hour|day|week)s?$", date_str.lower()):
-            match = re.match(r"(\d+)\s+(minute|hour|day|week)s?$", date_str.lower())
-            value = int(match.group(1))
-            unit = match.group(2)
-            now = datetime.now(pytz.UTC)
-            if unit == "minute":
-                dt = now - timedelta(minutes=value)
-            elif unit == "hour":
-                dt = now - timedelta(hours=value)
-            elif unit == "day":
-                dt = now - timedelta(days=value)
-            elif unit == "week":
-                dt = now - timedelta(weeks=value)
-
-        # Fallback: try parsing anything else
-        else:
-            dt = date_parser.parse(date_str)
-
-        # Normalize to UTC and drop microseconds
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=pytz.UTC)
-        else:
-            dt = dt.astimezone(pytz.UTC)
-
-        return dt.replace(microsecond=0).isoformat()
+        date_str = date_str.strip()
+        if not date_str:
+            return ""
+        now = now or datetime.now(timezone.utc)
+        dt = _relative(date_str, now)
+        if dt is not None:
+            return _to_utc_iso(dt)
+        return _normalize_absolute(date_str, now)
 
     except Exception as e:
         print(f"❌ Failed to normalize date: {date_str} — {e}")
         return ""
 
+def normalize_dates(date_strs: list[str]) -> list[str]:
+    """`normalize_date` over a batch, with relative dates resolved against one common `now`."""
+    now = datetime.now(timezone.utc)
+    return [normalize_date(date_str, now) for date_str in date_strs]
+
 if __name__ == "__main__":
     result = normalize_date("25.5 hours ago")
-    print(result)
\ No newline at end of file
+    print(result)
+    print(_normalize_fast.cache_info())